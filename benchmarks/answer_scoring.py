@@ -0,0 +1,186 @@
+""" Benchmarks the answer scoring against the original fuzzywuzzy implementation.
+
+Usage:
+    python -m benchmarks.answer_scoring [corpus.tsv] [--repeat N]
+
+The corpus has one "answer<TAB>attempt" pair per line. Without one, the pairs
+are made from the answer.txt files in ./resources/Audio Files, each with a few
+typical mistakes (typos, missing and extra words, swapped words).
+"""
+
+import argparse
+import os
+import random
+import time
+from typing import Callable, List, Tuple
+
+from fuzzywuzzy import fuzz
+
+from extra.game.answer_scoring import AnswerKey, levenshtein_ratio
+from extra.game.game import GameSystem
+
+
+def legacy_compare_answers(player_answer: str, real_answer: str) -> int:
+    """ The original GameSystem.compare_answers. """
+
+    variants: Tuple[str] = ('.', ';', ':', ',', '!', '?')
+
+    if player_answer.endswith(variants):
+        player_answer = player_answer[:-1]
+
+    if real_answer.endswith(variants):
+        real_answer = real_answer[:-1]
+
+    return fuzz.ratio(player_answer.lower(), real_answer.lower())
+
+
+def legacy_intelindex(search_word: str, sentence: List[str], percentage: int = 89) -> Tuple[int, int]:
+    """ The original GameSystem.intelindex. """
+
+    index: int = None
+    ratio: int = 0
+    for i, word in enumerate(sentence):
+        ratio = fuzz.ratio(search_word.lower(), word.lower())
+        if ratio >= percentage:
+            index = i
+            break
+
+    return index, ratio
+
+
+def legacy_highlight_answer(user_answer: List[str], correct_answer: List[str]) -> str:
+    """ The original GameSystem.highlight_answer. """
+
+    lca, lua = len(correct_answer), len(user_answer)
+    longest_answer_length = lca if lca > lua else lua
+    highlighted_answer_list: List[str] = []
+
+    for indx in range(longest_answer_length):
+        user_word: str = None
+        if indx < lua:
+            user_word = user_answer[indx]
+
+        word_index: int = None
+        ratio: int = 0
+        if user_word:
+            word_index, ratio = legacy_intelindex(user_word, correct_answer)
+
+        if word_index is not None:
+            uword = user_word
+            if 100 > ratio >= 89:
+                uword = f"**{uword}**"
+            highlighted_answer_list.append(uword)
+        else:
+            if lca > lua:
+                if lua > indx:
+                    highlighted_answer_list.append(f"~~`{user_answer[indx]}`~~")
+            elif lca <= lua:
+                highlighted_answer_list.append(f"~~`{user_word}`~~")
+
+    if len(highlighted_answer_list) < lca:
+        new_hl: List[str] = []
+        for bw in correct_answer:
+            for aw in highlighted_answer_list:
+                if fuzz.ratio(aw.lower(), bw.lower()) >= 89:
+                    new_hl.append(aw)
+                    break
+            else:
+                new_hl.append(f"~~`{bw}`~~")
+
+        highlighted_answer_list = new_hl
+
+    return ' '.join(highlighted_answer_list)
+
+
+def make_attempts(answer: str, rng: random.Random) -> List[str]:
+    """ Makes a few wrong (and one right) attempts at an answer. """
+
+    words = answer.split()
+    attempts = [answer, answer.lower().rstrip('.!?')]
+    if len(words) > 1:
+        dropped = list(words)
+        del dropped[rng.randrange(len(dropped))]
+        attempts.append(' '.join(dropped))
+
+        swapped = list(words)
+        i = rng.randrange(len(swapped) - 1)
+        swapped[i], swapped[i + 1] = swapped[i + 1], swapped[i]
+        attempts.append(' '.join(swapped))
+
+        attempts.append(' '.join(words[:max(1, len(words) // 2)]))
+
+    typo = list(answer)
+    if typo:
+        typo[rng.randrange(len(typo))] = rng.choice('aeioulnrst')
+    attempts.append(''.join(typo))
+    attempts.append(f"{answer} {rng.choice(words) if words else 'euh'}")
+    return attempts
+
+
+def load_corpus(path: str = None) -> List[Tuple[str, str]]:
+    """ Loads the answer/attempt pairs. """
+
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            return [tuple(line.rstrip('\n').split('\t', 1)) for line in f if '\t' in line]
+
+    rng = random.Random(42)
+    pairs: List[Tuple[str, str]] = []
+    for root, _, files in os.walk('./resources/Audio Files'):
+        if 'answer.txt' in files:
+            with open(os.path.join(root, 'answer.txt'), 'r', encoding='utf-8') as f:
+                answer = f.read().strip()
+            pairs.extend((answer, attempt) for attempt in make_attempts(answer, rng))
+
+    return pairs
+
+
+def timeit(func: Callable[[], None], repeat: int) -> float:
+    """ Gets the best time out of a few runs of a function. """
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus', nargs='?', help="A TSV file with answer/attempt pairs.")
+    parser.add_argument('--repeat', type=int, default=5, help="How many times to run each implementation.")
+    args = parser.parse_args()
+
+    pairs = load_corpus(args.corpus)
+    if not pairs:
+        raise SystemExit("No answer/attempt pairs found.")
+
+    game_system = GameSystem(client=None)
+    keys = {answer: AnswerKey(answer) for answer, _ in pairs}
+
+    def run_legacy() -> None:
+        for answer, attempt in pairs:
+            if legacy_compare_answers(attempt, answer) < 90:
+                legacy_highlight_answer(attempt.split(), answer.split())
+
+    def run_engine() -> None:
+        for answer, attempt in pairs:
+            game_system.score_answer(attempt, keys[answer])
+
+    mismatches = sum(
+        legacy_compare_answers(attempt, answer) != game_system.score_answer(attempt, keys[answer]).accuracy
+        for answer, attempt in pairs
+    )
+
+    legacy_time = timeit(run_legacy, args.repeat)
+    engine_time = timeit(run_engine, args.repeat)
+
+    print(f"Pairs: {len(pairs)} | Native Levenshtein: {'yes' if levenshtein_ratio else 'no'}")
+    print(f"Legacy : {legacy_time * 1000:.2f} ms ({legacy_time / len(pairs) * 1e6:.1f} us/pair)")
+    print(f"Engine : {engine_time * 1000:.2f} ms ({engine_time / len(pairs) * 1e6:.1f} us/pair)")
+    print(f"Speedup: {legacy_time / engine_time:.1f}x | Score mismatches: {mismatches}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+""" Benchmarks the shared-palette GIF export against the per-frame palette one it replaced.
+
+Usage:
+    python -m benchmarks.gif_export [item.gif ...] [--repeat N]
+
+Each animated item is composited over the default background, like a character
+render, and the frames are encoded by both exporters. Without any item, the
+animated items in ./resources are used, or a synthetic animation if there are none.
+The error is the mean absolute difference between the decoded and the composited
+frames, per channel, since both exporters pick their colors differently. Pillow
+often keeps far fewer colors than asked for in the legacy export, so the shared
+palette export is also run with as many colors as the legacy output ended up with.
+"""
+
+import argparse
+import glob
+import os
+import time
+from io import BytesIO
+from typing import Callable, List, Tuple
+
+from PIL import Image, ImageChops, ImageDraw, ImageSequence, ImageStat
+
+from extra.file_manipulation.animation_encoder import np, save_gif
+from extra.file_manipulation.character_renderer import paste_animated_items
+from extra.file_manipulation.image_manager import ImageLayer
+
+
+def legacy_export(frames: List[Image.Image], durations: List[int]) -> bytes:
+    """ The GIF export before the shared palette, where Pillow quantizes every frame on its own. """
+
+    output = BytesIO()
+    frames[0].save(output, "GIF", save_all=True, append_images=frames[1:], duration=durations, quality=90, loop=0)
+    return output.getvalue()
+
+
+def shared_palette_export(frames: List[Image.Image], durations: List[int], colors: int = 256) -> bytes:
+    """ The current GIF export. """
+
+    output = BytesIO()
+    save_gif(frames, durations, output, colors)
+    return output.getvalue()
+
+
+def get_palette_size(data: bytes) -> int:
+    """ Gets the size of the global color table of a GIF. """
+
+    return 2 << (data[10] & 7)
+
+
+def get_error(data: bytes, frames: List[Image.Image]) -> float:
+    """ Gets the mean absolute error of an encoded GIF against the frames it was made from. """
+
+    errors = [
+        sum(ImageStat.Stat(ImageChops.difference(decoded.convert('RGB'), frame.convert('RGB'))).mean) / 3
+        for decoded, frame in zip(ImageSequence.Iterator(Image.open(BytesIO(data))), frames)
+    ]
+    return sum(errors) / len(errors)
+
+
+def make_synthetic_animation() -> Tuple[Image.Image, ImageLayer]:
+    """ Makes a flat-colored background, like the item art, and items moving across it. """
+
+    background = Image.linear_gradient('L').resize((500, 500)).convert('RGBA')
+    draw = ImageDraw.Draw(background)
+    for i in range(12):
+        draw.rectangle((i * 40, 300 + i * 10, i * 40 + 60, 500), fill=(40 * (i % 6), 120, 255 - 20 * i, 255))
+        draw.ellipse((i * 35, 40, i * 35 + 50, 90), fill=(200, 30 * (i % 8), 90, 255), outline=(0, 0, 0, 255), width=3)
+    frames = []
+    for i in range(40):
+        frame = Image.new('RGBA', background.size, (0, 0, 0, 0))
+        draw = ImageDraw.Draw(frame)
+        draw.ellipse((i * 10, 200, i * 10 + 80, 280), fill=(255, 200, 0, 255))
+        # Another item bobbing in a corner, like a pet
+        draw.ellipse((420, 420 - i % 5 * 4, 470, 470 - i % 5 * 4), fill=(0, 200, 80, 255), outline=(0, 0, 0, 255), width=3)
+        frames.append(frame)
+
+    return background, ImageLayer(tuple(frames), (80,) * len(frames))
+
+
+def load_animations(paths: List[str]) -> List[Tuple[str, Image.Image, ImageLayer]]:
+    """ Loads the animated items to benchmark, with the background to composite them over. """
+
+    if not paths:
+        paths = [path for path in glob.glob('./resources/*/*.gif') if ImageLayer.from_file(path).is_animated]
+
+    if not paths:
+        background, layer = make_synthetic_animation()
+        return [('synthetic', background, layer)]
+
+    background_path = './resources/backgrounds/default.png'
+    if os.path.isfile(background_path):
+        background = ImageLayer.from_file(background_path).get_canvas()
+    else:
+        background = None
+
+    animations = []
+    for path in paths:
+        layer = ImageLayer.from_file(path)
+        animations.append((path, background if background is not None else Image.new('RGBA', layer.size, (128, 128, 128, 255)), layer))
+
+    return animations
+
+
+def timeit(func: Callable[[], bytes], repeat: int) -> Tuple[float, int]:
+    """ Gets the best time out of a few runs of an exporter, and the size of its output. """
+
+    best, size = float('inf'), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = len(func())
+        best = min(best, time.perf_counter() - start)
+    return best, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('items', nargs='*', help="Animated item files.")
+    parser.add_argument('--repeat', type=int, default=3, help="How many times to run each exporter.")
+    parser.add_argument('--colors', type=int, default=256, help="The palette size of the shared palette export.")
+    args = parser.parse_args()
+
+    print(f"NumPy: {'yes' if np is not None else 'no'}")
+    totals = [0.0, 0, 0.0, 0, 0]
+    for name, background, layer in load_animations(args.items):
+        gif = paste_animated_items(background, [layer])
+        legacy_time, legacy_size = timeit(lambda: legacy_export(gif.frames, gif.durations), args.repeat)
+        shared_time, shared_size = timeit(lambda: shared_palette_export(gif.frames, gif.durations, args.colors), args.repeat)
+        legacy_data = legacy_export(gif.frames, gif.durations)
+        legacy_error = get_error(legacy_data, gif.frames)
+        shared_error = get_error(shared_palette_export(gif.frames, gif.durations, args.colors), gif.frames)
+        colors = get_palette_size(legacy_data)
+        matched_data = shared_palette_export(gif.frames, gif.durations, colors)
+        matched_size, matched_error = len(matched_data), get_error(matched_data, gif.frames)
+
+        print(
+            f"{name}: {len(gif.frames)} frames | " \
+            f"legacy {legacy_time * 1000:.0f} ms, {legacy_size / 1024:.0f} KB, {colors} colors, error {legacy_error:.2f} | " \
+            f"shared palette {shared_time * 1000:.0f} ms, {shared_size / 1024:.0f} KB, error {shared_error:.2f} | " \
+            f"at {colors} colors {matched_size / 1024:.0f} KB, error {matched_error:.2f}")
+        for i, value in enumerate((legacy_time, legacy_size, shared_time, shared_size, matched_size)):
+            totals[i] += value
+
+    legacy_time, legacy_size, shared_time, shared_size, matched_size = totals
+    print(
+        f"Speedup: {legacy_time / shared_time:.1f}x | Size: {shared_size / legacy_size:.0%} of the legacy output, " \
+        f"{matched_size / legacy_size:.0%} with as many colors")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,5 @@
 import discord
-from discord.ext import commands, menus
+from discord.ext import commands, menus, tasks
 from discord import Option, slash_command
 
 from typing import List, Dict, Optional, Any, Union, Tuple, Callable
@@ -7,7 +7,6 @@ import os
 import asyncio
 import random
 import shutil
-import time
 
 from external_cons import the_drive
 from extra import utils
@@ -22,10 +21,20 @@ from extra.game.user_items import (
     UserItemsSystem, HiddenItemCategoryTable, ExclusiveItemRoleTable
 )
 from extra.game.audio_files import AudioFilesTable
+from extra.game.audio_catalog import AudioCatalog
+from extra.game.answer_scoring import AnswerKey, AnswerKeyCache
+from extra.game.game_session import GameSession, GameSessionRegistry
+from extra.game.game_stats import GameStatsBuffer, game_stats
+from extra.file_manipulation.audio_manager import audio_cache
+from extra.file_manipulation.character_renderer import character_renderer
+from extra.file_manipulation.frame_store import build_stale_frame_stores
+from extra.file_manipulation.render_cache import render_cache
 from extra.game.user_roll_dices import UserRollDicesTable
 
 server_id: int = int(os.getenv('SERVER_ID'))
-guild_ids: List[int] = [server_id]
+# The servers in which the game can be played, each with its own text and voice channels
+game_server_ids: List[int] = [int(gid) for gid in os.getenv('GAME_SERVER_IDS', str(server_id)).split(',')]
+guild_ids: List[int] = game_server_ids
 
 game_cogs: List[commands.Cog] = [
     MacaronProfileTable, RegisteredItemsTable, RegisteredItemsSystem,
@@ -73,36 +82,74 @@ class Game(*game_cogs):
         self.client = client
         self.difficulty_modes: List[str] = ['A1', 'A2', 'B1', 'B2', 'C1-C2']
         self.languages: List[str] = ['French', 'English']
-        self.player: discord.Member = None
-        self.mode: str = None
-        self.difficulty: str = None
-        self.language: str = None
-        self.status: str = 'normal'
-        self.txt: discord.TextChannel = None
-        self.vc: discord.VoiceChannel = None
-        self.audio_path: str = None
-        self.reproduced_audios: List[str] = []
-        self.round = 0
-        self.lives: int = 3
-        self.right_answers: int = 0
-        self.wrong_answers: int = 0
-        self.answer: discord.PartialMessageable = None
-        self.session_id: str = None
+        # The game's text channel and voice channels of each server, by server ID
+        self.txts: Dict[int, discord.TextChannel] = {}
+        self.vcs: Dict[int, List[discord.VoiceChannel]] = {}
+        self.sessions: GameSessionRegistry = GameSessionRegistry()
+
+        self.audio_catalog: AudioCatalog = AudioCatalog('./resources/Audio Files')
+        self.answer_keys: AnswerKeyCache = AnswerKeyCache()
+        self.game_stats: GameStatsBuffer = game_stats
 
         self.crumbs_emoji: str = '<:crumbs:940086555224211486>'
         self.croutons_emoji: str = '<:croutons:945013460041891891>'
+        self.flush_game_stats.start()
+
+    def cog_unload(self) -> None:
+        """ Stops the game stats flushing loop, what's left in the buffer is written when the bot closes. """
+
+        self.flush_game_stats.cancel()
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
         """ Tells when the cog is ready to go. """
 
-        # Gets the game's main text channel
-        guild = self.client.get_guild(server_id)
-        self.txt = discord.utils.get(guild.text_channels, id=int(os.getenv('GAME_TEXT_CHANNEL_ID')))
-        self.vc = discord.utils.get(guild.voice_channels, id=int(os.getenv('GAME_VOICE_CHANNEL_ID')))
+        for guild_id in game_server_ids:
+            if not (guild := self.client.get_guild(guild_id)):
+                continue
+
+            # Gets the game's text channel of the server
+            txt_id = os.getenv(f'GAME_TEXT_CHANNEL_ID_{guild_id}', os.getenv('GAME_TEXT_CHANNEL_ID') if guild_id == server_id else None)
+            if not txt_id or not (txt := discord.utils.get(guild.text_channels, id=int(txt_id))):
+                continue
+
+            # Gets the voice channels in which the game can be played, one session per channel
+            vc_ids = os.getenv(f'GAME_VOICE_CHANNEL_IDS_{guild_id}')
+            if vc_ids is None and guild_id == server_id:
+                vc_ids = os.getenv('GAME_VOICE_CHANNEL_IDS', os.getenv('GAME_VOICE_CHANNEL_ID'))
+
+            self.txts[guild_id] = txt
+            self.vcs[guild_id] = [
+                vc for vc_id in (vc_ids or '').split(',')
+                if vc_id and (vc := discord.utils.get(guild.voice_channels, id=int(vc_id)))
+            ]
+
+        self.client.loop.create_task(self.refresh_audio_cache())
+        await self.load_registered_items()
 
         print('Game cog is ready!')
 
+    @tasks.loop(seconds=int(os.getenv('GAME_STATS_FLUSH_INTERVAL', 60)))
+    async def flush_game_stats(self) -> None:
+        """ Periodically writes the buffered game stats into the database. """
+
+        await self.save_game_stats()
+
+    async def save_game_stats(self) -> None:
+        """ Writes the buffered game stats into the database. """
+
+        try:
+            await self.game_stats.flush()
+        except Exception as error:
+            print(f"Couldn't flush the game stats, they'll be retried later: {error}")
+
+    async def sync_game_stats(self, user_id: Optional[int] = None) -> None:
+        """ Writes the buffered game stats before reading them from the database.
+        :param user_id: The ID of the user whose stats are going to be read. [Optional][Default = Everyone] """
+
+        if self.game_stats.is_pending(user_id):
+            await self.save_game_stats()
+
     # Checkers
     def is_in_game_txt() -> bool:
         """ Checks whether the user is running a command in the
@@ -110,14 +157,19 @@ class Game(*game_cogs):
 
         async def real_check(ctx: commands.Context) -> bool:
             """ Checks it. """
+
+            txt: Optional[discord.TextChannel] = ctx.cog.txts.get(ctx.guild.id) if ctx.guild else None
+            if not txt:
+                raise NotInGameTextChannelError(message="The game can't be played in this server!")
+
             if isinstance(ctx, commands.Context):
-                if ctx.message.channel.id == ctx.cog.txt.id:
+                if ctx.message.channel.id == txt.id:
                     return True
             else:
-                if ctx.channel.id == ctx.cog.txt.id:
+                if ctx.channel.id == txt.id:
                     return True
 
-            raise NotInGameTextChannelError(message=f"You can only run this command in the bot's game Text Channel ({ctx.cog.txt.mention})!")
+            raise NotInGameTextChannelError(message=f"You can only run this command in the bot's game Text Channel ({txt.mention})!")
 
         return commands.check(real_check)
 
@@ -155,8 +207,63 @@ class Game(*game_cogs):
 
                 await self.download_recursively(drive, 'resources', folder, folder_id)
 
+            self.audio_catalog.rebuild()
+            self.answer_keys.clear()
+            transcoded, failed = await self.refresh_audio_cache()
+
         if ctx:
-            await ctx.send("**Download audio update complete!**")
+            message = f"**Download audio update complete! `{transcoded}` audios transcoded to Opus.**"
+            if failed:
+                failed_list = '\n'.join(failed[:10]) + (f"\n... and {len(failed) - 10} more" if len(failed) > 10 else '')
+                message += f"\n**`{len(failed)}` audios couldn't be transcoded:**```\n{failed_list}```"
+            await ctx.send(message)
+
+    async def refresh_audio_cache(self) -> Tuple[int, List[str]]:
+        """ Loads the SFX into memory and transcodes new audios to Opus.
+        :returns: The amount of transcoded audios, and the paths of the ones that failed. """
+
+        await audio_cache.preload('./resources/SFX')
+        transcoded, failed = await audio_cache.transcode_all('./resources/Audio Files', './resources/SFX')
+        if failed:
+            print(f"Couldn't transcode {len(failed)} audios to Opus, is ffmpeg installed?")
+        return transcoded, failed
+
+    @commands.command(aliases=['audiocache'])
+    @commands.is_owner()
+    async def audio_cache_stats(self, ctx) -> None:
+        """ Shows the Opus audio cache hit/miss counters. """
+
+        stats = audio_cache.get_stats()
+        await ctx.send(
+            f"**Opus cache:** `{stats['hits']}` hits | `{stats['misses']}` misses | " \
+            f"`{stats['buffered']}` from memory | `{stats['transcoded']}` transcoded | `{stats['failed']}` failed")
+
+    @commands.command(aliases=['imagecache', 'layercache'])
+    @commands.is_owner()
+    async def image_cache_stats(self, ctx) -> None:
+        """ Shows the decoded item layer caches' memory footprint and hit/miss counters, added up over the render workers,
+        and the same for the rendered character cache. """
+
+        stats = character_renderer.get_layer_stats()
+        render_stats = render_cache.get_stats()
+        await ctx.send(
+            f"**Layer cache:** `{stats['workers']}` workers | `{stats['layers']}/{stats['max_layers']}` layers | `{stats['bytes'] / 1048576:.1f}/{stats['max_bytes'] / 1048576:.0f}` MB | " \
+            f"`{stats['hits']}` hits | `{stats['misses']}` misses | `{stats['hit_ratio']:.1%}` hit ratio | `{stats['evictions']}` evictions\n" \
+            f"**Render cache:** `{render_stats['renders']}` renders | `{render_stats['bytes'] / 1048576:.1f}/{render_stats['max_bytes'] / 1048576:.0f}` MB | " \
+            f"`{render_stats['hits']}` hits | `{render_stats['misses']}` misses | `{render_stats['hit_ratio']:.1%}` hit ratio | `{render_stats['evictions']}` evictions")
+
+    @commands.command(aliases=['renderstats', 'encoder_stats'])
+    @commands.is_owner()
+    async def render_stats(self, ctx) -> None:
+        """ Shows which encoder settings the animated character renders ended up with, and their sizes. """
+
+        if not (stats := character_renderer.get_encoder_stats()):
+            return await ctx.send("**No characters rendered yet!**")
+
+        await ctx.send('\n'.join(
+            f"**{encoder}:** `{encoder_stats['renders']}` renders | `{encoder_stats['average_bytes'] / 1024:.0f}` KB on average | " \
+            f"`{encoder_stats['over_budget']}` over budget"
+            for encoder, encoder_stats in stats.items()))
 
     @commands.command()
     @commands.is_owner()
@@ -210,6 +317,15 @@ class Game(*game_cogs):
 
                 await self.download_recursively(drive, 'resources', folder, folder_id)
 
+        # Changed animated images get their frame stores rebuilt, so renders keep mapping them
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, build_stale_frame_stores, './resources', categories)
+
+        # Changed files would get a new mtime anyway, restarting the
+        # render workers also frees the layers of the removed ones
+        character_renderer.shutdown()
+        await render_cache.invalidate()
+
         if ctx:
             await ctx.send("**Download image update complete!**")
 
@@ -255,14 +371,8 @@ class Game(*game_cogs):
         member: discord.Member = ctx.author
         await ctx.defer()
 
-        if self.player:
-            return await ctx.respond(f"**There's already someone playing with the bot, {member.mention}!**")
-
-        if not member.voice:
-            return await ctx.respond(f"**You need to be in a Voice Channel to run this command, {member.mention}!**")
-
-        if member.voice.channel.id != self.vc.id:
-            return await ctx.respond(f"**You need to be in the {self.vc.mention} Voice Channel to play the game, {member.mention}!**")
+        if error := self.check_can_play(member):
+            return await ctx.respond(error)
 
         member_role_ids: List[int] = [mr.id for mr in member.roles]
         if language == 'English':
@@ -273,12 +383,13 @@ class Game(*game_cogs):
             if set(member_role_ids) & set(self.french_roles):
                 return await ctx.send(f"**You cannot play the `French` mode while having a native `French` role, {member.mention}!**")
 
-        self.player = member
-        self.difficulty = difficulty
-        self.language = language
-        self.answer = ctx.respond
-        self.session_id = self.generate_session_id()
-        await self._play_command_callback()
+        session = GameSession(
+            player=member, difficulty=difficulty, language=language, txt=self.txts[member.guild.id],
+            vc=member.voice.channel, answer=ctx.respond, session_id=self.generate_session_id())
+        if not self.sessions.start(session):
+            return await ctx.respond(f"**There's already a game being played in this server, please wait for it to end, {member.mention}!**")
+
+        await self._play_command_callback(session)
 
     @commands.command(name="play")
     @commands.cooldown(1, 5, commands.BucketType.user)
@@ -297,14 +408,8 @@ class Game(*game_cogs):
         if language.title() not in self.languages:
             return await ctx.send(f"**Please inform a valid language, {member.mention}!\n`{', '.join(self.languages)}`**")
 
-        if self.player:
-            return await ctx.send(f"**There's already someone playing with the bot, {member.mention}!**")
-        
-        if not member.voice:
-            return await ctx.send(f"**You need to be in a Voice Channel to run this command, {member.mention}!**")
-
-        if member.voice.channel.id != self.vc.id:
-            return await ctx.send(f"**You need to be in the {self.vc.mention} Voice Channel to play the game, {member.mention}!**")
+        if error := self.check_can_play(member):
+            return await ctx.send(error)
 
         member_role_ids: List[int] = [mr.id for mr in member.roles]
         if language.title() == 'English':
@@ -315,180 +420,174 @@ class Game(*game_cogs):
             if list(set(member_role_ids) & set(self.french_roles)):
                 return await ctx.send(f"**You cannot play the `French` mode while having a native `French` role, {member.mention}!**")
 
-        self.player = member
-        self.difficulty = difficulty.upper()
-        self.language = language.title()
-        self.answer = ctx.send
-        self.session_id = self.generate_session_id()
-        await self._play_command_callback()
+        session = GameSession(
+            player=member, difficulty=difficulty.upper(), language=language.title(), txt=self.txts[member.guild.id],
+            vc=member.voice.channel, answer=ctx.send, session_id=self.generate_session_id())
+        if not self.sessions.start(session):
+            return await ctx.send(f"**There's already a game being played in this server, please wait for it to end, {member.mention}!**")
+
+        await self._play_command_callback(session)
+
+    def check_can_play(self, member: discord.Member) -> Optional[str]:
+        """ Checks whether a member can start a game session.
+        :param member: The member who wants to play.
+        :returns: The reason why they can't, if any. """
+
+        if self.sessions.get_by_player(member.id):
+            return f"**You're already playing, {member.mention}!**"
+
+        if not member.voice:
+            return f"**You need to be in a Voice Channel to run this command, {member.mention}!**"
+
+        vc: discord.VoiceChannel = member.voice.channel
+        vcs: List[discord.VoiceChannel] = self.vcs.get(member.guild.id, [])
+        if vc not in vcs:
+            vcs_text = ', '.join(map(lambda gvc: gvc.mention, vcs))
+            return f"**You need to be in one of the game's Voice Channels to play the game ({vcs_text}), {member.mention}!**"
+
+        # The bot can only be connected to one Voice Channel per server, so sessions only run side by side across servers
+        if session := self.sessions.get(member.guild.id):
+            return f"**I'm already playing in {session.vc.mention}, please wait for that game to end, {member.mention}!**"
 
-    async def _play_command_callback(self) -> None:
-        """ Callback for the game's play command. """
+    async def _play_command_callback(self, session: GameSession) -> None:
+        """ Callback for the game's play command.
+        :param session: The game session to play a round of. """
 
-        server_bot: discord.Member = self.player.guild.get_member(self.client.user.id)
+        player: discord.Member = session.player
+        server_bot: discord.Member = player.guild.get_member(self.client.user.id)
         if (bot_voice := server_bot.voice) and bot_voice.mute:
             await server_bot.edit(mute=False)
         
-        voice = self.player.voice
-        voice_client = self.player.guild.voice_client
-
-        voice_client: discord.VoiceClient = discord.utils.get(self.client.voice_clients, guild=self.player.guild)
+        voice = player.voice
+        voice_client: discord.VoiceClient = discord.utils.get(self.client.voice_clients, guild=player.guild)
 
         # Checks if the bot is in a voice channel
         if not voice_client:
-            await voice.channel.connect()
+            await session.vc.connect()
             await asyncio.sleep(1)
-            voice_client: discord.VoiceClient = discord.utils.get(self.client.voice_clients, guild=self.player.guild)
+            voice_client: discord.VoiceClient = discord.utils.get(self.client.voice_clients, guild=player.guild)
+
+        # Moves to the session's voice channel, no other game is being played in the server
+        elif voice_client.channel != session.vc:
+            await voice_client.move_to(session.vc)
 
         # Checks if the bot is in the same voice channel that the user
         if voice and voice.channel == voice_client.channel:
             # Gets reproduced files that are on cooldown
             current_ts = await utils.get_timestamp()
-            raudio_files = await self.get_reproduced_audio_files(self.player.id, self.difficulty, current_ts)
+            raudio_files = await self.get_reproduced_audio_files(player.id, session.difficulty, current_ts)
+            raudio_files = [*raudio_files, *self.game_stats.get_audio_files(player.id, session.difficulty)]
 
             # Gets a random language audio
-            path, difficulty_mode, audio_folder, fail = self.get_random_audio(raudio_files, current_ts)
+            path, difficulty_mode, audio_folder, fail = self.get_random_audio(session, raudio_files, current_ts)
             if fail:
-                await self.txt.send(
+                await session.txt.send(
                     embed=discord.Embed(
-                        description=f"**We ran out of audios for you, come back in `24h`, {self.player.mention}!**",
+                        description=f"**We ran out of audios for you, come back in `24h`, {player.mention}!**",
                         color=discord.Color.orange()
                 ))
-                if self.right_answers >= 1:
-                    crumbs = await self.reward_user()
-                    await self.txt.send(f"""**
+                if session.right_answers >= 1:
+                    crumbs = await self.reward_user(session)
+                    await session.txt.send(f"""**
                     You've got `{crumbs}` crumbs {self.crumbs_emoji}!
-                    ✅ `{self.right_answers}` | ❌ `{self.wrong_answers}`**""")
-                    await self.check_roll_dice()
-                return await self.stop_functionalities(self.player.guild)
+                    ✅ `{session.right_answers}` | ❌ `{session.wrong_answers}`**""")
+                    await self.check_roll_dice(session)
+                return await self.stop_functionalities(session)
 
             # Plays the song
             if not voice_client.is_playing():
-                self.audio_path = f"{path}/audio.mp3"
-                audio_source = discord.FFmpegPCMAudio(self.audio_path)
-                text_source: str = await self.get_answer_text(f"{path}/answer.txt")
+                session.audio_path = f"{path}/audio.mp3"
+                audio_source = audio_cache.get_source(session.audio_path)
+                answer_key: AnswerKey = self.answer_keys.get(f"{path}/answer.txt")
                 dialect_source: str = await self.get_answer_text(f"{path}/dialect.txt")
 
-                self.round += 1
+                session.round += 1
                 embed = discord.Embed(
-                    title=f"__`ROUND {self.round}`__",
+                    title=f"__`ROUND {session.round}`__",
                     description="Try to understand what is being said in the following voice message, and type your answer below." \
-                        f"\n**Language:** {self.language}" \
+                        f"\n**Language:** {session.language}" \
                         f"\n**Dialect:** {dialect_source}" \
                         f"\n**Level:** {difficulty_mode}",
                     color=discord.Color.green()
                 )
-                embed.set_footer(text=f"{self.language[:2].upper()}-{audio_folder}")
-                await self.txt.send(embed=embed)
-                if str(audio_folder) in list(map(lambda raf: raf[0], raudio_files)):
-                    await self.update_audio_file(self.player.id, audio_folder, self.difficulty, current_ts)
-                else:
-                    await self.insert_audio_file(self.player.id, audio_folder, self.difficulty, current_ts)
-                voice_client.play(audio_source, after=lambda e: self.client.loop.create_task(self.get_response(text_source)))
+                embed.set_footer(text=f"{session.language[:2].upper()}-{audio_folder}")
+                await session.txt.send(embed=embed)
+                self.game_stats.add_audio_file(player.id, audio_folder, session.difficulty, current_ts)
+                voice_client.play(audio_source, after=lambda e: self.client.loop.create_task(self.get_response(session, answer_key)))
 
         else:
             # (to-do) send a message to a specific channel
-            await self.txt.send("**The player left the voice channel, so it's game over!**")
-            await self.reset_game_status()
-        if self.round == 1:
-            await self.answer(f"**Let's play, {self.player.mention}!**")
-
-    async def reset_game_status(self) -> None:
-        """ Clears the game status. """
-
-        self.player = None
-        self.mode = None
-        self.difficulty = None
-        self.status = 'normal'
-        self.language = None
-        self.audio_path = None
-        self.reproduced_audios = []
-        self.round = 0
-        self.lives = 3
-        self.right_answers = 0
-        self.wrong_answers = 0
-        self.answer = None
-        self.session_id = None
+            await session.txt.send(f"**{player.mention} left the voice channel, so it's game over!**")
+            await self.reset_game_status(session)
+        if session.round == 1:
+            await session.answer(f"**Let's play, {player.mention}!**")
+
+    async def reset_game_status(self, session: GameSession) -> None:
+        """ Ends a game session, freeing its voice channel and saving its stats.
+        :param session: The game session to end. """
+
+        self.sessions.end(session)
+        await self.save_game_stats()
     
-    async def stop_audio(self, guild: discord.Guild) -> None:
+    async def stop_audio(self, session: GameSession) -> None:
         """ Stops playing an audio.
-        :param guild: The server. """
+        :param session: The game session whose audio to stop. """
 
-        voice_client: discord.VoiceClient = discord.utils.get(self.client.voice_clients, guild=guild)
+        voice_client: discord.VoiceClient = discord.utils.get(self.client.voice_clients, guild=session.vc.guild)
         if voice_client and voice_client.is_playing():
-            self.status = 'stop'
+            session.status = 'stop'
             voice_client.stop()
-        self.status = 'normal'
+        session.status = 'normal'
 
-    def get_random_audio(self, raudio_files: List[str], current_ts: int) -> List[Union[str, bool, None]]:
+    def get_random_audio(self, session: GameSession, raudio_files: List[str], current_ts: int) -> List[Union[str, bool, None]]:
         """ Gets a random audio.
+        :param session: The game session to get the audio for.
         :param raudio_files: The reproduced audio files.
         :param current_ts: The current timestamp. """
 
-        on_cooldown_audios = list(
-            map(lambda oca: oca[0], 
-                filter(lambda raf: current_ts - raf[1] <= 86400, raudio_files)
-            )
-        )
-
-        root_path = f'./resources/Audio Files/{self.language}'
-
-        difficulty: str = self.difficulty
-
-        all_difficulties = os.listdir(root_path)
-        all_audio_folders = os.listdir(f"{root_path}/{difficulty}")
-
-        tries: int = 0
-        laudios: int = len(all_difficulties)
+        on_cooldown_audios = {
+            str(raf[0]) for raf in raudio_files
+            if current_ts - raf[1] <= 86400
+        }
 
-        while True:
-            tries += 1
-            time.sleep(0.3)
-            try:
+        difficulty: str = session.difficulty
+        if session.audio_deck is None:
+            session.audio_deck = self.audio_catalog.new_deck(session.language, difficulty)
 
-                audio_folder = random.choice(all_audio_folders)
-                all_audio_folders.remove(audio_folder)
-                path = f"{root_path}/{difficulty}/{audio_folder}"
+        audio_folder = self.audio_catalog.draw(session.audio_deck, on_cooldown_audios.union(session.reproduced_audios))
+        if audio_folder is None:
+            return None, None, None, True
 
-                # self.reproduced_audios.append(str(audio_folder))
-                # return path, difficulty, audio_folder
-                if not str(audio_folder) in self.reproduced_audios and str(audio_folder) not in on_cooldown_audios:
-                    self.reproduced_audios.append(str(audio_folder))
-                    return path, difficulty, audio_folder, False
-                else:
-                    continue
-            except Exception:
-                continue
-            finally:
-                if tries >= laudios:
-                    return None, None, None, True
+        session.reproduced_audios.append(str(audio_folder))
+        path = self.audio_catalog.get_path(session.language, difficulty, audio_folder)
+        return path, difficulty, audio_folder, False
 
-    async def get_response(self, text_source: str) -> Any:
+    async def get_response(self, session: GameSession, answer_key: AnswerKey) -> Any:
         """ Checks how correct is the user's answer.
-        :param text_source: The actual answer. """
+        :param session: The game session of the round.
+        :param answer_key: The actual answer. """
 
-        session_id: str = self.session_id
-
-        if self.status == 'stop':
-            self.status = 'normal'
+        if session.status == 'stop':
+            session.status = 'normal'
             return
 
-        if not self.player or self.session_id != session_id:
+        if not self.sessions.is_active(session):
             return
 
-        view = ReplayAudioView(self.client)
-        await self.txt.send(
+        player: discord.Member = session.player
+        view = ReplayAudioView(self.client, session)
+        await session.txt.send(
             embed=discord.Embed(
-                description=f"🔰**`Answer!` ({self.player.mention})**🔰 ",
+                description=f"🔰**`Answer!` ({player.mention})**🔰 ",
                 color=discord.Color.green()),
             view=view
         )
             
         def check(m):
-            if not self.player:
+            if not self.sessions.is_active(session):
                 return False
 
-            if m.author.id == self.player.id and m.channel.id == self.txt.id:
+            if m.author.id == player.id and m.channel.id == session.txt.id:
                 # Checks whether user is in the VC to answer the question
 
                 return True
@@ -501,72 +600,70 @@ class Game(*game_cogs):
             try: view.stop()
             except: pass
 
-            await self.stop_audio(self.vc.guild)
-            await self.txt.send(f"**{self.player.mention}, you took too long to answer! (-1 ❤️)**")
-            self.wrong_answers += 1
-            self.lives -= 1
-            await self.audio('resources/SFX/wrong_answer.mp3', self.vc)
+            await self.stop_audio(session)
+            await session.txt.send(f"**{player.mention}, you took too long to answer! (-1 ❤️)**")
+            session.wrong_answers += 1
+            session.lives -= 1
+            await self.audio('resources/SFX/wrong_answer.mp3', session.vc)
         else:
             try: view.stop()
             except: pass
 
-            await self.stop_audio(self.vc.guild)
+            await self.stop_audio(session)
             answer = answer.content
             if not answer:
                 return
 
-            accuracy = await self.compare_answers(answer, text_source)
-            if text_source and accuracy >= 90:
-                await self.txt.send(f"✅ You got it right, {self.player.mention}!\n**The answer was:** {text_source}")
-                self.right_answers += 1
-                await self.audio('resources/SFX/right_answer.mp3', self.vc)
-                await self.resolve_round_status(win=True)
+            text_source: str = answer_key.text
+            score = self.score_answer(answer, answer_key)
+            accuracy: int = score.accuracy
+            if score.correct:
+                await session.txt.send(f"✅ You got it right, {player.mention}!\n**The answer was:** {text_source}")
+                session.right_answers += 1
+                await self.audio('resources/SFX/right_answer.mp3', session.vc)
+                await self.resolve_round_status(session, win=True)
 
             # Otherwise it's a wrong answer
             else:
-                uanswer = self.highlight_answer(answer.split(), text_source.split())
-                await self.txt.send(f"❌ You got it wrong, {self.player.mention}! ({accuracy}% accuracy)\n**Your answer:** {uanswer}\n**The answer was:** {text_source}")
-                self.wrong_answers += 1
-                self.lives -= 1
-                await self.audio('resources/SFX/wrong_answer.mp3', self.vc)
-                await self.resolve_round_status(win=False)
+                await session.txt.send(f"❌ You got it wrong, {player.mention}! ({accuracy}% accuracy)\n**Your answer:** {score.highlighted}\n**The answer was:** {text_source}")
+                session.wrong_answers += 1
+                session.lives -= 1
+                await self.audio('resources/SFX/wrong_answer.mp3', session.vc)
+                await self.resolve_round_status(session, win=False)
 
         finally:
             if isinstance(answer, discord.Message):
                 answer = answer.content
 
-            current_ts = await utils.get_timestamp()
             # Checks if the member has remaining lives
             if answer and answer.startswith('m!stop'):
                 return
             
-            if self.lives > 0:				
+            if session.lives > 0:				
                 # Restarts the game if it's not the last round
-                if self.round < 10:
-                    await self.txt.send(f"**New round in 10 seconds...**")
+                if session.round < 10:
+                    await session.txt.send(f"**New round in 10 seconds, {player.mention}...**")
                     await asyncio.sleep(10)
-                    if self.player and self.session_id == session_id:
-                        return await self._play_command_callback()
+                    if self.sessions.is_active(session):
+                        return await self._play_command_callback(session)
                 
                 # Otherwise it ends the game and shows the score of the member
                 else:
-                    #self.reproduced_languages = []
-                    await self.txt.send(f"💪 **End of the game, you did it, {self.player.mention}!** 💪")
-                    crumbs = await self.reward_user()
-                    await self.txt.send(f"""**
+                    await session.txt.send(f"💪 **End of the game, you did it, {player.mention}!** 💪")
+                    crumbs = await self.reward_user(session)
+                    await session.txt.send(f"""**
                     You've got `{crumbs}` crumbs {self.crumbs_emoji}!
-                    ✅ `{self.right_answers}` | ❌ `{self.wrong_answers}`**""")
-                    await self.check_roll_dice()
-                    await self.reset_game_status()
+                    ✅ `{session.right_answers}` | ❌ `{session.wrong_answers}`**""")
+                    await self.check_roll_dice(session)
+                    await self.reset_game_status(session)
             else:
-                await self.txt.send(f"**You lost the game, {self.player.mention}!** (0 ❤️)")
-                crumbs = await self.reward_user()
-                await self.txt.send(f"""**
+                await session.txt.send(f"**You lost the game, {player.mention}!** (0 ❤️)")
+                crumbs = await self.reward_user(session)
+                await session.txt.send(f"""**
                 You've got `{crumbs}` crumbs {self.crumbs_emoji}!
-                ✅ `{self.right_answers}` | ❌ `{self.wrong_answers}`**""")
-                await self.update_macaron_profile_crumbs(self.player.id, games_played=1, last_time_played=current_ts)
-                await self.check_roll_dice()
-                await self.reset_game_status()
+                ✅ `{session.right_answers}` | ❌ `{session.wrong_answers}`**""")
+                await self.check_roll_dice(session)
+                await self.reset_game_status(session)
 
     async def get_answer_text(self, text_path: str) -> str:
         """ Gets the answer text.
@@ -580,35 +677,43 @@ class Game(*game_cogs):
             pass
         return text_source.strip()
     
-    async def stop_functionalities(self, guild: discord.Guild) -> None:
+    async def stop_functionalities(self, session: GameSession) -> None:
         """ Stops the functionalities of the game.
-        :param guild: The server. """
+        :param session: The game session to stop. """
 
-        await self.reset_game_status()
-        await self.stop_audio(guild)
+        await self.reset_game_status(session)
+        await self.stop_audio(session)
 
     @commands.command()
     @is_in_game_txt()
-    async def stop(self, ctx: commands.Context) -> None:
-        """ Stops the game. """
+    async def stop(self, ctx: commands.Context, member: Optional[discord.Member] = None) -> None:
+        """ Stops the game.
+        :param member: The player whose game to stop. [Optional][Default = Yours or the one in your Voice Channel] """
 
         author: discord.Member = ctx.author
 
-        if not self.player:
+        session = self.sessions.get_by_player((member or author).id)
+        if not session and not member and author.voice:
+            # The game being played in the author's Voice Channel
+            if (server_session := self.sessions.get(ctx.guild.id)) and server_session.vc == author.voice.channel:
+                session = server_session
+
+        if not session:
             return await ctx.send(f"**{author.mention}, I'm not even playing yet!**")
 
-        if self.player.id == author.id or await utils.is_allowed([]).predicate(ctx) or await utils.is_allowed_members([647452832852869120]).predicate(ctx):
-            await self.stop_functionalities(ctx.guild)
+        if session.player.id == author.id or await utils.is_allowed([]).predicate(ctx) or await utils.is_allowed_members([647452832852869120]).predicate(ctx):
+            await self.stop_functionalities(session)
             await ctx.send("**Session ended!**")
         else:
             return await ctx.send(f"{author.mention}, you're not the one who's playing, nor is a staff member")
 
-    async def reward_user(self) -> int:
-        """ Rewards the user. """
+    async def reward_user(self, session: GameSession) -> int:
+        """ Rewards the user.
+        :param session: The game session to reward the player of. """
 
         current_ts = await utils.get_timestamp()
-        player: discord.Member = self.player
-        difficulty: str = self.difficulty
+        player: discord.Member = session.player
+        difficulty: str = session.difficulty
 
         multipliers: Dict[str, Tuple[int, int]] = {
             'A1': (1, 3), 'A2': (3, 5),
@@ -619,26 +724,21 @@ class Game(*game_cogs):
         money_to_add: int = 0
 
         m_range_x, m_range_y = multipliers.get(difficulty.upper())
-        for _ in range(self.right_answers):
+        for _ in range(session.right_answers):
             money_to_add += random.randint(m_range_x, m_range_y)
 
-        if await self.get_macaron_profile(player.id):
-            await self.update_macaron_profile_crumbs(player.id, crumbs=money_to_add, games_played=1, last_time_played=current_ts)
-        else:
-            await self.insert_macaron_profile(player.id, crumbs=money_to_add, games_played=1, last_time_played=current_ts)
+        self.game_stats.add_profile(player.id, crumbs=money_to_add, games_played=1, last_time_played=current_ts)
 
         return money_to_add
     
-    async def check_roll_dice(self) -> None:
-        """ Checks whether the user can get a roll dice. """
+    async def check_roll_dice(self, session: GameSession) -> None:
+        """ Checks whether the user can get a roll dice.
+        :param session: The game session of the player. """
 
-        member = self.player
-        txt = self.txt
+        member = session.player
+        txt = session.txt
         if random.random() <= 0.05:
-            if not await self.get_user_roll_dices(member.id):
-                await self.insert_user_roll_dices(member.id)
-            else:
-                await self.update_user_roll_dices(member.id, 1)
+            await self.update_user_roll_dices(member.id, 1)
             await txt.send(f"**You just go `1` dice to roll, {member.mention}!**")
 
     @slash_command(name="profile", guild_ids=guild_ids)
@@ -674,11 +774,13 @@ class Game(*game_cogs):
         if member.bot:
             return await answer("**You cannot use this on a bot!**")
 
+        await self.sync_game_stats(member.id)
         if not (profile := await self.get_macaron_profile(member.id)):
             if ctx.author.id != member.id:
                 return await answer("**This user doesn't have a profile!**")
-            await self.insert_macaron_profile(member.id)
-            profile = await self.get_macaron_profile(member.id)
+            await self.upsert_macaron_profile(member.id)
+            # A new profile has only the columns' default values
+            profile = (member.id, 0, 0, None, 0)
 
         round_status = await self.get_round_status(member.id)
 
@@ -726,16 +828,14 @@ class Game(*game_cogs):
         else:
             answer = ctx.respond
 
-        path = './resources/Audio Files'
-        languages = [language for language in os.listdir(path)]
-        difficulties = [difficulty for language in languages for difficulty in os.listdir(f"{path}/{language}")]
-        audios = [1 for language in languages for difficulty in difficulties for _ in os.listdir(f"{path}/{language}/{difficulty}")]
+        languages = self.audio_catalog.languages
+        audios = self.audio_catalog.count()
 
         current_time = await utils.get_time_now()
 
         embed = discord.Embed(
             title="__Samples__",
-            description=f"We currently have **`{sum(audios)}`** different audio samples grouped into **`{len(languages)}`** different languages respectively.",
+            description=f"We currently have **`{audios}`** different audio samples grouped into **`{len(languages)}`** different languages respectively.",
             color=ctx.author.color,
             timestamp=current_time
         )
@@ -756,7 +856,7 @@ class Game(*game_cogs):
             voice_client: discord.VoiceClient = discord.utils.get(self.client.voice_clients, guild=channel.guild)
 
         if not voice_client.is_playing():
-            audio_source = discord.FFmpegPCMAudio(audio)
+            audio_source = audio_cache.get_source(audio)
             if not func:
                 voice_client.play(audio_source)
             else:
@@ -823,6 +923,7 @@ class Game(*game_cogs):
         """ Callback for the Wins Leaderboard command. """
 
         # answer: discord.PartialMessageable = ctx.send if isinstance(ctx, commands.Context) else ctx.respond
+        await self.sync_game_stats()
         round_statuses = await self.get_round_statuses()
 
         position = [[i+1, u[1]] for i, u in enumerate(round_statuses) if u[0] == ctx.author.id]
@@ -837,20 +938,16 @@ class Game(*game_cogs):
         pages = menus.MenuPages(source=SwitchPages(round_statuses, **additional), clear_reactions_after=True)
         await pages.start(ctx)
 
-    async def resolve_round_status(self, win: bool = True) -> None:
+    async def resolve_round_status(self, session: GameSession, win: bool = True) -> None:
         """ Resolves the status for a user in relation to a round in which the user either won or lost.
+        :param session: The game session of the round.
         :param win: Whether the user won or lost the round. [Default = True] """
 
+        player: discord.Member = session.player
         if win:
-            if await self.get_round_status(self.player.id):
-                await self.update_round_status(self.player.id, wins=1)
-            else:
-                await self.insert_round_status(self.player.id, wins=1)
+            self.game_stats.add_round_status(player.id, wins=1)
         else:
-            if await self.get_round_status(self.player.id):
-                await self.update_round_status(self.player.id, losses=1)
-            else:
-                await self.insert_round_status(self.player.id, losses=1)
+            self.game_stats.add_round_status(player.id, losses=1)
 
     @commands.command(aliases=["rolldice", "rd"])
     @commands.cooldown(1, 5, commands.BucketType.user)
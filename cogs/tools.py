@@ -9,6 +9,9 @@ import traceback
 from contextlib import redirect_stdout
 from typing import List
 
+from external_cons import get_database_pool_stats
+from extra.game.game_stats import game_stats
+from extra.game.macaron_profile import profile_cache
 from extra.tools.scheduled_events import ScheduledEventsTable, ScheduledEventsSystem
 
 tool_cogs: List[commands.Cog] = [
@@ -138,6 +141,21 @@ class Tools(*tool_cogs):
 
         await ctx.send(f"**:ping_pong: Pong! {round(self.client.latency * 1000)}ms.**")
 
+    @commands.command(aliases=['dbstats', 'pool_stats'])
+    @commands.has_permissions(administrator=True)
+    async def db_stats(self, ctx) -> None:
+        """ (ADM) Shows the usage of the database connection pool and of the caches in front of it. """
+
+        stats = get_database_pool_stats()
+        buffer_stats = game_stats.get_stats()
+        cache_stats = profile_cache.get_stats()
+        await ctx.send(
+            f"**Database pool:** `{stats['in_use']}` in use | `{stats['idle']}` idle | " \
+            f"`{stats['waiters']}` waiting | `{stats['size']}/{stats['maxsize']}` connections\n" \
+            f"**Game stats buffer:** `{buffer_stats['pending']}` pending | `{buffer_stats['flushes']}` flushes | `{buffer_stats['failed']}` failed\n" \
+            f"**Profile cache:** `{cache_stats['hits']}` hits | `{cache_stats['misses']}` misses | " \
+            f"`{cache_stats['hit_rate']:.1%}` hit rate | `{cache_stats['size']}/{cache_stats['maxsize']}` profiles")
+
     @commands.command(aliases=['al', 'alias'])
     async def aliases(self, ctx, *, cmd: str = None):
         """ Shows some information about commands and categories. 
@@ -1,7 +1,8 @@
 import aiomysql
 import asyncio
 import os
-from typing import List, Any
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Sequence, Tuple
 
 from pydrive.auth import GoogleAuth
 from pydrive.drive import GoogleDrive
@@ -38,16 +39,126 @@ async def the_drive() -> Any:
 
 loop = asyncio.get_event_loop()
 
-async def the_database() -> List[Any]:
-    """ Gives the databse connection. """
-
-    pool = await aiomysql.create_pool(
-        host=os.getenv('DB_HOST'),
-        user=os.getenv('DB_USER'),
-        password=os.getenv('DB_PASSWORD'),
-        db=os.getenv('DB_NAME'),
-        loop=loop
-    )
-    db = await pool.acquire()
-    mycursor = await db.cursor()
-    return mycursor, db
\ No newline at end of file
+# Process-wide connection pool, created once and shared by every table cog
+_pool: Optional[aiomysql.Pool] = None
+# Created on first use, inside the running event loop
+_pool_lock: Optional[asyncio.Lock] = None
+_pool_waiters: int = 0
+
+async def create_database_pool() -> aiomysql.Pool:
+    """ Creates the process-wide database pool, if it doesn't exist yet.
+    The pool size and recycle time can be tuned through the
+    DB_POOL_MINSIZE, DB_POOL_MAXSIZE and DB_POOL_RECYCLE env variables. """
+
+    global _pool, _pool_lock
+
+    if _pool_lock is None:
+        _pool_lock = asyncio.Lock()
+
+    async with _pool_lock:
+        if _pool is None or _pool.closed:
+            _pool = await aiomysql.create_pool(
+                host=os.getenv('DB_HOST'),
+                user=os.getenv('DB_USER'),
+                password=os.getenv('DB_PASSWORD'),
+                db=os.getenv('DB_NAME'),
+                minsize=int(os.getenv('DB_POOL_MINSIZE', 1)),
+                maxsize=int(os.getenv('DB_POOL_MAXSIZE', 10)),
+                pool_recycle=int(os.getenv('DB_POOL_RECYCLE', 3600)),
+                loop=loop
+            )
+    return _pool
+
+async def close_database_pool() -> None:
+    """ Closes the database pool and waits for all its connections to be released. """
+
+    global _pool
+
+    if _pool is not None:
+        _pool.close()
+        await _pool.wait_closed()
+        _pool = None
+
+@asynccontextmanager
+async def the_database() -> AsyncIterator[Tuple[aiomysql.Cursor, aiomysql.Connection]]:
+    """ Gives a database cursor and connection from the shared pool.
+    The connection is always given back to the pool on exit, with anything
+    left uncommitted rolled back, reads included, so the next user of the
+    connection doesn't get a stale snapshot. """
+
+    global _pool_waiters
+
+    pool = _pool if _pool is not None and not _pool.closed else await create_database_pool()
+
+    _pool_waiters += 1
+    try:
+        db = await pool.acquire()
+    finally:
+        _pool_waiters -= 1
+
+    mycursor: Optional[aiomysql.Cursor] = None
+    try:
+        mycursor = await db.cursor()
+        yield mycursor, db
+    finally:
+        if mycursor is not None:
+            await mycursor.close()
+
+        # Never hands back a connection in the middle of a transaction
+        if not db.closed and db.get_transaction_status():
+            try:
+                await db.rollback()
+            except Exception:
+                db.close()
+        pool.release(db)
+
+def make_upsert_query(table: str, key_columns: Sequence[str], increment_columns: Sequence[str] = (), set_columns: Sequence[str] = ()) -> str:
+    """ Makes an INSERT ... ON DUPLICATE KEY UPDATE query that inserts a row, or
+    adds the given increments to it and sets the given values if it already exists.
+    The query takes the key values, then the increments, then the values to set.
+    :param table: The name of the table.
+    :param key_columns: The columns of the table's primary key.
+    :param increment_columns: The columns to add the increments to. [Optional]
+    :param set_columns: The columns to set, kept as they are when given None. [Optional] """
+
+    columns = [*key_columns, *increment_columns, *set_columns]
+    updates = [f"{column} = {column} + VALUES({column})" for column in increment_columns]
+    updates.extend(f"{column} = COALESCE(VALUES({column}), {column})" for column in set_columns)
+    if not updates:
+        # Only makes sure the row exists
+        updates.append(f"{key_columns[0]} = {key_columns[0]}")
+
+    return f"""
+        INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})
+        ON DUPLICATE KEY UPDATE {', '.join(updates)}
+    """
+
+async def upsert_increments(table: str, keys: Dict[str, Any], increments: Optional[Dict[str, int]] = None, values: Optional[Dict[str, Any]] = None) -> None:
+    """ Increments the columns of a row in a single statement, inserting the row
+    with the increments as its initial values if it doesn't exist yet.
+    :param table: The name of the table.
+    :param keys: The primary key columns and their values.
+    :param increments: The columns to increment and their increments. [Optional]
+    :param values: The columns to set and their values, skipped when None. [Optional] """
+
+    increments = increments or {}
+    values = values or {}
+
+    query = make_upsert_query(table, list(keys), list(increments), list(values))
+    async with the_database() as (mycursor, db):
+        await mycursor.execute(query, (*keys.values(), *increments.values(), *values.values()))
+        await db.commit()
+
+def get_database_pool_stats() -> Dict[str, int]:
+    """ Gets the current usage of the database pool. """
+
+    if _pool is None:
+        return {'size': 0, 'in_use': 0, 'idle': 0, 'waiters': _pool_waiters, 'maxsize': 0}
+
+    return {
+        'size': _pool.size,
+        'in_use': _pool.size - _pool.freesize,
+        'idle': _pool.freesize,
+        'waiters': _pool_waiters,
+        'maxsize': _pool.maxsize,
+    }
@@ -0,0 +1,261 @@
+from PIL import GifImagePlugin, Image, ImageChops, features
+
+from io import BytesIO
+from typing import BinaryIO, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Each step down trades quality for size: (keep every nth frame, scale, quantization level)
+step_downs: Tuple[Tuple[int, float, int], ...] = (
+    (1, 1.0, 0),
+    (2, 1.0, 0),
+    (2, 1.0, 1),
+    (2, 0.75, 1),
+    (2, 0.5, 2),
+    (4, 0.5, 2),
+)
+
+# Per quantization level
+gif_colors: Tuple[int, ...] = (256, 128, 64)
+webp_qualities: Tuple[int, ...] = (90, 70, 50)
+apng_colors: Tuple[int, ...] = (0, 256, 64)
+
+# How many frames the shared GIF palette is built from
+palette_sample_size: int = 8
+
+
+class EncodedAnimation(NamedTuple):
+    """ An encoded animation, with how it had to be stepped down to fit the budget. """
+
+    data: bytes
+    extension: str
+    # The encoder and the step down used, e.g. 'webp q70 1/2 frames 75%'
+    encoder: str
+    steps: int
+    fits: bool
+
+
+def make_palette(frames: List[Image.Image], colors: int) -> Image.Image:
+    """ Builds one adaptive palette for all frames, from an evenly spaced sample of them.
+    :param frames: The frames.
+    :param colors: The amount of colors of the palette. """
+
+    sample = frames[::max(1, len(frames) // palette_sample_size)][:palette_sample_size]
+    width, height = sample[0].size
+    mosaic = Image.new('RGB', (width, height * len(sample)))
+    for i, frame in enumerate(sample):
+        mosaic.paste(frame.convert('RGB'), (0, height * i))
+
+    return mosaic.quantize(colors=colors, method=Image.MEDIANCUT)
+
+
+def is_sparse(unchanged: int, area: int) -> bool:
+    """ Checks whether most of the box around a frame's changes didn't change, in which
+    case marking the unchanged pixels as transparent gives longer runs to compress.
+    :param unchanged: The amount of unchanged pixels in the box.
+    :param area: The area of the box. """
+
+    return unchanged * 2 > area
+
+
+def crop_changes(
+    frame: Image.Image, previous: Image.Image, transparent_index: int
+) -> Optional[Tuple[Image.Image, Tuple[int, int]]]:
+    """ Crops a frame down to the box around what changed since the previous frame. When most
+    of the box didn't change, the unchanged pixels are made transparent too, which compresses
+    much better, and shows the previous frame through them.
+    :param frame: The quantized frame.
+    :param previous: The quantized previous frame.
+    :param transparent_index: The palette index of the transparent color.
+    :returns: The cropped frame and its position, or None if nothing changed. """
+
+    if np is not None:
+        indexes = np.asarray(frame)
+        unchanged = indexes == np.asarray(previous)
+        changed_rows, changed_columns = np.nonzero(~unchanged.all(axis=1)), np.nonzero(~unchanged.all(axis=0))
+        if not changed_rows[0].size:
+            return
+
+        top, bottom = changed_rows[0][0], changed_rows[0][-1] + 1
+        left, right = changed_columns[0][0], changed_columns[0][-1] + 1
+        cropped, box_unchanged = indexes[top:bottom, left:right].copy(), unchanged[top:bottom, left:right]
+        if is_sparse(int(box_unchanged.sum()), box_unchanged.size):
+            cropped[box_unchanged] = transparent_index
+
+        image = Image.fromarray(cropped, 'P')
+        image.putpalette(frame.getpalette())
+        return image, (int(left), int(top))
+
+    # Compares the palette indexes, not the colors they map to
+    difference = ImageChops.difference(
+        Image.frombytes('L', frame.size, frame.tobytes()), Image.frombytes('L', previous.size, previous.tobytes()))
+    if not (box := difference.getbbox()):
+        return
+
+    cropped = frame.crop(box)
+    unchanged = difference.crop(box).point(lambda value: 255 if value == 0 else 0)
+    if is_sparse(unchanged.histogram()[255], cropped.width * cropped.height):
+        cropped.paste(transparent_index, mask=unchanged)
+    return cropped, box[:2]
+
+
+def save_gif(
+    frames: List[Image.Image], durations: Union[int, List[int]], fp: Union[str, BinaryIO], colors: int = 256, **kwargs
+) -> None:
+    """ Saves frames as a GIF with a single palette shared by all frames, instead of one per frame.
+    Each frame after the first is cropped to what changed, and written at its position over
+    the previous frame, which is never disposed of. Identical frames are merged into a longer one.
+    The frames are expected to be opaque.
+    :param frames: The frames.
+    :param durations: The duration of each frame, or of all frames, in milliseconds.
+    :param fp: The path or the file object to save the GIF in.
+    :param colors: The amount of colors, one of them is kept for the transparency. [Default = 256]
+    :param kwargs: Other settings of the GIF header, e.g. its comment. """
+
+    if isinstance(durations, int):
+        durations = [durations] * len(frames)
+
+    transparent_index = colors - 1
+    palette = make_palette(frames, transparent_index)
+    # Pads the palette so the transparent index exists in it
+    palette_data = palette.getpalette()[:transparent_index * 3]
+    palette_data += [0] * (colors * 3 - len(palette_data))
+    palette.putpalette(palette_data)
+
+    quantized = [frame.convert('RGB').quantize(palette=palette, dither=Image.NONE) for frame in frames]
+
+    # [frame, position, duration] of each written frame
+    written: List[list] = [[quantized[0], (0, 0), durations[0]]]
+    for previous, frame, duration in zip(quantized, quantized[1:], durations[1:]):
+        if (changes := crop_changes(frame, previous, transparent_index)) is None:
+            written[-1][2] += duration
+        else:
+            written.append([*changes, duration])
+
+    # Pillow's own writer diffs each frame against the previous written one, whose
+    # transparent pixels would grow every box, so the frames are laid out here instead
+    header, _ = GifImagePlugin.getheader(quantized[0], info={'loop': 0, 'duration': durations[0], **kwargs})
+    chunks = header
+    for image, position, duration in written:
+        chunks += GifImagePlugin.getdata(
+            image, position, duration=duration, transparency=transparent_index, disposal=1)
+    chunks.append(b';')
+
+    if isinstance(fp, str):
+        with open(fp, 'wb') as f:
+            f.writelines(chunks)
+    else:
+        fp.writelines(chunks)
+
+
+def encode_gif(frames: List[Image.Image], durations: List[int], level: int) -> bytes:
+    """ Encodes frames into a GIF.
+    :param frames: The frames.
+    :param durations: The duration of each frame, in milliseconds.
+    :param level: The quantization level. """
+
+    output = BytesIO()
+    save_gif(frames, durations, output, gif_colors[level])
+    return output.getvalue()
+
+
+def encode_webp(frames: List[Image.Image], durations: List[int], level: int) -> bytes:
+    """ Encodes frames into an animated WebP.
+    :param frames: The frames.
+    :param durations: The duration of each frame, in milliseconds.
+    :param level: The quantization level. """
+
+    output = BytesIO()
+    frames[0].save(
+        output, 'WEBP', save_all=True, append_images=frames[1:], duration=durations, loop=0,
+        quality=webp_qualities[level], method=4)
+    return output.getvalue()
+
+
+def encode_apng(frames: List[Image.Image], durations: List[int], level: int) -> bytes:
+    """ Encodes frames into an APNG.
+    :param frames: The frames.
+    :param durations: The duration of each frame, in milliseconds.
+    :param level: The quantization level. """
+
+    if level:
+        frames = [frame.convert('RGB').quantize(colors=apng_colors[level]) for frame in frames]
+
+    output = BytesIO()
+    frames[0].save(output, 'PNG', save_all=True, append_images=frames[1:], duration=durations, loop=0)
+    return output.getvalue()
+
+
+# output format -> (file extension, encoder)
+encoders: Dict[str, Tuple[str, Callable[[List[Image.Image], List[int], int], bytes]]] = {
+    'gif': ('gif', encode_gif),
+    'webp': ('webp', encode_webp),
+    'apng': ('png', encode_apng),
+}
+
+
+def describe_encoder(output_format: str, level: int, frame_step: int, scale: float) -> str:
+    """ Describes the encoder settings of a render, for the stats.
+    :param output_format: The output format.
+    :param level: The quantization level.
+    :param frame_step: Every how many frames one was kept.
+    :param scale: The scale of the frames. """
+
+    if output_format == 'gif':
+        description = f"gif {gif_colors[level]} colors"
+    elif output_format == 'webp':
+        description = f"webp q{webp_qualities[level]}"
+    else:
+        description = f"apng {apng_colors[level]} colors" if level else "apng rgba"
+
+    if frame_step > 1:
+        description += f" 1/{frame_step} frames"
+    if scale != 1:
+        description += f" {scale:.0%}"
+    return description
+
+
+def drop_frames(frames: List[Image.Image], durations: List[int], frame_step: int) -> Tuple[List[Image.Image], List[int]]:
+    """ Keeps every nth frame, showing each kept frame for the time of the dropped ones.
+    :param frames: The frames.
+    :param durations: The duration of each frame, in milliseconds.
+    :param frame_step: Every how many frames one is kept. """
+
+    if frame_step == 1 or len(frames) <= 1:
+        return frames, durations
+
+    return frames[::frame_step], [sum(durations[i:i + frame_step]) for i in range(0, len(durations), frame_step)]
+
+
+def encode_animation(frames: List[Image.Image], durations: List[int], output_format: str, max_bytes: int) -> EncodedAnimation:
+    """ Encodes an animation, stepping down the frame rate, the scale and the colors
+    until it fits the byte budget. If nothing fits, the smallest attempt is returned.
+    :param frames: The frames.
+    :param durations: The duration of each frame, in milliseconds.
+    :param output_format: The output format, 'gif', 'webp' or 'apng'. Unknown or unavailable formats fall back to GIF.
+    :param max_bytes: The byte budget. """
+
+    if output_format not in encoders or (output_format == 'webp' and not features.check('webp')):
+        output_format = 'gif'
+
+    extension, encode = encoders[output_format]
+    smallest = None
+    for steps, (frame_step, scale, level) in enumerate(step_downs):
+        step_frames, step_durations = drop_frames(frames, durations, frame_step)
+        if scale != 1:
+            size = (max(1, int(frames[0].width * scale)), max(1, int(frames[0].height * scale)))
+            step_frames = [frame.resize(size, Image.BILINEAR) for frame in step_frames]
+
+        data = encode(step_frames, step_durations, level)
+        encoded = EncodedAnimation(
+            data, extension, describe_encoder(output_format, level, frame_step, scale), steps, len(data) <= max_bytes)
+        if encoded.fits:
+            return encoded
+
+        if smallest is None or len(data) < len(smallest.data):
+            smallest = encoded
+
+    return smallest
@@ -0,0 +1,318 @@
+""" Preprocesses the item images of one or more categories.
+
+Usage:
+    python -m extra.file_manipulation.asset_pipeline [category ...] [options]
+
+Every image of the categories in ./resources (all of them by default) goes through
+the enabled steps, and is written to the output folder under the same name:
+    --color-key R,G,B     Makes the pixels of that color transparent. (background removal)
+    --threshold N         Recolors the pixels whose --threshold-channel is over N with --recolor.
+    --frames              Also writes each frame of the animated images as a PNG.
+
+A manifest in the output folder keeps the size and modification time of every
+processed image, and the steps it went through, so unchanged images are skipped.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from PIL import Image, ImageSequence
+
+from extra.file_manipulation.animation_encoder import make_palette
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+image_extensions: Tuple[str, ...] = ('.png', '.gif')
+manifest_name: str = 'manifest.json'
+
+
+class AssetOptions(NamedTuple):
+    """ The preprocessing steps to run, and their settings. """
+
+    color_key: Optional[Tuple[int, int, int]] = None
+    # How far from the color key a color can be, per channel, to be removed too
+    tolerance: int = 0
+    threshold: Optional[int] = None
+    # 'r', 'g', 'b' or 'luma'
+    threshold_channel: str = 'r'
+    recolor: Tuple[int, int, int, int] = (0, 0, 0, 255)
+    split_frames: bool = False
+
+    def get_hash(self) -> str:
+        """ Gets a hash of the options, to tell whether an image was processed with other ones. """
+
+        return hashlib.sha1(repr(tuple(self)).encode()).hexdigest()
+
+
+class AssetJob(NamedTuple):
+    """ An image to preprocess. It only holds plain values, so it can be sent to another process. """
+
+    source: str
+    output: str
+    options: AssetOptions
+
+
+def extract_frames(path: str) -> Tuple[List[Image.Image], List[int]]:
+    """ Extracts the RGBA frames of an image, and their durations.
+    :param path: The path of the image. """
+
+    frames, durations = [], []
+    with Image.open(path) as image:
+        for frame in ImageSequence.Iterator(image):
+            frames.append(frame.convert('RGBA'))
+            durations.append(frame.info.get('duration', 0))
+
+    return frames, durations
+
+
+def trim_frames(frames: List[Image.Image]) -> Tuple[List[Image.Image], List[Tuple[int, int]]]:
+    """ Crops each frame to the bounding box of its visible pixels.
+    :param frames: The RGBA frames.
+    :returns: The cropped frames and the offset of each one on the original canvas. """
+
+    trimmed, offsets = [], []
+    for frame in frames:
+        box = frame.getchannel('A').getbbox()
+        if box is None:
+            # Nothing visible, a single transparent pixel stands in for it
+            trimmed.append(Image.new('RGBA', (1, 1), (0, 0, 0, 0)))
+            offsets.append((0, 0))
+        elif box == (0, 0) + frame.size:
+            trimmed.append(frame)
+            offsets.append((0, 0))
+        else:
+            trimmed.append(frame.crop(box))
+            offsets.append(box[:2])
+
+    return trimmed, offsets
+
+
+def remove_color_key(pixels: 'np.ndarray', color: Tuple[int, int, int], tolerance: int = 0) -> None:
+    """ Makes the pixels of a color transparent, in place.
+    :param pixels: The RGBA pixels, as a height x width x 4 array.
+    :param color: The color to remove.
+    :param tolerance: How far from the color a color can be, per channel, to be removed too. [Default = 0] """
+
+    distance = np.abs(pixels[..., :3].astype(np.int16) - np.array(color, dtype=np.int16))
+    pixels[(distance <= tolerance).all(axis=-1), 3] = 0
+
+
+def recolor_threshold(pixels: 'np.ndarray', threshold: int, color: Tuple[int, int, int, int], channel: str = 'r') -> None:
+    """ Recolors the visible pixels whose channel is over a threshold, in place.
+    :param pixels: The RGBA pixels, as a height x width x 4 array.
+    :param threshold: The threshold.
+    :param color: The RGBA color to give them.
+    :param channel: The channel to compare, 'r', 'g', 'b' or 'luma'. [Default = 'r'] """
+
+    if channel == 'luma':
+        values = pixels[..., :3] @ np.array([0.299, 0.587, 0.114])
+    else:
+        values = pixels[..., 'rgb'.index(channel)]
+
+    pixels[(values > threshold) & (pixels[..., 3] > 0)] = color
+
+
+def process_frame(frame: Image.Image, options: AssetOptions) -> Image.Image:
+    """ Runs the pixel steps on a frame.
+    :param frame: The RGBA frame.
+    :param options: The preprocessing options. """
+
+    if np is None:
+        raise RuntimeError("Processing image frames needs NumPy: pip install numpy")
+
+    pixels = np.array(frame)
+    if options.color_key is not None:
+        remove_color_key(pixels, options.color_key, options.tolerance)
+
+    if options.threshold is not None:
+        recolor_threshold(pixels, options.threshold, options.recolor, options.threshold_channel)
+
+    return Image.fromarray(pixels, 'RGBA')
+
+
+def save_transparent_gif(frames: List[Image.Image], durations: List[int], path: str) -> None:
+    """ Saves RGBA frames as a GIF, with the fully transparent pixels kept transparent.
+    :param frames: The RGBA frames.
+    :param durations: The duration of each frame, in milliseconds.
+    :param path: The path of the GIF. """
+
+    transparent_index = 255
+    palette = make_palette(frames, transparent_index)
+    palette_data = palette.getpalette()[:transparent_index * 3]
+    palette.putpalette(palette_data + [0] * (768 - len(palette_data)))
+
+    quantized = []
+    for frame in frames:
+        indexes = np.array(frame.convert('RGB').quantize(palette=palette, dither=Image.NONE))
+        indexes[np.asarray(frame)[..., 3] < 128] = transparent_index
+        image = Image.fromarray(indexes, 'P')
+        image.putpalette(palette.getpalette())
+        quantized.append(image)
+
+    quantized[0].save(
+        path, 'GIF', save_all=True, append_images=quantized[1:], duration=durations, loop=0,
+        transparency=transparent_index, disposal=2, optimize=False)
+
+
+def process_asset(job: AssetJob) -> List[str]:
+    """ Preprocesses an image. Meant to run in a worker process.
+    :param job: The image to preprocess.
+    :returns: The paths of the written files. """
+
+    frames, durations = extract_frames(job.source)
+    frames = [process_frame(frame, job.options) for frame in frames]
+
+    os.makedirs(os.path.dirname(job.output), exist_ok=True)
+    outputs = [job.output]
+    if job.output.lower().endswith('.gif'):
+        save_transparent_gif(frames, durations, job.output)
+    elif len(frames) == 1:
+        frames[0].save(job.output)
+    else:
+        frames[0].save(job.output, save_all=True, append_images=frames[1:], duration=durations, loop=0)
+
+    if job.options.split_frames and len(frames) > 1:
+        stem = os.path.splitext(job.output)[0]
+        for i, frame in enumerate(frames):
+            frame.save(f"{stem}_{i + 1}.png")
+            outputs.append(f"{stem}_{i + 1}.png")
+
+    return outputs
+
+
+class AssetManifest:
+    """ Keeps which images were processed, from which version of the file and with which options. """
+
+    def __init__(self, path: str) -> None:
+        """ Class init method.
+        :param path: The path of the manifest file. """
+
+        self.path = path
+        # source path -> {'size', 'mtime', 'options', 'outputs'}
+        self.files: Dict[str, Dict] = {}
+        if os.path.isfile(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.files = json.load(f).get('files', {})
+
+    def is_fresh(self, source: str, options_hash: str) -> bool:
+        """ Checks whether an image was already processed, as it is now and with the same options.
+        :param source: The path of the image.
+        :param options_hash: The hash of the options. """
+
+        if not (entry := self.files.get(source)):
+            return False
+
+        stat = os.stat(source)
+        return entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime and entry['options'] == options_hash \
+            and all(os.path.isfile(output) for output in entry['outputs'])
+
+    def add(self, source: str, options_hash: str, outputs: List[str]) -> None:
+        """ Records a processed image.
+        :param source: The path of the image.
+        :param options_hash: The hash of the options.
+        :param outputs: The paths of the written files. """
+
+        stat = os.stat(source)
+        self.files[source] = {'size': stat.st_size, 'mtime': stat.st_mtime, 'options': options_hash, 'outputs': outputs}
+
+    def prune(self, sources: List[str]) -> int:
+        """ Removes the images that no longer exist, and their outputs.
+        :param sources: The images of the processed categories that still exist. """
+
+        existing = set(sources)
+        folders = {os.path.dirname(source) for source in sources}
+        removed = [source for source in self.files if source not in existing and os.path.dirname(source) in folders]
+        for source in removed:
+            for output in self.files.pop(source)['outputs']:
+                try:
+                    os.remove(output)
+                except FileNotFoundError:
+                    pass
+
+        return len(removed)
+
+    def save(self) -> None:
+        """ Writes the manifest, atomically. """
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(f"{self.path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump({'files': self.files}, f, indent=1, sort_keys=True)
+        os.replace(f"{self.path}.tmp", self.path)
+
+
+def find_sources(resources: str, categories: List[str]) -> List[str]:
+    """ Finds the images of some categories.
+    :param resources: The folder of the categories.
+    :param categories: The categories. """
+
+    return sorted(
+        os.path.join(resources, category, file_name)
+        for category in categories if os.path.isdir(os.path.join(resources, category))
+        for file_name in os.listdir(os.path.join(resources, category))
+        if file_name.lower().endswith(image_extensions)
+    )
+
+
+def parse_color(value: str) -> Tuple[int, ...]:
+    """ Parses an 'R,G,B' or 'R,G,B,A' color. """
+
+    color = tuple(int(channel) for channel in value.split(','))
+    if len(color) not in (3, 4) or not all(0 <= channel <= 255 for channel in color):
+        raise argparse.ArgumentTypeError(f"Invalid color: {value}")
+    return color
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('categories', nargs='*', help="The item categories to process. [Default = All]")
+    parser.add_argument('--resources', default='./resources', help="The folder of the item categories.")
+    parser.add_argument('--output', default='./media/processed', help="The folder to write the processed images in.")
+    parser.add_argument('--color-key', type=parse_color, help="The R,G,B background color to remove.")
+    parser.add_argument('--tolerance', type=int, default=0, help="How far from the color key a color can be, per channel.")
+    parser.add_argument('--threshold', type=int, help="Recolors the pixels whose threshold channel is over it.")
+    parser.add_argument('--threshold-channel', choices=('r', 'g', 'b', 'luma'), default='r', help="The channel to threshold.")
+    parser.add_argument('--recolor', type=parse_color, default=(0, 0, 0, 255), help="The R,G,B[,A] color of the thresholded pixels.")
+    parser.add_argument('--frames', action='store_true', help="Also writes each frame of the animated images as a PNG.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="The amount of worker processes.")
+    parser.add_argument('--force', action='store_true', help="Processes the unchanged images too.")
+    args = parser.parse_args()
+
+    if np is None:
+        raise SystemExit("The asset pipeline needs NumPy: pip install numpy")
+
+    categories = args.categories or sorted(
+        folder for folder in os.listdir(args.resources) if os.path.isdir(os.path.join(args.resources, folder)))
+    recolor = args.recolor if len(args.recolor) == 4 else (*args.recolor, 255)
+    options = AssetOptions(args.color_key, args.tolerance, args.threshold, args.threshold_channel, recolor, args.frames)
+    options_hash = options.get_hash()
+
+    manifest = AssetManifest(os.path.join(args.output, manifest_name))
+    sources = find_sources(args.resources, categories)
+    pruned = manifest.prune(sources)
+    jobs = [
+        AssetJob(source, os.path.join(args.output, os.path.relpath(source, args.resources)), options)
+        for source in sources if args.force or not manifest.is_fresh(source, options_hash)
+    ]
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for job, future in [(job, pool.submit(process_asset, job)) for job in jobs]:
+            try:
+                manifest.add(job.source, options_hash, future.result())
+            except Exception as e:
+                failed += 1
+                print(f"{job.source}: {e}")
+
+    manifest.save()
+    print(f"Processed: {len(jobs) - failed} | Skipped: {len(sources) - len(jobs)} | Failed: {failed} | Removed: {pruned}")
+
+
+if __name__ == '__main__':
+    main()
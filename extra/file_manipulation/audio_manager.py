@@ -0,0 +1,223 @@
+import discord
+from discord.oggparse import OggStream
+
+import asyncio
+import os
+from io import BytesIO
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class OpusFileAudio(discord.AudioSource):
+    """ Audio source that streams the Opus packets of an Ogg file as they are,
+    without spawning ffmpeg or re-encoding anything. """
+
+    def __init__(self, path: str) -> None:
+        """ Class init method.
+        :param path: The path of the .opus (Ogg) file. """
+
+        self._file = open(path, 'rb')
+        self._packets: Iterator[bytes] = OggStream(self._file).iter_packets()
+
+    def read(self) -> bytes:
+        return next(self._packets, b'')
+
+    def is_opus(self) -> bool:
+        return True
+
+    def cleanup(self) -> None:
+        self._file.close()
+
+
+class BufferedOpusAudio(discord.AudioSource):
+    """ Audio source that plays Opus packets already held in memory.
+    The packets are shared, so each play costs no disk I/O nor subprocess. """
+
+    def __init__(self, packets: Tuple[bytes, ...]) -> None:
+        """ Class init method.
+        :param packets: The Opus packets of the audio. """
+
+        self._packets: Iterator[bytes] = iter(packets)
+
+    def read(self) -> bytes:
+        return next(self._packets, b'')
+
+    def is_opus(self) -> bool:
+        return True
+
+
+class AudioCache:
+    """ Handler for the pre-transcoded Opus copies of the game's MP3 files. """
+
+    ffmpeg_options: List[str] = [
+        '-map_metadata', '-1', '-f', 'opus', '-c:a', 'libopus',
+        '-ar', '48000', '-ac', '2', '-b:a', '128k', '-loglevel', 'warning'
+    ]
+
+    def __init__(self, concurrency: Optional[int] = None) -> None:
+        """ Class init method.
+        :param concurrency: How many ffmpeg processes can transcode at once. [Optional] """
+
+        self.concurrency = concurrency or max(1, (os.cpu_count() or 2) // 2)
+        self.hits: int = 0
+        self.misses: int = 0
+        self.transcoded: int = 0
+        self.failed: int = 0
+        self.buffered: int = 0
+        self.buffers: Dict[str, Tuple[bytes, ...]] = {}
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def get_opus_path(path: str) -> str:
+        """ Gets the path of the Opus copy of an audio file.
+        :param path: The path of the MP3 file. """
+
+        return f"{os.path.splitext(path)[0]}.opus"
+
+    @staticmethod
+    def is_cached(path: str, opus_path: str) -> bool:
+        """ Checks whether an audio file has an up-to-date Opus copy.
+        :param path: The path of the MP3 file.
+        :param opus_path: The path of the Opus file. """
+
+        try:
+            return os.path.getmtime(opus_path) >= os.path.getmtime(path)
+        except OSError:
+            return False
+
+    def get_source(self, path: str) -> discord.AudioSource:
+        """ Gets an audio source for an MP3 file, passing through its Opus copy
+        if there's one, and decoding the MP3 with ffmpeg otherwise.
+        :param path: The path of the MP3 file. """
+
+        if (packets := self.buffers.get(os.path.normpath(path))) is not None:
+            self.buffered += 1
+            return BufferedOpusAudio(packets)
+
+        opus_path = self.get_opus_path(path)
+        if self.is_cached(path, opus_path):
+            self.hits += 1
+            return OpusFileAudio(opus_path)
+
+        self.misses += 1
+        return discord.FFmpegPCMAudio(path)
+
+    async def transcode(self, path: str) -> bool:
+        """ Writes the Opus copy of an MP3 file next to it.
+        :param path: The path of the MP3 file.
+        :returns: Whether it could be transcoded. """
+
+        opus_path = self.get_opus_path(path)
+        temp_path = f"{opus_path}.tmp"
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                'ffmpeg', '-y', '-i', path, *self.ffmpeg_options, temp_path,
+                stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
+            )
+            returncode = await process.wait()
+        # ffmpeg isn't installed, or couldn't be started
+        except OSError:
+            returncode = None
+
+        if returncode != 0:
+            self.failed += 1
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return False
+
+        # Swaps it in at once, so a round never reads a half-written file
+        os.replace(temp_path, opus_path)
+        self.transcoded += 1
+        return True
+
+    async def load_packets(self, path: str) -> Tuple[bytes, ...]:
+        """ Loads the Opus packets of an MP3 file, from its Opus copy if there's
+        one, or by encoding it once with ffmpeg otherwise.
+        :param path: The path of the MP3 file. """
+
+        opus_path = self.get_opus_path(path)
+        if self.is_cached(path, opus_path):
+            with open(opus_path, 'rb') as f:
+                data = f.read()
+        else:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    'ffmpeg', '-i', path, *self.ffmpeg_options, 'pipe:1',
+                    stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+                )
+                data, _ = await process.communicate()
+            # ffmpeg isn't installed, or couldn't be started
+            except OSError:
+                self.failed += 1
+                return ()
+
+        return tuple(OggStream(BytesIO(data)).iter_packets())
+
+    async def preload(self, folder: str) -> None:
+        """ Loads every MP3 file of a folder into memory. Meant for short clips, such as SFX.
+        :param folder: The folder to load the files from. """
+
+        buffers: Dict[str, Tuple[bytes, ...]] = {}
+        if os.path.isdir(folder):
+            for file in os.listdir(folder):
+                if not file.lower().endswith('.mp3'):
+                    continue
+
+                path = os.path.normpath(os.path.join(folder, file))
+                if packets := await self.load_packets(path):
+                    buffers[path] = packets
+
+        # Keeps the buffers of other folders, replacing the ones of this folder at once
+        folder = os.path.normpath(folder)
+        self.buffers = {
+            **{path: packets for path, packets in self.buffers.items() if os.path.dirname(path) != folder},
+            **buffers
+        }
+
+    def find_uncached(self, *folders: str) -> List[str]:
+        """ Finds every MP3 file in the given folders that has no up-to-date Opus copy.
+        :param folders: The folders to look for MP3 files in. """
+
+        paths: List[str] = []
+        for folder in folders:
+            for root, _, files in os.walk(folder):
+                for file in files:
+                    path = os.path.join(root, file)
+                    if file.lower().endswith('.mp3') and not self.is_cached(path, self.get_opus_path(path)):
+                        paths.append(path)
+
+        return paths
+
+    async def transcode_all(self, *folders: str) -> Tuple[int, List[str]]:
+        """ Transcodes every MP3 file in the given folders that has no up-to-date Opus copy.
+        :param folders: The folders to look for MP3 files in.
+        :returns: The amount of transcoded files, and the paths of the ones that failed. """
+
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            paths = await loop.run_in_executor(None, self.find_uncached, *folders)
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def run(path: str) -> bool:
+                async with semaphore:
+                    return await self.transcode(path)
+
+            results = await asyncio.gather(*map(run, paths))
+            return sum(results), [path for path, transcoded in zip(paths, results) if not transcoded]
+
+    def get_stats(self) -> Dict[str, int]:
+        """ Gets the cache hit/miss counters. """
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'transcoded': self.transcoded,
+            'failed': self.failed,
+            'buffered': self.buffered,
+        }
+
+
+# Shared by the game and the utils' audio player
+audio_cache = AudioCache()
@@ -0,0 +1,434 @@
+from PIL import Image
+
+import asyncio
+import os
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import reduce
+from io import BytesIO
+from math import gcd
+from typing import Any, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Tuple, Union
+
+from extra.file_manipulation.animation_encoder import encode_animation
+from extra.file_manipulation.gif_manager import GIF
+from extra.file_manipulation.image_manager import ImageLayer, layer_cache
+
+# Caps of the animated renders, so a few long effects can't blow up a worker's memory
+default_max_frames: int = int(os.getenv('RENDER_MAX_FRAMES', 400))
+default_max_frames_bytes: int = int(os.getenv('RENDER_MAX_FRAMES_MB', 256)) * 1024 * 1024
+default_max_loop_duration: int = int(os.getenv('RENDER_MAX_LOOP_MS', 10000))
+
+# The encoding of the animated renders, 'gif', 'webp' or 'apng', and their size budget
+default_output_format: str = os.getenv('RENDER_FORMAT', 'gif').lower()
+default_max_bytes: int = int(os.getenv('RENDER_MAX_KB', 4096)) * 1024
+
+# The zlib level of the static renders, from 0 (fastest) to 9 (smallest)
+png_compress_level: int = int(os.getenv('RENDER_PNG_COMPRESS_LEVEL', 6))
+
+# Frame durations, in milliseconds
+min_frame_duration, default_frame_duration = 20, 100
+
+
+class RenderJob(NamedTuple):
+    """ Everything a worker needs to render a character. It only holds
+    plain values, so it can be sent to another process. """
+
+    background: str
+    # (item_type, image path), in pasting order
+    layers: Tuple[Tuple[str, str], ...]
+    hidden: FrozenSet[str] = frozenset()
+    # The format of animated characters, static ones are always PNG
+    output_format: str = default_output_format
+    # The size budget of animated characters, in bytes
+    max_bytes: int = default_max_bytes
+    max_frames: int = default_max_frames
+    # The maximum decoded size of all frames together, in bytes
+    max_frames_bytes: int = default_max_frames_bytes
+    # The maximum length of the animation, in milliseconds
+    max_loop_duration: int = default_max_loop_duration
+
+
+class RenderResult(NamedTuple):
+    """ An encoded character image. """
+
+    data: bytes
+    extension: str
+    # The encoder settings it ended up with, and whether it fit the size budget
+    encoder: str = 'png'
+    fits: bool = True
+    # The worker that rendered it, and the state of its layer cache
+    pid: int = 0
+    layer_stats: Optional[Dict[str, Union[int, float]]] = None
+
+
+def paste_items(base: Image.Image, layers: List[ImageLayer]) -> None:
+    """ Pastes images onto a base image..
+    :param base: The base image to paste other images onto.
+    :param layers: The item layers to paste onto the base image, in pasting order. """
+
+    for layer in layers:
+        base.paste(layer.image, layer.offset, layer.image)
+
+
+def flatten_stack(layers: List[ImageLayer], size: Tuple[int, int]) -> List[ImageLayer]:
+    """ Flattens each run of static layers into a single precomposited slab.
+    :param layers: The item layers, in pasting order.
+    :param size: The size of the canvas.
+    :returns: The animated layers and the slabs, in pasting order. """
+
+    stack: List[ImageLayer] = []
+    slab: Optional[Image.Image] = None
+
+    for layer in layers:
+        if layer.is_animated:
+            if slab is not None:
+                stack.append(ImageLayer.trimmed([slab], (0,)))
+                slab = None
+            stack.append(layer)
+
+        else:
+            if slab is None:
+                slab = Image.new('RGBA', size, (0, 0, 0, 0))
+            slab.alpha_composite(layer.image, layer.offset)
+
+    if slab is not None:
+        stack.append(ImageLayer.trimmed([slab], (0,)))
+
+    return stack
+
+
+def flatten_layers(background: Image.Image, layers: List[ImageLayer]) -> Tuple[Image.Image, List[ImageLayer]]:
+    """ Flattens each run of static layers into a single precomposited slab, so that
+    animated characters only paste the animated layers and a few slabs per frame.
+    :param background: The background image, which is not modified.
+    :param layers: The item layers, in pasting order.
+    :returns: The background with the static layers below the first animated one
+    pasted onto it, and the remaining animated layers and slabs, in pasting order. """
+
+    base = background.copy()
+    for i, layer in enumerate(layers):
+        if layer.is_animated:
+            return base, flatten_stack(layers[i:], base.size)
+
+        base.paste(layer.image, layer.offset, layer.image)
+
+    return base, []
+
+
+def get_frame_starts(layer: ImageLayer) -> Tuple[List[int], int]:
+    """ Gets when each frame of an animated layer starts, within its loop.
+    :param layer: The animated layer.
+    :returns: The start time of each frame and the loop length, in milliseconds. """
+
+    starts, loop_duration = [], 0
+    for duration in layer.durations:
+        starts.append(loop_duration)
+        # Like browsers do, too short durations are shown as the default one
+        loop_duration += duration if duration >= min_frame_duration else default_frame_duration
+
+    return starts, loop_duration
+
+
+def make_timeline(loop_durations: List[int], frame_starts: List[List[int]], max_loop_duration: int) -> Tuple[List[int], int]:
+    """ Gets the times at which any animated layer changes frames, over a loop common to all of them.
+    The common loop is the least common multiple of the layer loops, unless that is longer
+    than the bound, in which case it's the longest layer loop, and the shorter ones restart mid-way.
+    :param loop_durations: The loop length of each animated layer.
+    :param frame_starts: The frame start times of each animated layer.
+    :param max_loop_duration: The maximum length of the common loop.
+    :returns: The sorted change times and the common loop length, in milliseconds. """
+
+    common_loop = reduce(lambda a, b: a * b // gcd(a, b), loop_durations)
+    if common_loop > max_loop_duration:
+        common_loop = min(max(loop_durations), max_loop_duration)
+
+    times = set()
+    for loop_duration, starts in zip(loop_durations, frame_starts):
+        for loop_start in range(0, common_loop, loop_duration):
+            times.update(loop_start + start for start in starts if loop_start + start < common_loop)
+
+    return sorted(times), common_loop
+
+
+def paste_animated_items(
+    background: Image.Image, layers: List[ImageLayer], max_frames: int = default_max_frames,
+    max_frames_bytes: int = default_max_frames_bytes, max_loop_duration: int = default_max_loop_duration
+) -> GIF:
+    """ Pastes images and gifs accordingly, following each animated layer's own frame durations.
+    A frame is emitted whenever any animated layer changes, the shorter animations loop,
+    and identical consecutive frames are merged into a longer one.
+    :param background: The background image to paste the layers onto.
+    :param layers: The item layers, in pasting order.
+    :param max_frames: The maximum amount of frames. [Default = RENDER_MAX_FRAMES]
+    :param max_frames_bytes: The maximum decoded size of all frames together, in bytes. [Default = RENDER_MAX_FRAMES_MB]
+    :param max_loop_duration: The maximum length of the animation, in milliseconds. [Default = RENDER_MAX_LOOP_MS] """
+
+    base, stack = flatten_layers(background, layers)
+    return paste_stack(base, stack, max_frames, max_frames_bytes, max_loop_duration)
+
+
+def paste_stack(
+    base: Image.Image, stack: List[ImageLayer], max_frames: int = default_max_frames,
+    max_frames_bytes: int = default_max_frames_bytes, max_loop_duration: int = default_max_loop_duration
+) -> GIF:
+    """ Pastes an already flattened stack onto a base image, frame by frame.
+    :param base: The base image, which is not modified.
+    :param stack: The animated layers and slabs, in pasting order. At least one must be animated.
+    :param max_frames: The maximum amount of frames. [Default = RENDER_MAX_FRAMES]
+    :param max_frames_bytes: The maximum decoded size of all frames together, in bytes. [Default = RENDER_MAX_FRAMES_MB]
+    :param max_loop_duration: The maximum length of the animation, in milliseconds. [Default = RENDER_MAX_LOOP_MS] """
+
+    gif = GIF(image=base, frame_duration=default_frame_duration)
+
+    animated = [layer for layer in stack if layer.is_animated]
+    frame_starts, loop_durations = zip(*map(get_frame_starts, animated))
+    times, common_loop = make_timeline(loop_durations, frame_starts, max_loop_duration)
+
+    frame_bytes = base.width * base.height * len(base.getbands())
+    n_frames = max(1, min(len(times), max_frames, max_frames_bytes // frame_bytes))
+    ends = times[1:] + [common_loop]
+
+    previous: Optional[bytes] = None
+    for start, end in zip(times[:n_frames], ends):
+        # The frames the animated layers show at this time, in pasting order
+        indexes = iter([
+            bisect_right(starts, start % loop_duration) - 1
+            for starts, loop_duration in zip(frame_starts, loop_durations)
+        ])
+
+        frame = gif.new_frame()
+        for layer in stack:
+            index = next(indexes) if layer.is_animated else 0
+            image = layer.frames[index]
+            frame.paste(image, layer.offsets[index], image)
+
+        # Held frames within the items' own GIFs often give identical composites
+        data = frame.tobytes()
+        if data == previous:
+            gif.extend_last_frame(end - start)
+        else:
+            gif.add_frame(frame, end - start)
+            previous = data
+
+    return gif
+
+
+def render_character(job: RenderJob) -> RenderResult:
+    """ Renders a character into an encoded image. Meant to run in a worker process.
+    :param job: The render job. """
+
+    background = layer_cache.get(job.background).get_canvas()
+    layers = [layer_cache.get(path) for item_type, path in job.layers if item_type not in job.hidden]
+
+    if any(layer.is_animated for layer in layers):
+        gif = paste_animated_items(background, layers, job.max_frames, job.max_frames_bytes, job.max_loop_duration)
+        encoded = encode_animation(gif.frames, gif.durations, job.output_format, job.max_bytes)
+        return RenderResult(encoded.data, encoded.extension, encoded.encoder, encoded.fits, os.getpid(), layer_cache.get_stats())
+
+    # The cached layers are shared, so the background is copied before pasting onto it
+    background = background.copy()
+    paste_items(background, layers)
+    return RenderResult(encode_png(background), 'png', 'png', True, os.getpid(), layer_cache.get_stats())
+
+
+def encode_png(image: Image.Image) -> bytes:
+    """ Encodes a static character.
+    :param image: The character image. """
+
+    output = BytesIO()
+    image.save(output, 'png', optimize=False, compress_level=png_compress_level)
+    return output.getvalue()
+
+
+class CompositeCache:
+    """ Size-bounded LRU cache of the flattened layers below and above the previewed
+    category of a loadout, keyed by the image files they were made from. It lives in
+    each worker process, next to the layer cache. """
+
+    def __init__(self, max_bytes: int) -> None:
+        """ Class init method.
+        :param max_bytes: The maximum size of the cached composites, in bytes. """
+
+        self.max_bytes = max_bytes
+        self.nbytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        # key -> ((base, stack), size), from least to most recently used
+        self._composites: 'OrderedDict[Tuple, Tuple[Tuple[Optional[Image.Image], List[ImageLayer]], int]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._composites)
+
+    def get(
+        self, paths: List[str], background: Optional[str] = None, size: Optional[Tuple[int, int]] = None
+    ) -> Tuple[Optional[Image.Image], List[ImageLayer]]:
+        """ Gets the flattened layers of a run of items, flattening them if they aren't cached.
+        :param paths: The image paths of the items, in pasting order.
+        :param background: The background to paste them onto. [Optional][Default = A transparent canvas]
+        :param size: The size of the transparent canvas, without a background. [Optional]
+        :returns: The background with the leading static layers pasted onto it, if any, and the flattened rest. """
+
+        files = ([background] if background else []) + paths
+        key = (background is not None, size, tuple((path, os.path.getmtime(path)) for path in files))
+        if (cached := self._composites.get(key)) is not None:
+            self.hits += 1
+            self._composites.move_to_end(key)
+            return cached[0]
+
+        self.misses += 1
+        layers = [layer_cache.get(path) for path in paths]
+        if background is not None:
+            composite = flatten_layers(layer_cache.get(background).get_canvas(), layers)
+        else:
+            composite = (None, flatten_stack(layers, size))
+
+        base, stack = composite
+        nbytes = (base.width * base.height * 4 if base is not None else 0) \
+            + sum(layer.nbytes for layer in stack if not layer.is_animated)
+        if nbytes <= self.max_bytes:
+            self._composites[key] = (composite, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted) = self._composites.popitem(last=False)
+                self.nbytes -= evicted
+
+        return composite
+
+
+# The flattened loadouts of the previews, per worker process
+composite_cache = CompositeCache(max_bytes=int(os.getenv('PREVIEW_CACHE_MAX_MB', 64)) * 1024 * 1024)
+
+
+def render_preview(job: RenderJob, item_type: str) -> RenderResult:
+    """ Renders a character with one category swapped for a candidate item. Meant to run in a worker process.
+    The layers below and above the category come flattened from the composite cache, so previewing
+    items of the same category on the same loadout only pastes the candidate and what's above it.
+    :param job: The render job, with the candidate item in place of the category's equipped one.
+    :param item_type: The category of the candidate item, which is shown even if hidden. """
+
+    if item_type == 'backgrounds':
+        # The candidate is the canvas itself, everything is above it
+        base = layer_cache.get(job.background).get_canvas()
+        paths = [path for layer_type, path in job.layers if layer_type not in job.hidden]
+        stack = composite_cache.get(paths, size=base.size)[1]
+
+    else:
+        layer_types = [layer_type for layer_type, _ in job.layers]
+        index = layer_types.index(item_type)
+        below = [path for layer_type, path in job.layers[:index] if layer_type not in job.hidden]
+        above = [path for layer_type, path in job.layers[index + 1:] if layer_type not in job.hidden]
+
+        base, below_stack = composite_cache.get(below, background=job.background)
+        stack = below_stack + [layer_cache.get(job.layers[index][1])] + composite_cache.get(above, size=base.size)[1]
+
+    if any(layer.is_animated for layer in stack):
+        gif = paste_stack(base, stack, job.max_frames, job.max_frames_bytes, job.max_loop_duration)
+        encoded = encode_animation(gif.frames, gif.durations, job.output_format, job.max_bytes)
+        return RenderResult(encoded.data, encoded.extension, encoded.encoder, encoded.fits, os.getpid(), layer_cache.get_stats())
+
+    # Over a static loadout, that's the candidate and the slab of the layers above it
+    base = base.copy()
+    paste_items(base, stack)
+    return RenderResult(encode_png(base), 'png', 'png', True, os.getpid(), layer_cache.get_stats())
+
+
+class CharacterRenderer:
+    """ Runs the character renders in a pool of worker processes, off the event loop. """
+
+    def __init__(self, workers: int) -> None:
+        """ Class init method.
+        :param workers: The amount of worker processes. """
+
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # pid -> the latest layer cache stats of each worker
+        self._layer_stats: Dict[int, Dict[str, Union[int, float]]] = {}
+        # encoder settings -> [renders, bytes, over budget]
+        self._encoder_stats: Dict[str, List[int]] = {}
+
+    async def render(self, job: RenderJob) -> RenderResult:
+        """ Renders a character in a worker process.
+        :param job: The render job. """
+
+        return await self._run(render_character, job)
+
+    async def preview(self, job: RenderJob, item_type: str) -> RenderResult:
+        """ Renders a character with one category swapped for a candidate item, in a worker process.
+        :param job: The render job, with the candidate item in place of the category's equipped one.
+        :param item_type: The category of the candidate item. """
+
+        return await self._run(render_preview, job, item_type)
+
+    async def _run(self, func: Callable[..., RenderResult], *args: Any) -> RenderResult:
+        """ Runs a render in the pool. If a worker died, e.g. killed for using too much memory,
+        the pool is broken for good, so it's replaced and the render is retried once.
+        :param func: The render function.
+        :param args: The arguments of the render function. """
+
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+            pool = self._pool
+            try:
+                result = await loop.run_in_executor(pool, func, *args)
+                break
+            except BrokenProcessPool:
+                # Another render may have replaced it already
+                if self._pool is pool:
+                    self.shutdown()
+                if attempt:
+                    raise
+
+        self._add_stats(result)
+        return result
+
+    def _add_stats(self, result: RenderResult) -> None:
+        """ Records the layer cache stats of the worker that made a render, and its encoder settings.
+        :param result: The render. """
+
+        if result.layer_stats is not None:
+            self._layer_stats[result.pid] = result.layer_stats
+
+        encoder_stats = self._encoder_stats.setdefault(result.encoder, [0, 0, 0])
+        encoder_stats[0] += 1
+        encoder_stats[1] += len(result.data)
+        encoder_stats[2] += not result.fits
+
+    def shutdown(self) -> None:
+        """ Stops the workers, letting the running renders finish.
+        The next render starts fresh workers, with empty layer caches. """
+
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+        self._layer_stats.clear()
+
+    def get_layer_stats(self) -> Dict[str, Union[int, float]]:
+        """ Gets the layer cache stats of all workers added up. """
+
+        stats: Dict[str, Union[int, float]] = {
+            key: sum(worker_stats[key] for worker_stats in self._layer_stats.values())
+            for key in ('layers', 'max_layers', 'bytes', 'max_bytes', 'hits', 'misses', 'evictions')
+        }
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+        stats['workers'] = len(self._layer_stats)
+        return stats
+
+    def get_encoder_stats(self) -> Dict[str, Dict[str, int]]:
+        """ Gets how many renders each encoder setting produced, their average size
+        and how many went over the size budget, most used first. """
+
+        return {
+            encoder: {'renders': renders, 'average_bytes': total_bytes // renders, 'over_budget': over_budget}
+            for encoder, (renders, total_bytes, over_budget) in sorted(
+                self._encoder_stats.items(), key=lambda item: item[1][0], reverse=True)
+        }
+
+
+# Shared by every character render
+character_renderer = CharacterRenderer(workers=int(os.getenv('RENDER_WORKERS', 2)))
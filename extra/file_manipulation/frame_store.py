@@ -0,0 +1,147 @@
+""" Builds the frame stores of the animated item images.
+
+Usage:
+    python -m extra.file_manipulation.frame_store [category ...] [--resources DIR] [--workers N] [--force]
+
+The frames of each animated image are decoded once, converted to RGBA, trimmed to
+their visible pixels and written as one contiguous file next to it (<image>.rgba),
+with a small index of the offset, size, duration and position of each frame
+(<image>.rgba.json). The renderer maps that file
+instead of decoding the image, so the frames come straight from the OS page cache,
+which all render workers share. A store is only used while its image is unchanged.
+"""
+
+import argparse
+import json
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from PIL import Image
+
+from extra.file_manipulation.asset_pipeline import extract_frames, find_sources, trim_frames
+
+# The version of the store format, older stores are rebuilt
+store_version: int = 2
+
+
+def get_store_paths(path: str) -> Tuple[str, str]:
+    """ Gets the paths of the frame file and of the index of an image.
+    :param path: The path of the image. """
+
+    return f"{path}.rgba", f"{path}.rgba.json"
+
+
+def is_store_fresh(path: str) -> bool:
+    """ Checks whether an image has a frame store built from its current version.
+    :param path: The path of the image. """
+
+    data_path, index_path = get_store_paths(path)
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        stat = os.stat(path)
+    except (OSError, ValueError):
+        return False
+
+    return index.get('version') == store_version and index.get('source_size') == stat.st_size \
+        and index.get('source_mtime') == stat.st_mtime and os.path.isfile(data_path)
+
+
+def build_frame_store(path: str) -> bool:
+    """ Writes the frame store of an image, if it's animated.
+    :param path: The path of the image.
+    :returns: Whether a store was written. """
+
+    with Image.open(path) as image:
+        if not getattr(image, 'is_animated', False):
+            return False
+
+    stat = os.stat(path)
+    frames, durations = extract_frames(path)
+    size = frames[0].size
+    frames, positions = trim_frames(frames)
+
+    data_path, index_path = get_store_paths(path)
+    index = {
+        'version': store_version, 'source_size': stat.st_size, 'source_mtime': stat.st_mtime,
+        'mode': 'RGBA', 'size': size, 'frames': []
+    }
+    offset = 0
+    with open(f"{data_path}.tmp", 'wb') as f:
+        for frame, duration, (x, y) in zip(frames, durations, positions):
+            data = frame.tobytes()
+            f.write(data)
+            index['frames'].append([offset, frame.width, frame.height, duration, x, y])
+            offset += len(data)
+
+    with open(f"{index_path}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+
+    # The frames first, so an index never points into an older frame file
+    os.replace(f"{data_path}.tmp", data_path)
+    os.replace(f"{index_path}.tmp", index_path)
+    return True
+
+
+def load_frame_store(
+    path: str
+) -> Optional[Tuple[Tuple[Image.Image, ...], Tuple[int, ...], Tuple[Tuple[int, int], ...], Tuple[int, int]]]:
+    """ Maps the frames of an image from its frame store, without copying them.
+    The frames are read-only and stay valid even if the store is rebuilt.
+    :param path: The path of the image.
+    :returns: The trimmed frames, their durations, their positions and the size of the image,
+    or None if the image has no up-to-date store. """
+
+    if not is_store_fresh(path):
+        return
+
+    data_path, index_path = get_store_paths(path)
+    with open(index_path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+
+    with open(data_path, 'rb') as f:
+        # The mapping lives on as long as a frame refers to it
+        buffer = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    frames, durations, positions = [], [], []
+    for offset, width, height, duration, x, y in index['frames']:
+        size = width * height * 4
+        frames.append(Image.frombuffer('RGBA', (width, height), buffer[offset:offset + size], 'raw', 'RGBA', 0, 1))
+        durations.append(duration)
+        positions.append((x, y))
+
+    return tuple(frames), tuple(durations), tuple(positions), tuple(index['size'])
+
+
+def build_stale_frame_stores(resources: str, categories: List[str]) -> int:
+    """ Builds the frame stores of the images of some categories that don't have an up-to-date one.
+    :param resources: The folder of the categories.
+    :param categories: The categories.
+    :returns: The amount of stores written. """
+
+    return sum(build_frame_store(source) for source in find_sources(resources, categories) if not is_store_fresh(source))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('categories', nargs='*', help="The item categories to build the stores of. [Default = All]")
+    parser.add_argument('--resources', default='./resources', help="The folder of the item categories.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="The amount of worker processes.")
+    parser.add_argument('--force', action='store_true', help="Rebuilds the up-to-date stores too.")
+    args = parser.parse_args()
+
+    categories = args.categories or sorted(
+        folder for folder in os.listdir(args.resources) if os.path.isdir(os.path.join(args.resources, folder)))
+    all_sources = find_sources(args.resources, categories)
+    sources: List[str] = [source for source in all_sources if args.force or not is_store_fresh(source)]
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        built = sum(pool.map(build_frame_store, sources, chunksize=8))
+
+    print(f"Built: {built} | Up to date: {len(all_sources) - len(sources)} | Static: {len(sources) - built}")
+
+
+if __name__ == '__main__':
+    main()
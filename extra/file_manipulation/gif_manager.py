@@ -1,49 +1,56 @@
 from PIL import Image
 import os
+import re
 import glob
-from typing import Tuple, Dict, Union, Any
-from itertools import cycle
+from typing import Tuple, Dict, Union, Any, List, Optional, BinaryIO
+
+from extra.file_manipulation.animation_encoder import save_gif
+from extra.file_manipulation.asset_pipeline import AssetOptions, extract_frames, process_frame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 def defragment_gif(path: str, output: str) -> None:
     """ Defragments a gif into frames.
-    :param path:
-    :param output: """
+    :param path: The path of the gif.
+    :param output: The path prefix of the frames, numbered from 1. """
+
+    frames, _ = extract_frames(path)
+    for i, frame in enumerate(frames):
+        frame.save(f"{output}_{i+1}.png")
+
 
-    imageObject = Image.open(path)  # .convert('RGBA')
+def get_frame_number(path: str) -> Tuple[bool, int, str]:
+    """ Gets the sort key of a numbered frame file, e.g. spinner_10.png, so frame 10 comes after frame 2.
+    Files without a number come last, by name.
+    :param path: The path of the frame. """
 
-    # Display individual frames from the loaded animated GIF file
-    for frame in range(0, imageObject.n_frames):
-        imageObject.seek(frame)
-        imageObject.convert('RGBA')
-        imageObject.save(f"{output}_{frame+1}.png", transparency=0)
+    if match := re.search(r'_(\d+)\.png$', path, re.IGNORECASE):
+        return False, int(match.group(1)), path
+    return True, 0, path
 
 
 def remove_background(path: str, output: str) -> None:
-    """ Removes the background of image frames.
-    :param path:
-    :param output: """
-
-    # Display individual frames from the loaded animated GIF file
-    for i in range(len(glob.glob('./media/effects/fidget_spinner/*.png'))):
-        im = Image.open(f'./media/effects/fidget_spinner/fidget_spinner_{i+1}.png').convert('RGBA')
-        datas = im.getdata()
-
-        newData = []
-        # print(datas)
-        # break
-        # print(f'====={i+1}=====')
-        for item in datas:
-            if item[0] == 255 and item[1] == 255 and item[2] == 255:
-                newData.append((255, 255, 255, 0))
-            else:
-                if item[0] > 150:
-                    newData.append((0, 0, 0, 255))
-                else:
-                    newData.append(item)
-
-        im.putdata(newData)
-        im.save(f"{output}_{i+1}.png")
+    """ Removes the white background of image frames, and turns their light pixels black.
+    :param path: The folder of the frames.
+    :param output: The path prefix of the processed frames, numbered from 1. """
+
+    if np is None:
+        raise RuntimeError("Processing image frames needs NumPy: pip install numpy")
+
+    options = AssetOptions(color_key=(255, 255, 255), threshold=150, recolor=(0, 0, 0, 255))
+    for i, frame_path in enumerate(sorted(glob.glob(os.path.join(path, '*.png')), key=get_frame_number)):
+        with Image.open(frame_path) as frame:
+            pixels = np.array(frame.convert('RGBA'))
+
+        # The threshold step skips transparent pixels, but light ones that were already
+        # transparent have always been turned black here, so they're made visible first
+        light = (pixels[..., 0] > 150) & (pixels[..., 3] == 0) & (pixels[..., :3] != 255).any(axis=-1)
+        pixels[light, 3] = 255
+        process_frame(Image.fromarray(pixels, 'RGBA'), options).save(f"{output}_{i+1}.png")
 
 
 class GIF:
@@ -56,24 +63,45 @@ class GIF:
 
         self._base_image = image
         self._frames = []
+        self._durations: List[int] = []
         self._frame_duration = frame_duration
 
-    def add_frame(self, image: Image.Image) -> None:
+    def add_frame(self, image: Image.Image, duration: Optional[int] = None) -> None:
+        """ Adds a frame to the GIF.
+        :param image: The frame.
+        :param duration: The duration of the frame. [Optional][Default = The GIF's frame duration] """
+
         if not isinstance(image, Image.Image):
             raise TypeError("PIL.Image.Image expected")
 
         self._frames.append(image)
+        self._durations.append(self._frame_duration if duration is None else duration)
+
+    @property
+    def frames(self) -> List[Image.Image]:
+        return self._frames
+
+    @property
+    def durations(self) -> List[int]:
+        """ The duration of each frame, in milliseconds. """
+
+        return self._durations
+
+    def extend_last_frame(self, duration: int) -> None:
+        """ Shows the last frame for longer, instead of adding an identical one.
+        :param duration: The duration to add to the last frame. """
+
+        self._durations[-1] += duration
 
     def new_frame(self) -> Image:
         """ Retrieves a copy of the base image. """
 
         return self._base_image.copy()
 
-    def export(self, path: str, **kwargs) -> None:
+    def export(self, path: Union[str, BinaryIO], **kwargs) -> None:
         """ Saves the gif.
-        :param path: The path that the GIF is gonna be saved in. """
+        :param path: The path or the file object that the GIF is gonna be saved in. """
         image = self._base_image.copy()
         image.paste(self._frames[0], (0, 0), self._frames[0].convert('RGBA'))
-        image.save(path, "GIF", save_all=True, append_images=self._frames,
-                   duration=self._frame_duration, quality=90, loop=0, **kwargs)
+        save_gif([image] + self._frames[1:], self._durations, path, **kwargs)
 
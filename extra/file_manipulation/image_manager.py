@@ -0,0 +1,190 @@
+from PIL import Image, ImageSequence
+
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+
+from extra.file_manipulation.asset_pipeline import trim_frames
+from extra.file_manipulation.frame_store import load_frame_store
+
+
+class ImageLayer:
+    """ A decoded item image, with all of its frames converted to RGBA and usually trimmed
+    to their visible pixels, each with its position on the image's canvas.
+    The frames are shared by every render, so they must never be drawn onto. """
+
+    __slots__ = ('frames', 'durations', 'offsets', 'size', 'is_animated', 'nbytes')
+
+    def __init__(self,
+        frames: Tuple[Image.Image, ...], durations: Tuple[int, ...], offsets: Optional[Tuple[Tuple[int, int], ...]] = None,
+        size: Optional[Tuple[int, int]] = None, mapped: bool = False
+    ) -> None:
+        """ Class init method.
+        :param frames: The RGBA frames of the image.
+        :param durations: The duration of each frame, in milliseconds.
+        :param offsets: The position of each frame on the canvas. [Optional][Default = The top left corner]
+        :param size: The size of the canvas. [Optional][Default = The size of the first frame]
+        :param mapped: Whether the frames are mapped from a frame store, in which case they
+        live in the OS page cache, not in the process' memory. [Default = False] """
+
+        self.frames = frames
+        self.durations = durations
+        self.offsets = offsets or ((0, 0),) * len(frames)
+        self.size = size or frames[0].size
+        self.is_animated: bool = len(frames) > 1
+        self.nbytes: int = 0 if mapped else sum(frame.width * frame.height * len(frame.getbands()) for frame in frames)
+
+    @property
+    def n_frames(self) -> int:
+        return len(self.frames)
+
+    @property
+    def image(self) -> Image.Image:
+        """ The first frame of the image. """
+
+        return self.frames[0]
+
+    @property
+    def offset(self) -> Tuple[int, int]:
+        """ The position of the first frame on the canvas. """
+
+        return self.offsets[0]
+
+    def get_canvas(self, index: int = 0) -> Image.Image:
+        """ Gets a frame on the whole canvas, as it is in the image file.
+        :param index: The index of the frame. [Default = 0] """
+
+        frame = self.frames[index]
+        if self.offsets[index] == (0, 0) and frame.size == self.size:
+            return frame
+
+        canvas = Image.new('RGBA', self.size, (0, 0, 0, 0))
+        canvas.paste(frame, self.offsets[index])
+        return canvas
+
+    @classmethod
+    def trimmed(cls, frames: List[Image.Image], durations: Tuple[int, ...]) -> 'ImageLayer':
+        """ Makes a layer out of full-canvas frames, trimming them to their visible pixels.
+        :param frames: The RGBA frames.
+        :param durations: The duration of each frame, in milliseconds. """
+
+        size = frames[0].size
+        frames, offsets = trim_frames(frames)
+        return cls(tuple(frames), durations, tuple(offsets), size)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'ImageLayer':
+        """ Decodes an image file into a layer, or maps its frames if it has a frame store.
+        :param path: The path of the image file. """
+
+        if (stored := load_frame_store(path)) is not None:
+            return cls(*stored, mapped=True)
+
+        with Image.open(path) as image:
+            if getattr(image, 'is_animated', False):
+                frames, durations = [], []
+                for frame in ImageSequence.Iterator(image):
+                    frames.append(frame.convert('RGBA'))
+                    durations.append(frame.info.get('duration', 0))
+                return cls.trimmed(frames, tuple(durations))
+
+            return cls.trimmed([image.convert('RGBA')], (image.info.get('duration', 0),))
+
+
+class LayerCache:
+    """ Bounded LRU cache of decoded item layers, keyed by path and modification time,
+    that evicts the least recently used layers once their decoded size or their amount
+    exceeds a budget. """
+
+    def __init__(self, max_bytes: int, max_layers: int) -> None:
+        """ Class init method.
+        :param max_bytes: The maximum decoded size of the cached layers, in bytes.
+        :param max_layers: The maximum amount of cached layers. Mapped layers take no
+        decoded memory, but each one keeps a mapping and a file descriptor open. """
+
+        self.max_bytes = max_bytes
+        self.max_layers = max_layers
+        self.nbytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._layers: 'OrderedDict[Tuple[str, float], ImageLayer]' = OrderedDict()
+        # path -> the mtime of its cached layer, to drop outdated versions
+        self._mtimes: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._layers)
+
+    def get(self, path: str) -> ImageLayer:
+        """ Gets the decoded layer of an image file, decoding it if it isn't cached or changed.
+        :param path: The path of the image file. """
+
+        path = os.path.normpath(path)
+        mtime = os.path.getmtime(path)
+        key = (path, mtime)
+
+        if (layer := self._layers.get(key)) is not None:
+            self.hits += 1
+            self._layers.move_to_end(key)
+            return layer
+
+        self.misses += 1
+        layer = ImageLayer.from_file(path)
+
+        # Drops the version of the file that was cached before it changed
+        if (old_mtime := self._mtimes.get(path)) is not None:
+            self._remove((path, old_mtime))
+
+        if layer.nbytes <= self.max_bytes:
+            self._layers[key] = layer
+            self._mtimes[path] = mtime
+            self.nbytes += layer.nbytes
+            while self.nbytes > self.max_bytes or len(self._layers) > self.max_layers:
+                self._remove(next(iter(self._layers)))
+                self.evictions += 1
+
+        return layer
+
+    def _remove(self, key: Tuple[str, float]) -> None:
+        """ Removes a layer from the cache.
+        :param key: The path and mtime of the layer. """
+
+        if (layer := self._layers.pop(key, None)) is not None:
+            self.nbytes -= layer.nbytes
+            if self._mtimes.get(key[0]) == key[1]:
+                del self._mtimes[key[0]]
+
+    def invalidate(self, folder: Optional[str] = None) -> None:
+        """ Removes the cached layers of a folder, or all of them.
+        :param folder: The folder whose layers to remove. [Optional][Default = All] """
+
+        if folder is None:
+            self._layers.clear()
+            self._mtimes.clear()
+            self.nbytes = 0
+            return
+
+        folder = os.path.normpath(folder) + os.sep
+        for key in [key for key in self._layers if key[0].startswith(folder)]:
+            self._remove(key)
+
+    def get_stats(self) -> Dict[str, Union[int, float]]:
+        """ Gets the cache's memory footprint and hit/miss counters. """
+
+        lookups = self.hits + self.misses
+        return {
+            'layers': len(self._layers),
+            'max_layers': self.max_layers,
+            'bytes': self.nbytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Shared by every character render
+layer_cache = LayerCache(
+    max_bytes=int(os.getenv('LAYER_CACHE_MAX_MB', 256)) * 1024 * 1024,
+    max_layers=int(os.getenv('LAYER_CACHE_MAX_LAYERS', 512)))
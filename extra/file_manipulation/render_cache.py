@@ -0,0 +1,198 @@
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+
+from extra.file_manipulation.character_renderer import RenderJob
+
+
+def make_render_key(job: RenderJob) -> str:
+    """ Hashes everything a render depends on: the equipped images, the hidden
+    categories, the output settings and the modification time of each image.
+    :param job: The render job. """
+
+    paths = [job.background] + [path for item_type, path in job.layers if item_type not in job.hidden]
+    mtimes = tuple(os.path.getmtime(path) for path in paths)
+    # Spelled out, since the order of a frozenset's repr changes with the hash seed of each run
+    fields = (
+        job.background, job.layers, tuple(sorted(job.hidden)), job.output_format, job.max_bytes,
+        job.max_frames, job.max_frames_bytes, job.max_loop_duration
+    )
+    return hashlib.sha1(repr((fields, mtimes)).encode()).hexdigest()
+
+
+class RenderCache:
+    """ Size-bounded on-disk LRU cache of rendered characters, keyed by the hash of their
+    loadout, with an in-memory index of the cached files. The disk is only touched in the
+    default executor, never on the event loop. """
+
+    def __init__(self, folder: str, max_bytes: int) -> None:
+        """ Class init method.
+        :param folder: The folder in which to store the rendered files.
+        :param max_bytes: The maximum size of the cached files, in bytes. Zero disables the cache. """
+
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.nbytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.loaded: bool = False
+        # key -> (file name, size), from least to most recently used
+        self._files: 'OrderedDict[str, Tuple[str, int]]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def _scan(self) -> List[Tuple[float, str, str, int]]:
+        """ Lists the files left in the folder by a previous run. """
+
+        if not os.path.isdir(self.folder):
+            return []
+
+        files = []
+        for entry in os.scandir(self.folder):
+            key, extension = os.path.splitext(entry.name)
+            if entry.is_file() and extension != '.tmp':
+                stat = entry.stat()
+                files.append((stat.st_mtime, key, entry.name, stat.st_size))
+        return files
+
+    async def _load(self) -> None:
+        """ Indexes the files left in the folder by a previous run, oldest first. """
+
+        if self.loaded:
+            return
+
+        loop = asyncio.get_running_loop()
+        files = await loop.run_in_executor(None, self._scan)
+        # Another call may have indexed the folder in the meantime
+        if self.loaded:
+            return
+
+        self.loaded = True
+        for _, key, file_name, size in sorted(files):
+            self._files[key] = (file_name, size)
+            self.nbytes += size
+
+        await self._delete(self._evict())
+
+    async def get(self, key: str) -> Optional[str]:
+        """ Gets the path of a cached render.
+        :param key: The render key. """
+
+        if not self.max_bytes:
+            return
+
+        await self._load()
+
+        if (cached := self._files.get(key)) is not None:
+            path = os.path.join(self.folder, cached[0])
+            loop = asyncio.get_running_loop()
+            if await loop.run_in_executor(None, os.path.isfile, path):
+                self.hits += 1
+                self._files.move_to_end(key)
+                return path
+
+            # The file was removed from outside the bot
+            self._forget(key)
+
+        self.misses += 1
+
+    async def put(self, key: str, data: bytes, extension: str) -> None:
+        """ Stores a render, evicting the least recently used ones if the cache gets too big.
+        :param key: The render key.
+        :param data: The encoded image.
+        :param extension: The file extension of the image. """
+
+        if not self.max_bytes or len(data) > self.max_bytes:
+            return
+
+        await self._load()
+
+        file_name = f"{key}.{extension}"
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._write, file_name, data)
+
+        # The same key always gets the same file name, so it was just overwritten
+        self._forget(key)
+        self._files[key] = (file_name, len(data))
+        self.nbytes += len(data)
+        await self._delete(self._evict())
+
+    def _write(self, file_name: str, data: bytes) -> None:
+        """ Writes a file atomically, so a render is never read half-written.
+        :param file_name: The name of the file.
+        :param data: The content of the file. """
+
+        os.makedirs(self.folder, exist_ok=True)
+        path = os.path.join(self.folder, file_name)
+        with open(f"{path}.tmp", 'wb') as f:
+            f.write(data)
+        os.replace(f"{path}.tmp", path)
+
+    def _evict(self) -> List[str]:
+        """ Removes the least recently used renders from the index until the cache fits its budget.
+        :returns: The names of the files to delete. """
+
+        file_names = []
+        while self.nbytes > self.max_bytes and self._files:
+            file_names.append(self._forget(next(iter(self._files))))
+            self.evictions += 1
+        return file_names
+
+    def _forget(self, key: str) -> Optional[str]:
+        """ Removes a render from the index.
+        :param key: The render key.
+        :returns: The name of its file, if it was indexed. """
+
+        if (cached := self._files.pop(key, None)) is None:
+            return
+
+        self.nbytes -= cached[1]
+        return cached[0]
+
+    async def _delete(self, file_names: List[str]) -> None:
+        """ Deletes some renders from the disk.
+        :param file_names: The names of the files. """
+
+        if not file_names:
+            return
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._remove_files, file_names)
+
+    def _remove_files(self, file_names: List[str]) -> None:
+        """ Removes files from the folder, ignoring the ones already gone.
+        :param file_names: The names of the files. """
+
+        for file_name in file_names:
+            try:
+                os.remove(os.path.join(self.folder, file_name))
+            except FileNotFoundError:
+                pass
+
+    async def invalidate(self) -> None:
+        """ Removes all cached renders. """
+
+        await self._load()
+        await self._delete([self._forget(key) for key in list(self._files)])
+
+    def get_stats(self) -> Dict[str, Union[int, float]]:
+        """ Gets the cache's disk footprint and hit/miss counters. """
+
+        lookups = self.hits + self.misses
+        return {
+            'renders': len(self._files),
+            'bytes': self.nbytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Shared by the character command and the commands that change a loadout
+render_cache = RenderCache('media/render_cache', max_bytes=int(os.getenv('RENDER_CACHE_MAX_MB', 128)) * 1024 * 1024)
@@ -0,0 +1,233 @@
+from fuzzywuzzy import fuzz
+
+import os
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    # Native edit-distance ratio; it's what fuzzywuzzy itself uses when installed
+    from Levenshtein import ratio as levenshtein_ratio
+except ImportError:
+    levenshtein_ratio = None
+
+punctuation_variants: Tuple[str] = ('.', ';', ':', ',', '!', '?')
+
+
+def ratio(s1: str, s2: str) -> int:
+    """ Gives the same similarity percentage as fuzz.ratio, through the
+    native Levenshtein ratio whenever it's available.
+    :param s1: The first string.
+    :param s2: The second string. """
+
+    if s1 == s2:
+        return 100
+
+    if not s1 or not s2:
+        return 0
+
+    if levenshtein_ratio is None:
+        return fuzz.ratio(s1, s2)
+
+    return int(round(100 * levenshtein_ratio(s1, s2)))
+
+
+def normalize_answer(answer: str) -> str:
+    """ Normalizes an answer for comparison, by removing a trailing
+    punctuation mark and lowercasing it.
+    :param answer: The answer to normalize. """
+
+    if answer.endswith(punctuation_variants):
+        answer = answer[:-1]
+
+    return answer.lower()
+
+
+def can_be_similar(total: int, common: int, threshold: int = 89) -> bool:
+    """ Checks whether two words could reach a similarity threshold. The ratio is at most
+    twice their common characters over their total length, and it's rounded.
+    :param total: The length of both words together.
+    :param common: An upper bound of the characters they have in common.
+    :param threshold: The minimum similarity percentage. [Default = 89] """
+
+    return total > 0 and 200 * common >= (threshold - 0.5) * total
+
+
+def is_similar(word: str, other: str, threshold: int = 89) -> bool:
+    """ Checks whether two lowercased words are similar enough to be a match.
+    Pairs whose lengths alone rule out the threshold skip the ratio call.
+    :param word: The first word.
+    :param other: The second word.
+    :param threshold: The minimum similarity percentage. [Default = 89] """
+
+    if not can_be_similar(len(word) + len(other), min(len(word), len(other)), threshold):
+        return False
+
+    return ratio(word, other) >= threshold
+
+
+def get_similar_pairs(user_words: Iterable[str], correct_words: Iterable[str], threshold: int = 89) -> Set[Tuple[str, str]]:
+    """ Finds the pairs of different lowercased words that are similar enough to be a match.
+    Each distinct pair is checked once, and only the pairs whose lengths and shared
+    characters could reach the threshold get a ratio call.
+    :param user_words: The lowercased words of the user answer.
+    :param correct_words: The lowercased words of the correct answer.
+    :param threshold: The minimum similarity percentage. [Default = 89] """
+
+    correct_counts = [(word, Counter(word)) for word in set(correct_words)]
+    similar: Set[Tuple[str, str]] = set()
+    for user_word in set(user_words):
+        user_counts = Counter(user_word)
+        for correct_word, counts in correct_counts:
+            total = len(user_word) + len(correct_word)
+            if user_word == correct_word or not can_be_similar(total, min(len(user_word), len(correct_word)), threshold):
+                continue
+
+            if can_be_similar(total, sum((user_counts & counts).values()), threshold) \
+                    and ratio(user_word, correct_word) >= threshold:
+                similar.add((user_word, correct_word))
+
+    return similar
+
+
+# Costs of each alignment step
+exact_cost, fuzzy_cost, indel_cost, substitution_cost = 0, 1, 2, 3
+
+
+def highlight_words(user_words: List[str], correct_words: List[str], lower_correct_words: Optional[List[str]] = None) -> str:
+    """ Aligns the user's words with the correct ones in a single dynamic-programming
+    pass, and highlights the differences. Similar words are bolded, wrong or extra words
+    are struck through, and missing correct words are shown struck through.
+    :param user_words: The words of the user answer.
+    :param correct_words: The words of the correct answer.
+    :param lower_correct_words: The lowercased correct words, if precomputed. [Optional] """
+
+    if lower_correct_words is None:
+        lower_correct_words = [word.lower() for word in correct_words]
+
+    lower_user_words = [word.lower() for word in user_words]
+    n, m = len(user_words), len(correct_words)
+
+    # steps[i][j] tells how the best alignment of the first i user words and j correct words ends
+    steps: List[bytearray] = [bytearray(m + 1) for _ in range(n + 1)]
+    previous: List[int] = [j * indel_cost for j in range(m + 1)]
+    for j in range(1, m + 1):
+        steps[0][j] = ord('d')
+
+    # The inner loop only looks the pairs up
+    similar = get_similar_pairs(lower_user_words, lower_correct_words)
+    for i in range(1, n + 1):
+        user_word = lower_user_words[i - 1]
+        current: List[int] = [i * indel_cost] + [0] * m
+        steps[i][0] = ord('i')
+        for j in range(1, m + 1):
+            correct_word = lower_correct_words[j - 1]
+            if user_word == correct_word:
+                diagonal, step = exact_cost, 'e'
+            elif (user_word, correct_word) in similar:
+                diagonal, step = fuzzy_cost, 'f'
+            else:
+                diagonal, step = substitution_cost, 's'
+
+            # On a tie, a missing or extra word is preferred over a substitution
+            best, best_step = previous[j - 1] + diagonal, step
+            if (cost := previous[j] + indel_cost) < best + (best_step == 's'):
+                best, best_step = cost, 'i'
+            if (cost := current[j - 1] + indel_cost) < best + (best_step == 's'):
+                best, best_step = cost, 'd'
+
+            current[j] = best
+            steps[i][j] = ord(best_step)
+        previous = current
+
+    # Walks the alignment back, from the end of both answers
+    highlighted: List[str] = []
+    i, j = n, m
+    while i or j:
+        step = chr(steps[i][j])
+        if step == 'd':
+            highlighted.append(f"~~`{correct_words[j - 1]}`~~")
+            j -= 1
+        elif step == 'i':
+            highlighted.append(f"~~`{user_words[i - 1]}`~~")
+            i -= 1
+        else:
+            user_word = user_words[i - 1]
+            if step == 'e':
+                highlighted.append(user_word)
+            elif step == 'f':
+                highlighted.append(f"**{user_word}**")
+            else:
+                highlighted.append(f"~~`{user_word}`~~")
+            i -= 1
+            j -= 1
+
+    return ' '.join(reversed(highlighted))
+
+
+class AnswerKey:
+    """ An audio's answer, with the forms used for scoring precomputed. """
+
+    __slots__ = ('text', 'normalized', 'words', 'lower_words')
+
+    def __init__(self, text: str) -> None:
+        """ Class init method.
+        :param text: The answer text. """
+
+        self.text = text
+        self.normalized = normalize_answer(text)
+        self.words: List[str] = text.split()
+        self.lower_words: List[str] = [word.lower() for word in self.words]
+
+
+class AnswerScore:
+    """ The result of scoring a player's answer. """
+
+    __slots__ = ('accuracy', 'correct', 'highlighted')
+
+    def __init__(self, accuracy: int, correct: bool, highlighted: Optional[str] = None) -> None:
+        """ Class init method.
+        :param accuracy: The accuracy percentage of the answer.
+        :param correct: Whether the answer is accepted.
+        :param highlighted: The player's answer with the wrong words highlighted. [Optional] """
+
+        self.accuracy = accuracy
+        self.correct = correct
+        self.highlighted = highlighted
+
+
+class AnswerKeyCache:
+    """ Keeps the answer keys of the audio files, read once per file. """
+
+    def __init__(self) -> None:
+        """ Class init method. """
+
+        self._keys: Dict[str, Tuple[float, AnswerKey]] = {}
+
+    def get(self, text_path: str) -> AnswerKey:
+        """ Gets the answer key of an answer file, reading it only if it changed.
+        :param text_path: The path to the text file. """
+
+        try:
+            mtime = os.path.getmtime(text_path)
+        except OSError:
+            return AnswerKey('?')
+
+        cached = self._keys.get(text_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        text_source: str = '?'
+        try:
+            with open(text_path, 'r', encoding="utf-8") as f:
+                text_source = f.read()
+        except Exception:
+            pass
+
+        answer_key = AnswerKey(text_source.strip())
+        self._keys[text_path] = (mtime, answer_key)
+        return answer_key
+
+    def clear(self) -> None:
+        """ Clears all cached answer keys. """
+
+        self._keys.clear()
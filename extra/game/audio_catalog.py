@@ -0,0 +1,114 @@
+import os
+import random
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class AudioDeck:
+    """ The audio folders a game session can still draw from. """
+
+    __slots__ = ('language', 'difficulty', 'folders', 'version')
+
+    def __init__(self, language: str, difficulty: str, folders: List[str], version: int) -> None:
+        """ Class init method.
+        :param language: The language of the audios.
+        :param difficulty: The difficulty of the audios.
+        :param folders: The folders that haven't been drawn yet.
+        :param version: The catalog version the folders came from. """
+
+        self.language = language
+        self.difficulty = difficulty
+        self.folders = folders
+        self.version = version
+
+
+class AudioCatalog:
+    """ In-memory index of the game's audio folders, keyed by (language, difficulty). """
+
+    def __init__(self, root_path: str = './resources/Audio Files') -> None:
+        """ Class init method.
+        :param root_path: The folder containing the language folders. """
+
+        self.root_path = root_path
+        self.version: int = 0
+        self._index: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """ Rescans the audio folders. Must be called whenever the files on disk change. """
+
+        index: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+        if os.path.isdir(self.root_path):
+            for language in os.listdir(self.root_path):
+                language_path = os.path.join(self.root_path, language)
+                if not os.path.isdir(language_path):
+                    continue
+
+                for difficulty in os.listdir(language_path):
+                    difficulty_path = os.path.join(language_path, difficulty)
+                    if not os.path.isdir(difficulty_path):
+                        continue
+
+                    index[(language, difficulty)] = tuple(
+                        folder for folder in os.listdir(difficulty_path)
+                        if os.path.isdir(os.path.join(difficulty_path, folder))
+                    )
+
+        self._index = index
+        self.version += 1
+
+    @property
+    def languages(self) -> List[str]:
+        """ Gets all languages that have audios. """
+
+        return sorted({language for language, _ in self._index})
+
+    def count(self) -> int:
+        """ Gets the total amount of audio folders. """
+
+        return sum(map(len, self._index.values()))
+
+    def get_folders(self, language: str, difficulty: str) -> Tuple[str, ...]:
+        """ Gets all audio folders of a language and difficulty.
+        :param language: The language of the audios.
+        :param difficulty: The difficulty of the audios. """
+
+        return self._index.get((language, difficulty), ())
+
+    def get_path(self, language: str, difficulty: str, folder: str) -> str:
+        """ Gets the path of an audio folder.
+        :param language: The language of the audio.
+        :param difficulty: The difficulty of the audio.
+        :param folder: The audio folder. """
+
+        return f"{self.root_path}/{language}/{difficulty}/{folder}"
+
+    def new_deck(self, language: str, difficulty: str) -> AudioDeck:
+        """ Makes a deck with all audio folders of a language and difficulty.
+        :param language: The language of the audios.
+        :param difficulty: The difficulty of the audios. """
+
+        return AudioDeck(language, difficulty, list(self.get_folders(language, difficulty)), self.version)
+
+    def draw(self, deck: AudioDeck, excluded: Set[str]) -> Optional[str]:
+        """ Draws a random audio folder from a deck, in O(1) amortized time.
+        Folders that are excluded are dropped from the deck as they're found,
+        so each one is looked at once per session at most.
+        :param deck: The deck to draw from.
+        :param excluded: Folders that cannot be drawn. (already played or on cooldown)
+        :returns: The folder, or None if the deck ran out of audios. """
+
+        if deck.version != self.version:
+            # The files changed on disk, so the deck is refilled with the current folders
+            deck.folders = list(self.get_folders(deck.language, deck.difficulty))
+            deck.version = self.version
+
+        folders = deck.folders
+        while folders:
+            # Swaps the picked folder with the last one and pops it
+            index = random.randrange(len(folders))
+            folders[index], folders[-1] = folders[-1], folders[index]
+            folder = folders.pop()
+            if folder not in excluded:
+                return folder
+
+        return None
@@ -21,17 +21,16 @@ class AudioFilesTable(commands.Cog):
         if await self.check_table_audio_files_exists():
             return await ctx.send(f"**Table `AudioFiles` already exists, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("""
-            CREATE TABLE AudioFiles (
-                user_id BIGINT NOT NULL,
-                file_name VARCHAR(100),
-                difficulty ENUM('A1', 'A2', 'B1', 'B2', 'C1-C2'),
-                audio_ts BIGINT NOT NULL,
-                PRIMARY KEY(user_id, file_name, difficulty)
-            )""")
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("""
+                CREATE TABLE AudioFiles (
+                    user_id BIGINT NOT NULL,
+                    file_name VARCHAR(100),
+                    difficulty ENUM('A1', 'A2', 'B1', 'B2', 'C1-C2'),
+                    audio_ts BIGINT NOT NULL,
+                    PRIMARY KEY(user_id, file_name, difficulty)
+                )""")
+            await db.commit()
         await ctx.send(f"**Successfully created the `AudioFiles` table, {member.mention}!**")
 
     @commands.command(hidden=True)
@@ -43,10 +42,9 @@ class AudioFilesTable(commands.Cog):
         if not await self.check_table_audio_files_exists():
             return await ctx.send(f"**Table `AudioFiles` doesn't exist, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DROP AudioFiles")
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DROP AudioFiles")
+            await db.commit()
         await ctx.send(f"**Successfully dropped the `AudioFiles` table, {member.mention}!**")
 
     @commands.command(hidden=True)
@@ -58,20 +56,18 @@ class AudioFilesTable(commands.Cog):
         if not await self.check_table_audio_files_exists():
             return await ctx.send(f"**Table `AudioFiles` doesn't exist yet, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DELETE FROM AudioFiles")
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DELETE FROM AudioFiles")
+            await db.commit()
         await ctx.send(f"**Successfully reset the `AudioFiles` table, {member.mention}!**")
 
 
     async def check_table_audio_files_exists(self) -> bool:
         """ Checks whether the AudioFiles table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'AudioFiles'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("SHOW TABLE STATUS LIKE 'AudioFiles'")
+            exists = await mycursor.fetchone()
         if exists:
             return True
         else:
@@ -84,14 +80,13 @@ class AudioFilesTable(commands.Cog):
         :param difficulty: The difficulty of the audio.
         :param current_ts: The current timestamp. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("""
-            INSERT INTO AudioFiles (
-                user_id, file_name, difficulty, audio_ts
-            ) VALUES (%s, %s, %s, %s)
-        """, (user_id, file_name, difficulty, current_ts))
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("""
+                INSERT INTO AudioFiles (
+                    user_id, file_name, difficulty, audio_ts
+                ) VALUES (%s, %s, %s, %s)
+            """, (user_id, file_name, difficulty, current_ts))
+            await db.commit()
 
     async def get_audio_file(self, user_id: int, file_name: str, difficulty: str) -> List[Union[int, str]]:
         """ Gets an AudioFile from a user from the database.
@@ -99,12 +94,11 @@ class AudioFilesTable(commands.Cog):
         :param file_name: The file name.
         :param difficulty: The difficulty of the audio. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("""
-            SELECT * FROM AudioFiles WHERE user_id = %s AND file_name = %s AND difficulty = %s
-            """, (user_id, file_name, difficulty))
-        audio_file = await mycursor.fetchone()
-        await mycursor.close()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("""
+                SELECT * FROM AudioFiles WHERE user_id = %s AND file_name = %s AND difficulty = %s
+                """, (user_id, file_name, difficulty))
+            audio_file = await mycursor.fetchone()
         return audio_file
 
     async def get_audio_files(self, user_id: int, difficulty: str) -> List[List[Union[int, str]]]:
@@ -112,10 +106,9 @@ class AudioFilesTable(commands.Cog):
         :param user_id: The user ID.
         :param difficulty: The difficulty of the audio. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SELECT * FROM AudioFiles WHERE user_id = %s AND difficulty = %s", (user_id, difficulty))
-        audio_files = await mycursor.fetchall()
-        await mycursor.close()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("SELECT * FROM AudioFiles WHERE user_id = %s AND difficulty = %s", (user_id, difficulty))
+            audio_files = await mycursor.fetchall()
         return audio_files
 
     async def get_reproduced_audio_files(self, user_id: int, difficulty: str, current_ts: int) -> List[str]:
@@ -123,12 +116,11 @@ class AudioFilesTable(commands.Cog):
         :param user_id: The user ID.
         :param difficulty: The difficulty of the audios. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("""
-            SELECT file_name, audio_ts FROM AudioFiles WHERE user_id = %s AND difficulty = %s
-        """, (user_id, difficulty))
-        reproduced_audios = await mycursor.fetchall()
-        await mycursor.close()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("""
+                SELECT file_name, audio_ts FROM AudioFiles WHERE user_id = %s AND difficulty = %s
+            """, (user_id, difficulty))
+            reproduced_audios = await mycursor.fetchall()
         return reproduced_audios
 
     async def update_audio_file(self, user_id: int, file_name: str, difficulty: str, current_ts: int) -> None:
@@ -138,27 +130,24 @@ class AudioFilesTable(commands.Cog):
         :param difficulty: The difficulty of the audio.
         :param current_ts: The new timestamp. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("""
-            UPDATE AudioFiles SET audio_ts = %s
-            WHERE user_id = %s AND file_name = %s AND difficulty = %s
-        """, (current_ts, user_id, file_name, difficulty))
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("""
+                UPDATE AudioFiles SET audio_ts = %s
+                WHERE user_id = %s AND file_name = %s AND difficulty = %s
+            """, (current_ts, user_id, file_name, difficulty))
+            await db.commit()
 
     async def delete_specific_audio_files(self, user_id: int) -> None:
         """ Deletes AudioFiles for a specific user.
         :param user_id: The user ID. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DELETE FROM AudioFiles WHERE user_id = %s", (user_id,))
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DELETE FROM AudioFiles WHERE user_id = %s", (user_id,))
+            await db.commit()
 
     async def delete_audio_files(self) -> None:
         """ Deletes all AudioFiles. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DELETE FROM AudioFiles")
-        await db.commit()
-        await mycursor.close()
\ No newline at end of file
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DELETE FROM AudioFiles")
+            await db.commit()
\ No newline at end of file
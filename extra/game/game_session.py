@@ -0,0 +1,92 @@
+import discord
+
+from typing import Dict, Optional
+
+from extra.game.audio_catalog import AudioDeck
+
+
+class GameSession:
+    """ The state of one game being played in a voice channel. """
+
+    __slots__ = (
+        'player', 'difficulty', 'language', 'txt', 'vc', 'answer', 'session_id',
+        'status', 'audio_path', 'reproduced_audios', 'audio_deck',
+        'round', 'lives', 'right_answers', 'wrong_answers'
+    )
+
+    def __init__(self,
+        player: discord.Member, difficulty: str, language: str, txt: discord.TextChannel,
+        vc: discord.VoiceChannel, answer: discord.PartialMessageable, session_id: str
+    ) -> None:
+        """ Class init method.
+        :param player: The member who's playing.
+        :param difficulty: The difficulty mode of the game.
+        :param language: The language of the game.
+        :param txt: The text channel in which the game is played.
+        :param vc: The voice channel in which the game is played.
+        :param answer: The function used to answer the play command.
+        :param session_id: The ID of the session. """
+
+        self.player = player
+        self.difficulty = difficulty
+        self.language = language
+        self.txt = txt
+        self.vc = vc
+        self.answer = answer
+        self.session_id = session_id
+
+        self.status: str = 'normal'
+        self.audio_path: Optional[str] = None
+        self.reproduced_audios: List[str] = []
+        self.audio_deck: Optional[AudioDeck] = None
+        self.round: int = 0
+        self.lives: int = 3
+        self.right_answers: int = 0
+        self.wrong_answers: int = 0
+
+
+class GameSessionRegistry:
+    """ Keeps the running game sessions, one per server, since a bot
+    can only be connected to one voice channel per server. """
+
+    def __init__(self) -> None:
+        """ Class init method. """
+
+        # guild_id -> session
+        self._sessions: Dict[int, GameSession] = {}
+
+    def get(self, guild_id: int) -> Optional[GameSession]:
+        """ Gets the session running in a server.
+        :param guild_id: The ID of the server. """
+
+        return self._sessions.get(guild_id)
+
+    def get_by_player(self, player_id: int) -> Optional[GameSession]:
+        """ Gets the session someone is playing.
+        :param player_id: The ID of the player. """
+
+        return discord.utils.find(lambda s: s.player.id == player_id, self._sessions.values())
+
+    def is_active(self, session: GameSession) -> bool:
+        """ Checks whether a session is still the one running in its server.
+        :param session: The session to check. """
+
+        return self._sessions.get(session.vc.guild.id) is session
+
+    def start(self, session: GameSession) -> bool:
+        """ Registers a session, if no other one is running in its server.
+        :param session: The session to register.
+        :returns: Whether the session was registered. """
+
+        if session.vc.guild.id in self._sessions:
+            return False
+
+        self._sessions[session.vc.guild.id] = session
+        return True
+
+    def end(self, session: GameSession) -> None:
+        """ Unregisters a session.
+        :param session: The session to unregister. """
+
+        if self.is_active(session):
+            del self._sessions[session.vc.guild.id]
@@ -0,0 +1,155 @@
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from external_cons import make_upsert_query, the_database
+from extra.game.macaron_profile import profile_cache
+
+
+class GameStatsBuffer:
+    """ Write-behind buffer for the stats written during game rounds.
+    Mutations are collected in memory and written in a single transaction
+    when the buffer is flushed, with upserts, so no row has to be read first. """
+
+    def __init__(self) -> None:
+        """ Class init method. """
+
+        # (user_id, file_name, difficulty) -> last time the audio was played
+        self.audio_files: Dict[Tuple[int, str, str], int] = {}
+        # user_id -> [wins, losses]
+        self.round_statuses: Dict[int, List[int]] = {}
+        # user_id -> [crumbs, games_played, last_time_played, croutons]
+        self.profiles: Dict[int, List[Optional[int]]] = {}
+
+        self.flushes: int = 0
+        self.failed: int = 0
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self.audio_files) + len(self.round_statuses) + len(self.profiles)
+
+    def add_audio_file(self, user_id: int, file_name: str, difficulty: str, current_ts: int) -> None:
+        """ Records that a user has just played an audio.
+        :param user_id: The user ID.
+        :param file_name: The file name.
+        :param difficulty: The difficulty of the audio.
+        :param current_ts: The current timestamp. """
+
+        self.audio_files[(user_id, str(file_name), difficulty)] = current_ts
+
+    def add_round_status(self, user_id: int, wins: int = 0, losses: int = 0) -> None:
+        """ Adds up the wins and losses of a user.
+        :param user_id: The ID of the user.
+        :param wins: The increment value for the wins. [Default = 0]
+        :param losses: The increment value for the losses. [Default = 0] """
+
+        round_status = self.round_statuses.setdefault(user_id, [0, 0])
+        round_status[0] += wins
+        round_status[1] += losses
+
+    def add_profile(self, user_id: int, crumbs: int = 0, games_played: int = 0, last_time_played: Optional[int] = None, croutons: int = 0) -> None:
+        """ Adds up the profile changes of a user.
+        :param user_id: The ID of the user.
+        :param crumbs: The increment value for the money. (crumbs) [Default = 0]
+        :param games_played: The increment value for the games played. [Default = 0]
+        :param last_time_played: The new last time played, if any. [Optional]
+        :param croutons: The increment value for the money. (croutons) [Default = 0] """
+
+        profile = self.profiles.setdefault(user_id, [0, 0, None, 0])
+        profile[0] += crumbs
+        profile[1] += games_played
+        if last_time_played is not None:
+            profile[2] = last_time_played
+        profile[3] += croutons
+
+    def get_audio_files(self, user_id: int, difficulty: str) -> List[Tuple[str, int]]:
+        """ Gets the audios a user has played that weren't written yet.
+        :param user_id: The user ID.
+        :param difficulty: The difficulty of the audios. """
+
+        return [
+            (file_name, audio_ts) for (audio_user_id, file_name, audio_difficulty), audio_ts in self.audio_files.items()
+            if audio_user_id == user_id and audio_difficulty == difficulty
+        ]
+
+    def is_pending(self, user_id: Optional[int] = None) -> bool:
+        """ Checks whether there are profile or round status changes that weren't written yet.
+        :param user_id: The ID of the user to check. [Optional][Default = Anyone] """
+
+        if user_id is None:
+            return bool(self.round_statuses or self.profiles)
+        return user_id in self.round_statuses or user_id in self.profiles
+
+    def requeue(self,
+        audio_files: Dict[Tuple[int, str, str], int], round_statuses: Dict[int, List[int]], profiles: Dict[int, List[Optional[int]]]
+    ) -> None:
+        """ Puts back mutations that couldn't be written, merging them with the newer ones.
+        :param audio_files: The audio file timestamps.
+        :param round_statuses: The round status increments.
+        :param profiles: The profile increments. """
+
+        for key, audio_ts in audio_files.items():
+            self.audio_files[key] = max(audio_ts, self.audio_files.get(key, audio_ts))
+
+        for user_id, (wins, losses) in round_statuses.items():
+            self.add_round_status(user_id, wins, losses)
+
+        for user_id, (crumbs, games_played, last_time_played, croutons) in profiles.items():
+            if (newer := self.profiles.get(user_id)) and newer[2] is not None:
+                last_time_played = newer[2]
+            self.add_profile(user_id, crumbs, games_played, last_time_played, croutons)
+
+    async def flush(self) -> int:
+        """ Writes all buffered mutations in a single transaction.
+        If it fails, the mutations are kept to be written in the next flush.
+        :returns: The amount of rows written. """
+
+        async with self._lock:
+            if not len(self):
+                return 0
+
+            audio_files, self.audio_files = self.audio_files, {}
+            round_statuses, self.round_statuses = self.round_statuses, {}
+            profiles, self.profiles = self.profiles, {}
+
+            try:
+                async with the_database() as (mycursor, db):
+                    if audio_files:
+                        await mycursor.executemany(
+                            make_upsert_query('AudioFiles', ('user_id', 'file_name', 'difficulty'), set_columns=('audio_ts',)),
+                            [(*key, audio_ts) for key, audio_ts in audio_files.items()])
+
+                    if round_statuses:
+                        await mycursor.executemany(
+                            make_upsert_query('RoundStatus', ('user_id',), increment_columns=('wins', 'losses')),
+                            [(user_id, *round_status) for user_id, round_status in round_statuses.items()])
+
+                    if profiles:
+                        await mycursor.executemany(
+                            make_upsert_query(
+                                'MacaronProfile', ('user_id',),
+                                increment_columns=('money', 'games_played', 'croutons'), set_columns=('last_time_played',)),
+                            [(user_id, crumbs, games_played, croutons, last_time_played)
+                                for user_id, (crumbs, games_played, last_time_played, croutons) in profiles.items()])
+
+                    await db.commit()
+            except Exception:
+                self.failed += 1
+                self.requeue(audio_files, round_statuses, profiles)
+                raise
+
+            profile_cache.invalidate(*profiles)
+            self.flushes += 1
+            return len(audio_files) + len(round_statuses) + len(profiles)
+
+    def get_stats(self) -> Dict[str, int]:
+        """ Gets the buffer's pending mutations and flush counters. """
+
+        return {
+            'pending': len(self),
+            'flushes': self.flushes,
+            'failed': self.failed,
+        }
+
+
+# Shared by the game and the bot's shutdown
+game_stats = GameStatsBuffer()
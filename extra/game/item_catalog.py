@@ -0,0 +1,134 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+# Column positions of a RegisteredItems row
+IMAGE_NAME, ITEM_TYPE, ITEM_NAME, ITEM_PRICE, MESSAGE_REF, REACTION_REF, EXCLUSIVE, HIDDEN = range(8)
+
+
+class RegisteredItemsCatalog:
+    """ In-memory copy of the RegisteredItems table, indexed by case-insensitive
+    item name and image name, with by-price views per item category. """
+
+    def __init__(self) -> None:
+        """ Class init method. """
+
+        self.loaded: bool = False
+        self.version: int = 0
+        # casefolded image_name -> row
+        self._items: Dict[str, Tuple[Any, ...]] = {}
+        # casefolded item_name -> casefolded image_names
+        self._names: Dict[str, List[str]] = {}
+        # item_type -> rows ordered by price, None is all items
+        self._by_price: Optional[Dict[Optional[str], List[Tuple[Any, ...]]]] = None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def load(self, rows: List[Tuple[Any, ...]]) -> None:
+        """ Replaces the whole catalog.
+        :param rows: All RegisteredItems rows. """
+
+        self._items.clear()
+        self._names.clear()
+        for row in rows:
+            self._index(tuple(row))
+
+        self.loaded = True
+        self._changed()
+
+    def _index(self, row: Tuple[Any, ...]) -> None:
+        """ Adds a row to the indexes.
+        :param row: The row to add. """
+
+        image_key = row[IMAGE_NAME].casefold()
+        self._items[image_key] = row
+        self._names.setdefault(row[ITEM_NAME].casefold(), []).append(image_key)
+
+    def _unindex(self, image_key: str) -> None:
+        """ Removes a row from the indexes.
+        :param image_key: The casefolded image name of the row. """
+
+        row = self._items.pop(image_key)
+        name_key = row[ITEM_NAME].casefold()
+        image_keys = self._names[name_key]
+        image_keys.remove(image_key)
+        if not image_keys:
+            del self._names[name_key]
+
+    def _changed(self) -> None:
+        """ Drops the sorted views and bumps the catalog version. """
+
+        self._by_price = None
+        self.version += 1
+
+    def get(self, name: Optional[str] = None, image_name: Optional[str] = None) -> Optional[Tuple[Any, ...]]:
+        """ Gets an item by its name or its image name, ignoring the case.
+        :param name: The name of the item. [Optional]
+        :param image_name: The image name of the item. [Optional] """
+
+        if name and (image_keys := self._names.get(name.casefold())):
+            return self._items[image_keys[0]]
+
+        if image_name:
+            return self._items.get(image_name.casefold())
+
+    def get_all(self) -> List[Tuple[Any, ...]]:
+        """ Gets all items. """
+
+        return list(self._items.values())
+
+    def get_ordered_by_price(self, item_type: Optional[str] = None) -> List[Tuple[Any, ...]]:
+        """ Gets the items ordered by price.
+        :param item_type: The category of the items, or None for all of them. [Optional] """
+
+        if self._by_price is None:
+            ordered = sorted(self._items.values(), key=lambda row: row[ITEM_PRICE])
+            self._by_price = {None: ordered}
+            for row in ordered:
+                self._by_price.setdefault(row[ITEM_TYPE], []).append(row)
+
+        return self._by_price.get(item_type, [])
+
+    def add(self, row: Tuple[Any, ...]) -> None:
+        """ Adds an item, replacing the one with the same image name, if any.
+        :param row: The row of the item. """
+
+        if (image_key := row[IMAGE_NAME].casefold()) in self._items:
+            self._unindex(image_key)
+
+        self._index(tuple(row))
+        self._changed()
+
+    def update(self, name: str, column: int, value: Any) -> None:
+        """ Updates a column of the items with a given name.
+        :param name: The name of the items.
+        :param column: The position of the column to update.
+        :param value: The new value. """
+
+        for image_key in self._names.get(name.casefold(), []):
+            row = list(self._items[image_key])
+            row[column] = value
+            self._items[image_key] = tuple(row)
+
+        self._changed()
+
+    def remove(self, name: Optional[str] = None, image_name: Optional[str] = None) -> None:
+        """ Removes items by name and/or image name. If both are given, the item has to match both.
+        :param name: The name of the items. [Optional]
+        :param image_name: The image name of the item. [Optional] """
+
+        if name:
+            image_keys = list(self._names.get(name.casefold(), []))
+            if image_name:
+                image_keys = [image_key for image_key in image_keys if image_key == image_name.casefold()]
+        elif image_name:
+            image_keys = [image_name.casefold()] if image_name.casefold() in self._items else []
+        else:
+            return
+
+        for image_key in image_keys:
+            self._unindex(image_key)
+        self._changed()
+
+
+# Shared by the shop, the inventory and the item admin commands
+item_catalog = RegisteredItemsCatalog()
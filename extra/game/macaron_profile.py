@@ -1,7 +1,85 @@
 import discord
 from discord.ext import commands
-from external_cons import the_database
-from typing import Optional, List, Union, Tuple
+from external_cons import the_database, upsert_increments
+from typing import Dict, Optional, List, Union, Tuple
+from cachetools import TTLCache
+import os
+
+class MacaronProfileCache:
+    """ Bounded LRU cache, with expiration, for the MacaronProfile reads.
+    Users without a profile are cached as well, so the missing-profile checks are cheap. """
+
+    def __init__(self, maxsize: int = 1024, ttl: int = 300) -> None:
+        """ Class init method.
+        :param maxsize: The maximum amount of profiles to keep. [Default = 1024]
+        :param ttl: How many seconds a profile is kept for. [Default = 300] """
+
+        self._profiles: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generation: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(self, user_id: int) -> Tuple[bool, Optional[List[Union[str, int]]]]:
+        """ Gets a cached profile.
+        :param user_id: The ID of the user.
+        :returns: Whether it was cached, and the profile. """
+
+        try:
+            profile = self._profiles[user_id]
+        except KeyError:
+            self.misses += 1
+            return False, None
+
+        self.hits += 1
+        return True, profile
+
+    @property
+    def generation(self) -> int:
+        """ The current version of the cache, bumped by every invalidation. """
+
+        return self._generation
+
+    def set(self, user_id: int, profile: Optional[List[Union[str, int]]], generation: int) -> None:
+        """ Caches a profile read from the database, unless it was invalidated while being read.
+        :param user_id: The ID of the user.
+        :param profile: The profile, or None if the user has none.
+        :param generation: The version of the cache when the read started. """
+
+        if generation == self._generation:
+            self._profiles[user_id] = profile
+
+    def invalidate(self, *user_ids: int) -> None:
+        """ Removes some users' profiles from the cache.
+        :param user_ids: The IDs of the users. """
+
+        self._generation += 1
+        for user_id in user_ids:
+            self._profiles.pop(user_id, None)
+
+    def clear(self) -> None:
+        """ Removes all profiles from the cache. """
+
+        self._generation += 1
+        self._profiles.clear()
+
+    def get_stats(self) -> Dict[str, Union[int, float]]:
+        """ Gets the cache size and hit/miss counters. """
+
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._profiles),
+            'maxsize': self._profiles.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Shared by every cog that reads or changes profiles
+profile_cache = MacaronProfileCache(
+    maxsize=int(os.getenv('PROFILE_CACHE_SIZE', 1024)),
+    ttl=int(os.getenv('PROFILE_CACHE_TTL', 300))
+)
 
 class MacaronProfileTable(commands.Cog):
     """ Class for managing the MacaronProfile table. """
@@ -20,19 +98,18 @@ class MacaronProfileTable(commands.Cog):
         if await self.check_table_macaron_profile_exists():
             return await ctx.send(f"**Table `MacaronProfile` already exists, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("""
-            CREATE TABLE MacaronProfile (
-                user_id BIGINT NOT NULL,
-                money BIGINT DEFAULT 0,
-                games_played INT DEFAULT 0,
-                last_time_played BIGINT DEFAULT NULL,
-                croutons BIGINT DEFAULT 0,
-                PRIMARY KEY(user_id)
-            )
-        """)
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("""
+                CREATE TABLE MacaronProfile (
+                    user_id BIGINT NOT NULL,
+                    money BIGINT DEFAULT 0,
+                    games_played INT DEFAULT 0,
+                    last_time_played BIGINT DEFAULT NULL,
+                    croutons BIGINT DEFAULT 0,
+                    PRIMARY KEY(user_id)
+                )
+            """)
+            await db.commit()
         await ctx.send(f"**Successfully created the `MacaronProfile` table, {member.mention}!**")
 
     @commands.command(hidden=True)
@@ -44,10 +121,10 @@ class MacaronProfileTable(commands.Cog):
         if not await self.check_table_macaron_profile_exists():
             return await ctx.send(f"**Table `MacaronProfile` doesn't exist, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DROP MacaronProfile")
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DROP MacaronProfile")
+            await db.commit()
+        profile_cache.clear()
         await ctx.send(f"**Successfully dropped the `MacaronProfile` table, {member.mention}!**")
 
     @commands.command(hidden=True)
@@ -59,20 +136,19 @@ class MacaronProfileTable(commands.Cog):
         if not await self.check_table_macaron_profile_exists():
             return await ctx.send(f"**Table `MacaronProfile` doesn't exist yet, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DELETE FROM MacaronProfile")
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DELETE FROM MacaronProfile")
+            await db.commit()
+        profile_cache.clear()
         await ctx.send(f"**Successfully reset the `MacaronProfile` table, {member.mention}!**")
 
 
     async def check_table_macaron_profile_exists(self) -> bool:
         """ Checks whether the MacaronProfile table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'MacaronProfile'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("SHOW TABLE STATUS LIKE 'MacaronProfile'")
+            exists = await mycursor.fetchone()
         if exists:
             return True
         else:
@@ -86,23 +162,28 @@ class MacaronProfileTable(commands.Cog):
         :param last_time_played: The initial time for the last time the user played the game.
         :param croutons: The initial amount of money. (croutons) """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("""
-            INSERT INTO MacaronProfile (
-                user_id, money, games_played, last_time_played, croutons
-            ) VALUES (%s, %s, %s, %s, %s)
-        """, (user_id, crumbs, games_played, last_time_played, croutons))
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("""
+                INSERT INTO MacaronProfile (
+                    user_id, money, games_played, last_time_played, croutons
+                ) VALUES (%s, %s, %s, %s, %s)
+            """, (user_id, crumbs, games_played, last_time_played, croutons))
+            await db.commit()
+        profile_cache.invalidate(user_id)
 
     async def get_macaron_profile(self, user_id: int) -> List[Union[str, int]]:
         """ Gets a Macaron Profile.
         :param user_id: The ID of the user to get. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SELECT * FROM MacaronProfile WHERE user_id = %s", (user_id,))
-        profile = await mycursor.fetchone()
-        await mycursor.close()
+        cached, profile = profile_cache.get(user_id)
+        if cached:
+            return profile
+
+        generation = profile_cache.generation
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("SELECT * FROM MacaronProfile WHERE user_id = %s", (user_id,))
+            profile = await mycursor.fetchone()
+        profile_cache.set(user_id, profile, generation)
         return profile
 
     async def update_user_crumbs(self, user_id: int, increment: Optional[int] = 0) -> None:
@@ -110,52 +191,78 @@ class MacaronProfileTable(commands.Cog):
         :param user_id: The ID of the user to update.
         :param increment: The increment value. [Optional][Default = 0] """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("UPDATE MacaronProfile SET money = money + %s WHERE user_id = %s", (increment, user_id))
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("UPDATE MacaronProfile SET money = money + %s WHERE user_id = %s", (increment, user_id))
+            await db.commit()
+        profile_cache.invalidate(user_id)
+
+    async def update_user_croutons(self, user_id: int, increment: Optional[int] = 0) -> None:
+        """ Updates the user's money balance. (croutons)
+        :param user_id: The ID of the user to update.
+        :param increment: The increment value. [Optional][Default = 0] """
+
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("UPDATE MacaronProfile SET croutons = croutons + %s WHERE user_id = %s", (increment, user_id))
+            await db.commit()
+        profile_cache.invalidate(user_id)
 
     async def bulk_update_user_crumbs(self, users: List[Tuple[int, int]]) -> None:
         """ Bulk updates the users' money balance. (crumbs)
         :param users: The users to update """
 
-        mycursor, db = await the_database()
-        await mycursor.executemany("""
-            UPDATE MacaronProfile SET money = money + %s WHERE user_id = %s
-            """, users)
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.executemany("""
+                UPDATE MacaronProfile SET money = money + %s WHERE user_id = %s
+                """, users)
+            await db.commit()
+        profile_cache.invalidate(*(user_id for _, user_id in users))
 
     async def bulk_update_user_croutons(self, users: List[Tuple[int, int]]) -> None:
         """ Bulk updates the users' money balance. (croutons)
         :param users: The users to update """
 
-        mycursor, db = await the_database()
-        await mycursor.executemany("""
-            UPDATE MacaronProfile SET croutons = croutons + %s WHERE user_id = %s
-            """, users)
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.executemany("""
+                UPDATE MacaronProfile SET croutons = croutons + %s WHERE user_id = %s
+                """, users)
+            await db.commit()
+        profile_cache.invalidate(*(user_id for _, user_id in users))
 
     async def update_user_games_played(self, user_id: int, increment: Optional[int] = 0) -> None:
         """ Updates the user's games played counter.
         :param user_id: The ID of the user to update.
         :param increment: The increment value. [Optional][Default = 0] """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("UPDATE MacaronProfile SET games_played = games_played + %s WHERE user_id = %s", (increment, user_id))
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("UPDATE MacaronProfile SET games_played = games_played + %s WHERE user_id = %s", (increment, user_id))
+            await db.commit()
+        profile_cache.invalidate(user_id)
 
     async def update_user_last_time_played(self, user_id: int, current_ts: int) -> None:
         """ Updates the user's games played counter.
         :param user_id: The ID of the user to update.
         :param current_ts: The current timestamp. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("UPDATE MacaronProfile SET last_time_played = last_time_played + %s WHERE user_id = %s", (current_ts, user_id))
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("UPDATE MacaronProfile SET last_time_played = last_time_played + %s WHERE user_id = %s", (current_ts, user_id))
+            await db.commit()
+        profile_cache.invalidate(user_id)
+
+    async def upsert_macaron_profile(self, user_id: int, 
+        crumbs: int = 0, games_played: int = 0, last_time_played: Optional[int] = None, croutons: int = 0) -> None:
+        """ Increments a user's Macaron Profile, creating it if it doesn't exist yet.
+        :param user_id: The ID of the user to update.
+        :param crumbs: The increment value for the money field. (crumbs) [Default = 0]
+        :param games_played: The increment value for the games played field. [Default = 0]
+        :param last_time_played: The current timestamp. [Optional]
+        :param croutons: The increment value for the money field. (croutons) [Default = 0] """
+
+        await upsert_increments(
+            'MacaronProfile', {'user_id': user_id},
+            increments={'money': crumbs, 'games_played': games_played, 'croutons': croutons},
+            values={'last_time_played': last_time_played}
+        )
+        profile_cache.invalidate(user_id)
 
     async def update_macaron_profile_crumbs(self, user_id: int, 
         crumbs: Optional[int] = None, games_played: Optional[int] = None, last_time_played: Optional[int] = None) -> None:
@@ -165,34 +272,7 @@ class MacaronProfileTable(commands.Cog):
         :param games_played: The icnrement value for the games played field.
         :param last_time_played: The current timestamp. """
 
-        mycursor, db = await the_database()
-
-        if crumbs and games_played and last_time_played:
-            await mycursor.execute("""
-                UPDATE MacaronProfile SET money = money + %s, games_played = games_played + %s,
-                last_time_played = %s WHERE user_id = %s
-                """, (crumbs, games_played, last_time_played, user_id))
-
-        elif crumbs and games_played:
-            await mycursor.execute("""
-                UPDATE MacaronProfile SET money = money + %s, 
-                games_played = games_played + %s WHERE user_id = %s
-                """, (crumbs, games_played, user_id))
-        
-        elif crumbs and last_time_played:
-            await mycursor.execute("""
-                UPDATE MacaronProfile SET money = money + %s, 
-                last_time_played = %s WHERE user_id = %s
-                """, (crumbs, last_time_played, user_id))
-
-        elif games_played and last_time_played:
-            await mycursor.execute("""
-                UPDATE MacaronProfile SET games_played = games_played + %s, 
-                last_time_played = %s WHERE user_id = %s
-                """, (games_played, last_time_played, user_id))
-
-        await db.commit()
-        await mycursor.close()
+        await self.upsert_macaron_profile(user_id, crumbs=crumbs or 0, games_played=games_played or 0, last_time_played=last_time_played)
 
     async def update_macaron_profile_croutons(self, user_id: int, 
         croutons: Optional[int] = None, games_played: Optional[int] = None, last_time_played: Optional[int] = None) -> None:
@@ -202,40 +282,13 @@ class MacaronProfileTable(commands.Cog):
         :param games_played: The icnrement value for the games played field.
         :param last_time_played: The current timestamp. """
 
-        mycursor, db = await the_database()
-
-        if croutons and games_played and last_time_played:
-            await mycursor.execute("""
-                UPDATE MacaronProfile SET croutons = croutons + %s, games_played = games_played + %s,
-                last_time_played = %s WHERE user_id = %s
-                """, (croutons, games_played, last_time_played, user_id))
-
-        elif croutons and games_played:
-            await mycursor.execute("""
-                UPDATE MacaronProfile SET croutons = croutons + %s, 
-                games_played = games_played + %s WHERE user_id = %s
-                """, (croutons, games_played, user_id))
-        
-        elif croutons and last_time_played:
-            await mycursor.execute("""
-                UPDATE MacaronProfile SET croutons = croutons + %s, 
-                last_time_played = %s WHERE user_id = %s
-                """, (croutons, last_time_played, user_id))
-
-        elif games_played and last_time_played:
-            await mycursor.execute("""
-                UPDATE MacaronProfile SET games_played = games_played + %s, 
-                last_time_played = %s WHERE user_id = %s
-                """, (games_played, last_time_played, user_id))
-
-        await db.commit()
-        await mycursor.close()
+        await self.upsert_macaron_profile(user_id, croutons=croutons or 0, games_played=games_played or 0, last_time_played=last_time_played)
 
     async def delete_macaron_profile(self, user_id: int) -> None:
         """ Deletes a Macaron Profile.
         :param user_id: The ID of the user to delete. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DELETE FROM MacaronProfile WHERE user_id = %s", (user_id,))
-        await db.commit()
-        await mycursor.close()
\ No newline at end of file
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DELETE FROM MacaronProfile WHERE user_id = %s", (user_id,))
+            await db.commit()
+        profile_cache.invalidate(user_id)
\ No newline at end of file
@@ -6,15 +6,17 @@ from discord import slash_command, Option
 from external_cons import the_database
 from extra import utils
 from extra.selects import ChangeItemCategoryMenuSelect
-from extra.file_manipulation.gif_manager import GIF
+from extra.game.item_catalog import RegisteredItemsCatalog, item_catalog, IMAGE_NAME, ITEM_TYPE, ITEM_NAME, ITEM_PRICE, EXCLUSIVE, HIDDEN
+from extra.file_manipulation.character_renderer import RenderJob, character_renderer
+from extra.file_manipulation.render_cache import make_render_key, render_cache
 
 import os
-from itertools import cycle
-from typing import List, Optional, Any, Union, Dict, Tuple
+from io import BytesIO
+from typing import List, Optional, Any, Union, Dict, Set, Tuple
 from PIL import ImageDraw, ImageFont, Image, ImageSequence
 import asyncio
 
-guild_ids: List[int] = [int(os.getenv('SERVER_ID'))]
+guild_ids: List[int] = [int(gid) for gid in os.getenv('GAME_SERVER_IDS', os.getenv('SERVER_ID')).split(',')]
 
 class RegisteredItemsTable(commands.Cog):
     """ Class for managing the RegisteredItems table in the database. """
@@ -33,22 +35,21 @@ class RegisteredItemsTable(commands.Cog):
         if await self.check_table_registered_items_exists():
             return await ctx.send(f"**Table `RegisteredItems` already exists, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("""
-            CREATE TABLE RegisteredItems (
-                image_name VARCHAR(50) NOT NULL,
-                item_type VARCHAR(15) NOT NULL,
-                item_name VARCHAR(30) NOT NULL,
-                item_price INT NOT NULL,
-                message_ref BIGINT DEFAULT NULL,
-                reaction_ref VARCHAR(50) DEFAULT NULL,
-                exclusive TINYINT(1) DEFAULT 0,
-                hidden TINYINT(1) DEFAULT 0,
-                PRIMARY KEY(image_name)
-            ) CHARSET utf8mb4 COLLATE utf8mb4_unicode_ci
-        """)
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("""
+                CREATE TABLE RegisteredItems (
+                    image_name VARCHAR(50) NOT NULL,
+                    item_type VARCHAR(15) NOT NULL,
+                    item_name VARCHAR(30) NOT NULL,
+                    item_price INT NOT NULL,
+                    message_ref BIGINT DEFAULT NULL,
+                    reaction_ref VARCHAR(50) DEFAULT NULL,
+                    exclusive TINYINT(1) DEFAULT 0,
+                    hidden TINYINT(1) DEFAULT 0,
+                    PRIMARY KEY(image_name)
+                ) CHARSET utf8mb4 COLLATE utf8mb4_unicode_ci
+            """)
+            await db.commit()
         await ctx.send(f"**Successfully created the `RegisteredItems` table, {member.mention}!**")
 
     @commands.command(hidden=True)
@@ -60,10 +61,10 @@ class RegisteredItemsTable(commands.Cog):
         if not await self.check_table_registered_items_exists():
             return await ctx.send(f"**Table `RegisteredItems` doesn't exist, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DROP TABLE RegisteredItems")
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DROP TABLE RegisteredItems")
+            await db.commit()
+        item_catalog.load([])
         await ctx.send(f"**Successfully dropped the `RegisteredItems` table, {member.mention}!**")
 
     @commands.command(hidden=True)
@@ -75,20 +76,19 @@ class RegisteredItemsTable(commands.Cog):
         if not await self.check_table_registered_items_exists():
             return await ctx.send(f"**Table `RegisteredItems` doesn't exist yet, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DELETE FROM RegisteredItems")
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DELETE FROM RegisteredItems")
+            await db.commit()
+        item_catalog.load([])
         await ctx.send(f"**Successfully reset the `RegisteredItems` table, {member.mention}!**")
 
 
     async def check_table_registered_items_exists(self) -> bool:
         """ Checks whether the RegisteredItems table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'RegisteredItems'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("SHOW TABLE STATUS LIKE 'RegisteredItems'")
+            exists = await mycursor.fetchone()
         if exists:
             return True
         else:
@@ -107,64 +107,63 @@ class RegisteredItemsTable(commands.Cog):
 
         exclusive = 1 if exclusive else 0
 
-        mycursor, db = await the_database()
-        await mycursor.execute("""
-            INSERT INTO RegisteredItems (
-                item_name, item_type, item_price, image_name, message_ref, reaction_ref, exclusive
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """, (name, kind, price, image_name, message_id, emoji, exclusive))
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("""
+                INSERT INTO RegisteredItems (
+                    item_name, item_type, item_price, image_name, message_ref, reaction_ref, exclusive
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """, (name, kind, price, image_name, message_id, emoji, exclusive))
+            await db.commit()
+        if item_catalog.loaded:
+            item_catalog.add((image_name, kind, name, price, message_id, emoji, exclusive, 0))
 
-    async def get_registered_item(self, name: Optional[str] = None, image_name: Optional[str] = None) -> List[Union[str, int]]:
-        """ Gets a registered item.
-        :param name: The name of the item to get. [Optional]
-        :param image_name: The name of the item image to get. [Optional] """
+    async def load_registered_items(self) -> None:
+        """ Loads all registered items into the in-memory catalog. """
 
-        mycursor, _ = await the_database()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("SELECT * FROM RegisteredItems")
+            registered_items = await mycursor.fetchall()
 
-        if name and image_name:
-            await mycursor.execute("SELECT * FROM RegisteredItems WHERE LOWER(item_name) = LOWER(%s) OR LOWER(image_name) = LOWER(%s)", (name, image_name))
-        elif name:
-            await mycursor.execute("SELECT * FROM RegisteredItems WHERE LOWER(item_name) = LOWER(%s)", (name,))
-        elif image_name:
-            await mycursor.execute("SELECT * FROM RegisteredItems WHERE LOWER(image_name) = LOWER(%s)", (image_name,))
+        item_catalog.load(registered_items)
 
-        registered_item = await mycursor.fetchone()
-        await mycursor.close()
-        return registered_item
+    async def get_item_catalog(self) -> RegisteredItemsCatalog:
+        """ Gets the in-memory catalog of registered items, loading it if needed. """
 
-    async def get_registered_items(self) -> List[List[Union[str, int]]]:
-        """ Gets all registered items. """
+        if not item_catalog.loaded:
+            await self.load_registered_items()
 
-        mycursor, _ = await the_database()
+        return item_catalog
 
-        await mycursor.execute("SELECT * FROM RegisteredItems")
-        registered_items = await mycursor.fetchall()
-        await mycursor.close()
+    async def get_registered_item(self, name: Optional[str] = None, image_name: Optional[str] = None) -> List[Union[str, int]]:
+        """ Gets a registered item.
+        :param name: The name of the item to get. [Optional]
+        :param image_name: The name of the item image to get. [Optional] """
 
-        return registered_items
+        catalog = await self.get_item_catalog()
+        return catalog.get(name, image_name)
 
-    async def get_registered_items_ordered_by_price(self) -> List[List[Union[str, int]]]:
-        """ Gets all registered items ordered by price. """
+    async def get_registered_items(self) -> List[List[Union[str, int]]]:
+        """ Gets all registered items. """
 
-        mycursor, _ = await the_database()
+        catalog = await self.get_item_catalog()
+        return catalog.get_all()
 
-        await mycursor.execute("SELECT * FROM RegisteredItems ORDER BY item_price ASC")
-        registered_items = await mycursor.fetchall()
-        await mycursor.close()
+    async def get_registered_items_ordered_by_price(self, item_type: Optional[str] = None) -> List[List[Union[str, int]]]:
+        """ Gets all registered items ordered by price.
+        :param item_type: The category of the items to get. [Optional][Default = All] """
 
-        return registered_items
+        catalog = await self.get_item_catalog()
+        return catalog.get_ordered_by_price(item_type)
 
     async def update_item_price(self, item_name: str, new_price: int) -> None:
         """ Changes the item's exclusive state.
         :param item_name: The name of the item to update.
         :param price: The new price to update the item to. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("UPDATE RegisteredItems SET item_price = %s WHERE LOWER(item_name) = LOWER(%s)", (new_price, item_name))
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("UPDATE RegisteredItems SET item_price = %s WHERE LOWER(item_name) = LOWER(%s)", (new_price, item_name))
+            await db.commit()
+        item_catalog.update(item_name, ITEM_PRICE, new_price)
 
     async def update_item_exclusive(self, item_name: str, maybe: Optional[bool] = True) -> None:
         """ Changes the item's exclusive state.
@@ -173,10 +172,10 @@ class RegisteredItemsTable(commands.Cog):
 
         maybe = 1 if maybe else 0
 
-        mycursor, db = await the_database()
-        await mycursor.execute("UPDATE RegisteredItems SET exclusive = %s WHERE LOWER(item_name) = LOWER(%s)", (maybe, item_name))
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("UPDATE RegisteredItems SET exclusive = %s WHERE LOWER(item_name) = LOWER(%s)", (maybe, item_name))
+            await db.commit()
+        item_catalog.update(item_name, EXCLUSIVE, maybe)
 
     async def update_item_hidden(self, item_name: str, maybe: Optional[bool] = True) -> None:
         """ Changes the item's hidden state.
@@ -185,27 +184,26 @@ class RegisteredItemsTable(commands.Cog):
 
         maybe = 1 if maybe else 0
 
-        mycursor, db = await the_database()
-        await mycursor.execute("UPDATE RegisteredItems SET hidden = %s WHERE LOWER(item_name) = LOWER(%s)", (maybe, item_name))
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("UPDATE RegisteredItems SET hidden = %s WHERE LOWER(item_name) = LOWER(%s)", (maybe, item_name))
+            await db.commit()
+        item_catalog.update(item_name, HIDDEN, maybe)
 
     async def delete_registered_item(self, name: Optional[str] = None, image_name: Optional[str] = None) -> None:
         """ Deletes a registered item.
         :param name: The name of the item to delete. [Optional]
         :param image_name: The name of the item image to delete. [Optional] """
 
-        mycursor, db = await the_database()
+        async with the_database() as (mycursor, db):
+            if name and image_name:
+                await mycursor.execute("DELETE FROM RegisteredItems WHERE LOWER(item_name) = LOWER(%s) AND LOWER(image_name) = LOWER(%s)", (name, image_name))
+            elif name:
+                await mycursor.execute("DELETE FROM RegisteredItems WHERE LOWER(item_name) = LOWER(%s)", (name,))
+            elif image_name:
+                await mycursor.execute("DELETE FROM RegisteredItems WHERE LOWER(image_name) = LOWER(%s)", (image_name,))
 
-        if name and image_name:
-            await mycursor.execute("DELETE FROM RegisteredItems WHERE LOWER(item_name) = LOWER(%s) AND LOWER(image_name) = LOWER(%s)", (name, image_name))
-        elif name:
-            await mycursor.execute("DELETE FROM RegisteredItems WHERE LOWER(item_name) = LOWER(%s)", (name,))
-        elif image_name:
-            await mycursor.execute("DELETE FROM RegisteredItems WHERE LOWER(image_name) = LOWER(%s)", (image_name,))
-
-        await db.commit()
-        await mycursor.close()
+            await db.commit()
+        item_catalog.remove(name, image_name)
 
 class RegisteredItemsSystem(commands.Cog):
     """ Class for the RegisteredItems system. """
@@ -276,11 +274,8 @@ class RegisteredItemsSystem(commands.Cog):
         """ Shows all registered items. """
 
         await ctx.defer()
-        registered_items = await self.get_registered_items_ordered_by_price()
-
-        self.pages = registered_items
         view = discord.ui.View()
-        select = ChangeItemCategoryMenuSelect(registered_items)
+        select = ChangeItemCategoryMenuSelect(await self.get_item_catalog())
         formatted_items = await select.sort_registered_items(item_category)
         # view.add_item(select)
 
@@ -300,11 +295,8 @@ class RegisteredItemsSystem(commands.Cog):
                     f"**Please, inform a valid item category, {member.mention}!**\n`{', '.join(self.item_categories)}`")
 
 
-        registered_items = await self.get_registered_items_ordered_by_price()
-
-        self.pages = registered_items
         view = discord.ui.View()
-        select = ChangeItemCategoryMenuSelect(registered_items)
+        select = ChangeItemCategoryMenuSelect(await self.get_item_catalog())
         formatted_items = await select.sort_registered_items(item_category)
         # view.add_item(select)
 
@@ -322,11 +314,8 @@ class RegisteredItemsSystem(commands.Cog):
         """ Shows all hidden registered items. """
 
         await ctx.defer(ephemeral=True)
-        registered_items = await self.get_registered_items_ordered_by_price()
-
-        self.pages = registered_items
         view = discord.ui.View()
-        select = ChangeItemCategoryMenuSelect(registered_items)
+        select = ChangeItemCategoryMenuSelect(await self.get_item_catalog())
         formatted_items = await select.sort_registered_items(item_category, hidden=True)
         # view.add_item(select)
 
@@ -343,11 +332,8 @@ class RegisteredItemsSystem(commands.Cog):
         """ Shows all exclusive registered items. """
 
         await ctx.defer()
-        registered_items = await self.get_registered_items_ordered_by_price()
-
-        self.pages = registered_items
         view = discord.ui.View()
-        select = ChangeItemCategoryMenuSelect(registered_items)
+        select = ChangeItemCategoryMenuSelect(await self.get_item_catalog())
         formatted_items = await select.sort_registered_items(item_category, exclusive=True)
         # view.add_item(select)
 
@@ -369,11 +355,8 @@ class RegisteredItemsSystem(commands.Cog):
                     f"**Please, inform a valid item category, {member.mention}!**\n`{', '.join(self.item_categories)}`")
 
 
-        registered_items = await self.get_registered_items_ordered_by_price()
-
-        self.pages = registered_items
         view = discord.ui.View()
-        select = ChangeItemCategoryMenuSelect(registered_items)
+        select = ChangeItemCategoryMenuSelect(await self.get_item_catalog())
         formatted_items = await select.sort_registered_items(item_category, exclusive=True)
         # view.add_item(select)
 
@@ -415,20 +398,19 @@ class UserItemsTable(commands.Cog):
         if await self.check_table_user_items_exists():
             return await ctx.send(f"**Table `UserItems` already exists, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("""
-            CREATE TABLE UserItems (
-                user_id BIGINT NOT NULL,
-                item_name VARCHAR(30) NOT NULL,
-                enable TINYINT(1) DEFAULT 0, 
-                item_type VARCHAR(15) NOT NULL,
-                image_name VARCHAR(50) NOT NULL,
-                PRIMARY KEY(user_id, item_name),
-                CONSTRAINT fk_ui_image_name FOREIGN KEY (image_name) REFERENCES RegisteredItems (image_name) ON DELETE CASCADE ON UPDATE CASCADE
-            ) CHARSET utf8mb4 COLLATE utf8mb4_unicode_ci
-        """)
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("""
+                CREATE TABLE UserItems (
+                    user_id BIGINT NOT NULL,
+                    item_name VARCHAR(30) NOT NULL,
+                    enable TINYINT(1) DEFAULT 0, 
+                    item_type VARCHAR(15) NOT NULL,
+                    image_name VARCHAR(50) NOT NULL,
+                    PRIMARY KEY(user_id, item_name),
+                    CONSTRAINT fk_ui_image_name FOREIGN KEY (image_name) REFERENCES RegisteredItems (image_name) ON DELETE CASCADE ON UPDATE CASCADE
+                ) CHARSET utf8mb4 COLLATE utf8mb4_unicode_ci
+            """)
+            await db.commit()
         await ctx.send(f"**Successfully created the `UserItems` table, {member.mention}!**")
 
     @commands.command(hidden=True)
@@ -440,10 +422,9 @@ class UserItemsTable(commands.Cog):
         if not await self.check_table_user_items_exists():
             return await ctx.send(f"**Table `UserItems` doesn't exist, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DROP TABLE UserItems")
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DROP TABLE UserItems")
+            await db.commit()
         await ctx.send(f"**Successfully dropped the `UserItems` table, {member.mention}!**")
 
     @commands.command(hidden=True)
@@ -455,20 +436,18 @@ class UserItemsTable(commands.Cog):
         if not await self.check_table_user_items_exists():
             return await ctx.send(f"**Table `UserItems` doesn't exist yet, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DELETE FROM UserItems")
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DELETE FROM UserItems")
+            await db.commit()
         await ctx.send(f"**Successfully reset the `UserItems` table, {member.mention}!**")
 
 
     async def check_table_user_items_exists(self) -> bool:
         """ Checks whether the UserItems table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'UserItems'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("SHOW TABLE STATUS LIKE 'UserItems'")
+            exists = await mycursor.fetchone()
         if exists:
             return True
         else:
@@ -481,34 +460,31 @@ class UserItemsTable(commands.Cog):
         :param item_type: The item type.
         :param image_name: The item image name. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("""
-            INSERT INTO UserItems (
-                user_id, item_name, item_type, image_name
-            ) VALUES (%s, %s, %s, %s)
-        """, (user_id, item_name, item_type, image_name))
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("""
+                INSERT INTO UserItems (
+                    user_id, item_name, item_type, image_name
+                ) VALUES (%s, %s, %s, %s)
+            """, (user_id, item_name, item_type, image_name))
+            await db.commit()
 
     async def get_user_item(self, user_id: int, item_name: str) -> List[Union[int, str]]:
         """ Gets an item from the user inventory.
         :param user_id: The ID of the user owner of the item.
         :param item_name: The name of the item to get. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SELECT * FROM UserItems WHERE user_id = %s AND LOWER(item_name) = LOWER(%s)", (user_id, item_name))
-        user_item = await mycursor.fetchone()
-        await mycursor.close()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("SELECT * FROM UserItems WHERE user_id = %s AND LOWER(item_name) = LOWER(%s)", (user_id, item_name))
+            user_item = await mycursor.fetchone()
         return user_item
 
     async def get_user_items(self, user_id: int) -> List[List[Union[int, str]]]:
         """ Gets an item from the user inventory.
         :param user_id: The ID of the user owner of the item. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SELECT * FROM UserItems WHERE user_id = %s", (user_id,))
-        user_items = await mycursor.fetchall()
-        await mycursor.close()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("SELECT * FROM UserItems WHERE user_id = %s", (user_id,))
+            user_items = await mycursor.fetchall()
         return user_items
 
     async def update_item_equipped(self, user_id: int, item_name: str, enable: Optional[bool] = False) -> None:
@@ -519,20 +495,41 @@ class UserItemsTable(commands.Cog):
 
         enable = 1 if enable else 0
 
-        mycursor, db = await the_database()
-        await mycursor.execute("UPDATE UserItems SET enable = %s WHERE user_id = %s AND LOWER(item_name) = LOWER(%s)", (enable, user_id, item_name))
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("UPDATE UserItems SET enable = %s WHERE user_id = %s AND LOWER(item_name) = LOWER(%s)", (enable, user_id, item_name))
+            await db.commit()
+
+    async def get_user_loadout(self, user_id: int) -> Tuple[Dict[str, str], Set[str]]:
+        """ Gets the user's equipped items and hidden item categories in a single query.
+        :param user_id: The ID of the user.
+        :returns: The image name of the equipped item of each category, and the hidden categories. """
+
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("""
+                SELECT item_type, image_name FROM UserItems WHERE user_id = %s AND enable
+                UNION ALL
+                SELECT CONVERT(item_type USING utf8mb4) COLLATE utf8mb4_unicode_ci, NULL FROM HiddenItemCategory WHERE user_id = %s
+            """, (user_id, user_id))
+            rows = await mycursor.fetchall()
+
+        equipped: Dict[str, str] = {}
+        hidden: Set[str] = set()
+        for item_type, image_name in rows:
+            if image_name is None:
+                hidden.add(item_type)
+            elif image_name:
+                equipped.setdefault(item_type, image_name)
+
+        return equipped, hidden
 
     async def delete_user_item(self, user_id: int, item_name: str) -> None:
         """ Deletes an item from the user's inventory.
         :param user_id: The ID of the user from whom to remove the item.
         :param item_name: The name of the item to remove. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DELETE FROM UserItems WHERE user_id = %s AND LOWER(item_name) = LOWER(%s)", (user_id, item_name))
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DELETE FROM UserItems WHERE user_id = %s AND LOWER(item_name) = LOWER(%s)", (user_id, item_name))
+            await db.commit()
 
 class UserItemsSystem(commands.Cog):
     """ Class for UserItems system. """
@@ -544,6 +541,13 @@ class UserItemsSystem(commands.Cog):
         'outfits', 'pets'
     ]
 
+    # The order in which the item layers are pasted onto the background
+    layer_order: List[str] = [
+        'accessories_1', 'bb_base', 'eyes', 'facial_hair', 'effects',
+        'mouths', 'face_furniture', 'hats', 'accessories_2', 'outfits',
+        'right_hands', 'left_hands', 'dual_hands', 'pets'
+    ]
+
     def __init__(self, client: commands.Bot) -> None:
         """ Class init method. """
 
@@ -584,146 +588,55 @@ class UserItemsSystem(commands.Cog):
 
         # Open images
         async with ctx.typing():
-            rgb2xyz = (
-                0.412453, 0.357580, 0.180423, 0,
-                0.212671, 0.715160, 0.072169, 0,
-                0.019334, 0.119193, 0.950227, 0
-            )
-            background = Image.open(await self.get_user_specific_item_type(member.id, 'backgrounds'))#.convert('RGB', rgb2xyz)
-            bb_base = Image.open(await self.get_user_specific_item_type(member.id, 'bb_base'))
-            eyes = Image.open(await self.get_user_specific_item_type(member.id, 'eyes'))
-            effects = Image.open(await self.get_user_specific_item_type(member.id, 'effects'))
-            mouths = Image.open(await self.get_user_specific_item_type(member.id, 'mouths'))
-            facial_hair = Image.open(await self.get_user_specific_item_type(member.id, 'facial_hair'))
-            face_furniture = Image.open(await self.get_user_specific_item_type(member.id, 'face_furniture'))
-            hats = Image.open(await self.get_user_specific_item_type(member.id, 'hats'))
-            left_hands = Image.open(await self.get_user_specific_item_type(member.id, 'left_hands'))
-            right_hands = Image.open(await self.get_user_specific_item_type(member.id, 'right_hands'))
-            accessories_1 = Image.open(await self.get_user_specific_item_type(member.id, 'accessories_1'))
-            accessories_2 = Image.open(await self.get_user_specific_item_type(member.id, 'accessories_2'))
-            outfits = Image.open(await self.get_user_specific_item_type(member.id, 'outfits'))
-            dual_hands = Image.open(await self.get_user_specific_item_type(member.id, 'dual_hands'))
-            pets = Image.open(await self.get_user_specific_item_type(member.id, 'pets'))
-            
-            # Gets the user's hidden item categories.
-            all_hidden_icats = await self.get_hidden_item_categories(member.id)
-            hidden_icats = list(map(lambda ic: ic[1], all_hidden_icats))
-
-            # Pastes all item images
-            items: Dict[str, Image.Image] = {
-                'accessories_1': accessories_1,
-                'bb_base': bb_base,
-                'eyes': eyes,
-                'facial_hair': facial_hair,
-                'effects': effects,
-                'mouths': mouths,
-                'face_furniture': face_furniture,
-                'hats': hats,
-                'accessories_2': accessories_2,
-                'outfits': outfits,
-                'right_hands': right_hands,
-                'left_hands': left_hands,
-                'dual_hands': dual_hands,
-                'pets': pets
-            }
+            # Gets the user's equipped items and hidden item categories at once
+            equipped, hidden_icats = await self.get_user_loadout(member.id)
+
             # pfp = await utils.get_user_pfp(member)
             # background.paste(pfp, (0, 0), pfp)
 
-            # Gets all gif items
-            gif_files = {
-                item_name: {'frames': ImageSequence.Iterator(item_image), 'gif': item_image}
-                for item_name, item_image in items.items()
-                if item_image.is_animated and item_name not in hidden_icats
-            }
-
-            # Makes another dictionary with the items, marking if the items are animated or not
-            items = {
-                item_name: {'image': item_image.convert('RGBA'), 'animated': item_image.is_animated}
-                for item_name, item_image in items.items()
-                if item_name not in hidden_icats
-            }
-
-            if gif_files:
-                gif_file_path = await self.paste_animated_items(
-                    background, member.id, items, gif_files)
-                await answer(file=discord.File(gif_file_path))
-
-                try:
-                    os.remove(gif_file_path)
-                except:
-                    pass
+            # Renders the character in a worker process, off the event loop
+            job = self.make_render_job(equipped, hidden_icats)
+
+            # Repeat views of an unchanged loadout are sent straight from the render cache
+            render_key = await asyncio.get_running_loop().run_in_executor(None, make_render_key, job)
+            if cached_path := await render_cache.get(render_key):
+                extension = os.path.splitext(cached_path)[1][1:]
+                return await answer(file=discord.File(cached_path, filename=self.get_character_file_name(member.id, extension)))
+
+            result = await character_renderer.render(job)
+            await render_cache.put(render_key, result.data, result.extension)
+
+            # Sent from memory, so concurrent renders never share a file
+            await answer(file=discord.File(BytesIO(result.data), filename=self.get_character_file_name(member.id, result.extension)))
+
+    def make_render_job(self, equipped: Dict[str, str], hidden: Set[str]) -> RenderJob:
+        """ Makes the render job of a loadout.
+        :param equipped: The image name of the equipped item of each category.
+        :param hidden: The hidden item categories. """
+
+        return RenderJob(
+            background=self.get_item_image_path('backgrounds', equipped.get('backgrounds')),
+            layers=tuple(
+                (item_type, self.get_item_image_path(item_type, equipped.get(item_type)))
+                for item_type in self.layer_order
+            ),
+            hidden=frozenset(hidden)
+        )
 
-            else:
-                await self.paste_items(background, items)
-                # Saves the image
-                file_path = f'media/temporary/character_{member.id}.png'
-                background.save(file_path, 'png', quality=90)
-                await answer(file=discord.File(file_path))
-            
-                try:
-                    os.remove(file_path)
-                except:
-                    pass
-
-    async def paste_items(self, base: Image.Image, items: List[Image.Image]) -> None:
-        """ Pastes images onto a base image..
-        :param base: The base image to paste other images onto.
-        :param items: The items to paste onto the base image. """
-
-        for item_image in items.values():
-            base.paste(item_image['image'], (0, 0), item_image['image'])
-
-    async def paste_animated_items(self, 
-        main_base: Image.Image, user_id: int, items: List[Image.Image], gif_files
-    ) -> str:
-        """ Pastes images and gifs accordingly.
-        :param main_base: The base image to paste other images onto.
-        :param user_id: The ID of the user.
-        :param items: The items to paste onto the base image.
-        :param gif_files: The gif files to use. """
-
-        gif_file_path: str = f'media/temporary/profile_{user_id}.gif'
-        try:
-            gif = GIF(image=main_base, frame_duration=5)
-
-            # Loops through the frames based on the amount of frames of the longest effect.
-            longest_gif = max([gif_file['gif'].n_frames for gif_file in gif_files.values()])
-            longest_gif = 1 if not longest_gif else longest_gif
-
-            for i in range(longest_gif):
-                base = gif.new_frame()
-                await asyncio.sleep(0)
-                for item_name, item_image in items.items():
-
-                    if not item_image['animated']:
-                        base.paste(item_image['image'], (0, 0), item_image['image'])
-                    else:
-                        frame = next(gif_files[item_name]['frames']).convert('RGBA')
-                        base.paste(frame, (0, 0), frame)
-                    
-                    gif.add_frame(base)
-
-                if i >= 400:
-                    break
-
-            gif.export(gif_file_path)
-
-        except Exception as e:
-            print(e)
-        finally:
-            return gif_file_path
-
-    async def get_user_specific_item_type(self, user_id: int, item_type: str) -> str:
-        """ Gets a random item of a specific type from the user.
-        :param user_id: The ID of the user from whom to get the item.
-        :param item_type: The type of the item to get. """
-
-        mycursor, _ = await the_database()
-        await mycursor.execute("SELECT item_name, image_name FROM UserItems WHERE user_id = %s and item_type = %s and enable", (user_id, item_type))
-        spec_type_items = await mycursor.fetchone()
-        await mycursor.close()
-        if spec_type_items and spec_type_items[1]:
-            return f'./resources/{item_type}/{spec_type_items[1]}'
+    def get_character_file_name(self, user_id: int, extension: str) -> str:
+        """ Gets the name under which a character image is sent.
+        :param user_id: The ID of the user whose character it is.
+        :param extension: The file extension of the image. """
+
+        return f"{'character' if extension == 'png' else 'profile'}_{user_id}.{extension}"
+
+    def get_item_image_path(self, item_type: str, image_name: Optional[str] = None) -> str:
+        """ Gets the path of an item image, falling back to the category's default image.
+        :param item_type: The type of the item.
+        :param image_name: The image name of the item, if any is equipped. [Optional] """
+
+        if image_name:
+            return f'./resources/{item_type}/{image_name}'
 
         else:
             return f'./resources/{item_type}/default.png'
@@ -803,15 +716,14 @@ class UserItemsSystem(commands.Cog):
         :param item_name: The name of the item.
         :param enable: Whether to check if you can equip or unequip. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SELECT item_type FROM UserItems WHERE user_id = %s AND item_name = %s", (user_id, item_name))
-        item_type = await mycursor.fetchone()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("SELECT item_type FROM UserItems WHERE user_id = %s AND item_name = %s", (user_id, item_name))
+            item_type = await mycursor.fetchone()
 
-        enable = 1 if enable else 0
-        await mycursor.execute(
-            "SELECT * FROM UserItems WHERE user_id = %s AND LOWER(item_type) = LOWER(%s) AND enable = %s", (user_id, item_type, enable))
-        equipped_item = await mycursor.fetchone()
-        await mycursor.close()
+            enable = 1 if enable else 0
+            await mycursor.execute(
+                "SELECT * FROM UserItems WHERE user_id = %s AND LOWER(item_type) = LOWER(%s) AND enable = %s", (user_id, item_type, enable))
+            equipped_item = await mycursor.fetchone()
 
         if equipped_item and item_type:
             return True
@@ -838,9 +750,10 @@ class UserItemsSystem(commands.Cog):
         if not (regitem := await self.get_registered_item(name=item_name)):
             return await ctx.send(f"**This item doesn't exist, {member.mention}!**")
 
+        await self.sync_game_stats(member.id)
         if not (user_profile := await self.get_macaron_profile(member.id)):
             await ctx.send(f"**You don't have any money to buy this item, {member.mention}!**")
-            return await self.insert_macaron_profile(member.id)
+            return await self.upsert_macaron_profile(member.id)
 
         if regitem[6]:
             if user_profile[4] < regitem[3]:
@@ -870,6 +783,39 @@ class UserItemsSystem(commands.Cog):
         await self.insert_user_item(member.id, regitem[2], regitem[1], regitem[0])
         return await ctx.send(f"**You just bought `{regitem[2].title()}`, {member.name}!**")
 
+    @commands.command(aliases=["preview", "try_item"])
+    @commands.cooldown(1, 5, commands.BucketType.user)
+    async def preview_item(self, ctx, *, item_name: str = None) -> None:
+        """ Shows your character with an item from the shop, before buying it.
+        :param item_name: The name of the item. """
+
+        member: discord.Member = ctx.author
+
+        if not item_name:
+            return await ctx.send("**Inform an item to preview!**")
+
+        item_name = escape_mentions(item_name)
+
+        if not (regitem := await self.get_registered_item(name=item_name)):
+            return await ctx.send(f"**This item doesn't exist, {member.mention}!**")
+
+        if regitem[HIDDEN]:
+            return await ctx.send(f"**You cannot preview a hidden item, {member.mention}!**")
+
+        item_type = regitem[ITEM_TYPE]
+        if item_type != 'backgrounds' and item_type not in self.layer_order:
+            return await ctx.send(f"**Items of the `{item_type}` category can't be previewed, {member.mention}!**")
+
+        async with ctx.typing():
+            # The current loadout, with the item in place of the one of its category
+            equipped, hidden_icats = await self.get_user_loadout(member.id)
+            equipped[item_type] = regitem[IMAGE_NAME]
+            result = await character_renderer.preview(self.make_render_job(equipped, hidden_icats), item_type)
+
+            await ctx.send(
+                f"**Preview of `{regitem[ITEM_NAME].title()}` on {member.mention}!**",
+                file=discord.File(BytesIO(result.data), filename=f"preview_{member.id}.{result.extension}"))
+
     @commands.command(aliases=["make_hidden"])
     @commands.has_permissions(administrator=True)
     async def make_item_hidden(self, ctx, *, item_name: str = None) -> None:
@@ -1311,16 +1257,15 @@ class HiddenItemCategoryTable(commands.Cog):
         if await self.check_table_hidden_item_category_exists():
             return await ctx.send(f"**Table `HiddenItemCategory` already exists, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("""
-            CREATE TABLE HiddenItemCategory (
-                user_id BIGINT NOT NULL,
-                item_type VARCHAR(15) NOT NULL,
-                PRIMARY KEY(user_id, item_type)
-            )
-        """)
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("""
+                CREATE TABLE HiddenItemCategory (
+                    user_id BIGINT NOT NULL,
+                    item_type VARCHAR(15) NOT NULL,
+                    PRIMARY KEY(user_id, item_type)
+                )
+            """)
+            await db.commit()
         await ctx.send(f"**Successfully created the `HiddenItemCategory` table, {member.mention}!**")
 
     @commands.command(hidden=True)
@@ -1332,10 +1277,9 @@ class HiddenItemCategoryTable(commands.Cog):
         if not await self.check_table_hidden_item_category_exists():
             return await ctx.send(f"**Table `HiddenItemCategory` doesn't exist, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DROP TABLE HiddenItemCategory")
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DROP TABLE HiddenItemCategory")
+            await db.commit()
         await ctx.send(f"**Successfully dropped the `HiddenItemCategory` table, {member.mention}!**")
 
     @commands.command(hidden=True)
@@ -1347,20 +1291,18 @@ class HiddenItemCategoryTable(commands.Cog):
         if not await self.check_table_hidden_item_category_exists():
             return await ctx.send(f"**Table `HiddenItemCategory` doesn't exist yet, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DELETE FROM HiddenItemCategory")
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DELETE FROM HiddenItemCategory")
+            await db.commit()
         await ctx.send(f"**Successfully reset the `HiddenItemCategory` table, {member.mention}!**")
 
 
     async def check_table_hidden_item_category_exists(self) -> bool:
         """ Checks whether the HiddenItemCategory table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'HiddenItemCategory'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("SHOW TABLE STATUS LIKE 'HiddenItemCategory'")
+            exists = await mycursor.fetchone()
         if exists:
             return True
         else:
@@ -1371,30 +1313,27 @@ class HiddenItemCategoryTable(commands.Cog):
         :param user_id: The ID of the user.
         :param item_category: The item category to hide. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("INSERT INTO HiddenItemCategory (user_id, item_type) VALUES (%s, %s)", (user_id, item_category.lower()))
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("INSERT INTO HiddenItemCategory (user_id, item_type) VALUES (%s, %s)", (user_id, item_category.lower()))
+            await db.commit()
 
     async def get_hidden_item_category(self, user_id: int, item_category: str) -> List[Union[int, str]]:
         """ Gets a specific Hidden Item Category.
         :param user_id: The ID of the user from whom to get it.
         :param item_category: The item category to get. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SELECT * FROM HiddenItemCategory WHERE user_id = %s AND item_type = %s", (user_id, item_category.lower()))
-        hidden_item_category = await mycursor.fetchone()
-        await mycursor.close()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("SELECT * FROM HiddenItemCategory WHERE user_id = %s AND item_type = %s", (user_id, item_category.lower()))
+            hidden_item_category = await mycursor.fetchone()
         return hidden_item_category
 
     async def get_hidden_item_categories(self, user_id: int) -> List[List[Union[int, str]]]:
         """ Gets all Hidden Item Categories from the user.
         :param user_id: The ID of the user from whom to get them. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SELECT * FROM HiddenItemCategory WHERE user_id = %s", (user_id,))
-        hidden_item_categories = await mycursor.fetchall()
-        await mycursor.close()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("SELECT * FROM HiddenItemCategory WHERE user_id = %s", (user_id,))
+            hidden_item_categories = await mycursor.fetchall()
         return hidden_item_categories
 
     async def delete_hidden_item_category(self, user_id: int, item_category: str) -> None:
@@ -1402,10 +1341,9 @@ class HiddenItemCategoryTable(commands.Cog):
         :param user_id: The ID of the user from whom to delete it.
         :param item_category: The category to delete. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DELETE FROM HiddenItemCategory WHERE user_id = %s AND item_type = %s", (user_id, item_category))
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DELETE FROM HiddenItemCategory WHERE user_id = %s AND item_type = %s", (user_id, item_category))
+            await db.commit()
 
 class ExclusiveItemRoleTable(commands.Cog):
     """ Class for managing the ExclusiveItemRole table in the database. """
@@ -1424,18 +1362,17 @@ class ExclusiveItemRoleTable(commands.Cog):
         if await self.check_table_exclusive_item_role_exists():
             return await ctx.send(f"**Table `ExclusiveItemRole` already exists, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("""
-            CREATE TABLE ExclusiveItemRole (
-                role_id BIGINT NOT NULL,
-                item_name VARCHAR(30) NOT NULL,
-                image_name VARCHAR(50) NOT NULL,
-                PRIMARY KEY(role_id, item_name),
-                CONSTRAINT fk_eit_image_name FOREIGN KEY (image_name) REFERENCES RegisteredItems (image_name) ON DELETE CASCADE ON UPDATE CASCADE
-            ) CHARSET utf8mb4 COLLATE utf8mb4_unicode_ci
-        """)
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("""
+                CREATE TABLE ExclusiveItemRole (
+                    role_id BIGINT NOT NULL,
+                    item_name VARCHAR(30) NOT NULL,
+                    image_name VARCHAR(50) NOT NULL,
+                    PRIMARY KEY(role_id, item_name),
+                    CONSTRAINT fk_eit_image_name FOREIGN KEY (image_name) REFERENCES RegisteredItems (image_name) ON DELETE CASCADE ON UPDATE CASCADE
+                ) CHARSET utf8mb4 COLLATE utf8mb4_unicode_ci
+            """)
+            await db.commit()
         await ctx.send(f"**Successfully created the `ExclusiveItemRole` table, {member.mention}!**")
 
     @commands.command(hidden=True)
@@ -1447,10 +1384,9 @@ class ExclusiveItemRoleTable(commands.Cog):
         if not await self.check_table_exclusive_item_role_exists():
             return await ctx.send(f"**Table `ExclusiveItemRole` doesn't exist, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DROP TABLE ExclusiveItemRole")
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DROP TABLE ExclusiveItemRole")
+            await db.commit()
         await ctx.send(f"**Successfully dropped the `ExclusiveItemRole` table, {member.mention}!**")
 
     @commands.command(hidden=True)
@@ -1462,20 +1398,18 @@ class ExclusiveItemRoleTable(commands.Cog):
         if not await self.check_table_exclusive_item_role_exists():
             return await ctx.send(f"**Table `ExclusiveItemRole` doesn't exist yet, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DELETE FROM ExclusiveItemRole")
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DELETE FROM ExclusiveItemRole")
+            await db.commit()
         await ctx.send(f"**Successfully reset the `ExclusiveItemRole` table, {member.mention}!**")
 
 
     async def check_table_exclusive_item_role_exists(self) -> bool:
         """ Checks whether the ExclusiveItemRole table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'ExclusiveItemRole'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("SHOW TABLE STATUS LIKE 'ExclusiveItemRole'")
+            exists = await mycursor.fetchone()
         if exists:
             return True
         else:
@@ -1487,34 +1421,31 @@ class ExclusiveItemRoleTable(commands.Cog):
         :param item_name: The name of the item this role has access to.
         :param image_name: The image name of that item."""
 
-        mycursor, db = await the_database()
-        await mycursor.execute("""
-            INSERT INTO ExclusiveItemRole (
-                role_id, item_name, image_name
-            ) VALUES (%s, %s, %s)
-        """, (role_id, item_name, image_name))
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("""
+                INSERT INTO ExclusiveItemRole (
+                    role_id, item_name, image_name
+                ) VALUES (%s, %s, %s)
+            """, (role_id, item_name, image_name))
+            await db.commit()
 
     async def get_exclusive_item_role(self, item_name: str, role_id: int) -> List[Union[int, str]]:
         """ Gets an exclusive item role from an item.
         :param item_name: The name of the item from which to get the role.
         :param role_id: The ID of the role to get. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SELECT * FROM ExclusiveItemRole WHERE LOWER(item_name) = LOWER(%s) AND role_id = %s", (item_name, role_id))
-        role = await mycursor.fetchone()
-        await mycursor.close()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("SELECT * FROM ExclusiveItemRole WHERE LOWER(item_name) = LOWER(%s) AND role_id = %s", (item_name, role_id))
+            role = await mycursor.fetchone()
         return role
 
     async def get_exclusive_item_roles(self, item_name: str) -> List[List[Union[int, str]]]:
         """ Gets all exclusive item roles from an item.
         :param item_name: The name of the item from which to get the roles. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SELECT * FROM ExclusiveItemRole WHERE LOWER(item_name) = LOWER(%s)", (item_name,))
-        roles = await mycursor.fetchall()
-        await mycursor.close()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("SELECT * FROM ExclusiveItemRole WHERE LOWER(item_name) = LOWER(%s)", (item_name,))
+            roles = await mycursor.fetchall()
         return roles
 
     async def delete_exclusive_item_role(self, item_name: str, role_id: int) -> None:
@@ -1522,16 +1453,14 @@ class ExclusiveItemRoleTable(commands.Cog):
         :param item_name: The item name from which to remove the role.
         :param role_id: The ID of the role to remove. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DELETE FROM ExclusiveItemRole WHERE LOWER(item_name) = LOWER(%s) AND role_id = %s", (item_name, role_id))
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DELETE FROM ExclusiveItemRole WHERE LOWER(item_name) = LOWER(%s) AND role_id = %s", (item_name, role_id))
+            await db.commit()
 
     async def delete_exclusive_item_roles(self, item_name: str) -> None:
         """ Deletes all exclusive item roles from an item.
         :param item_name: The item name from which to remove the roles."""
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DELETE FROM ExclusiveItemRole WHERE LOWER(item_name) = LOWER(%s)", (item_name,))
-        await db.commit()
-        await mycursor.close()
\ No newline at end of file
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DELETE FROM ExclusiveItemRole WHERE LOWER(item_name) = LOWER(%s)", (item_name,))
+            await db.commit()
\ No newline at end of file
@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from external_cons import the_database
+from external_cons import the_database, upsert_increments
 from typing import List
 
 class UserRollDicesTable(commands.Cog):
@@ -20,16 +20,15 @@ class UserRollDicesTable(commands.Cog):
         if await self.check_table_user_roll_dices_exists():
             return await ctx.send(f"**Table `UserRollDices` already exists, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("""
-            CREATE TABLE UserRollDices (
-                user_id BIGINT NOT NULL,
-                dices TINYINT(4),
-                PRIMARY KEY(user_id)
-            )
-        """)
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("""
+                CREATE TABLE UserRollDices (
+                    user_id BIGINT NOT NULL,
+                    dices TINYINT(4),
+                    PRIMARY KEY(user_id)
+                )
+            """)
+            await db.commit()
         await ctx.send(f"**Successfully created the `UserRollDices` table, {member.mention}!**")
 
     @commands.command(hidden=True)
@@ -41,10 +40,9 @@ class UserRollDicesTable(commands.Cog):
         if not await self.check_table_user_roll_dices_exists():
             return await ctx.send(f"**Table `UserRollDices` doesn't exist, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DROP UserRollDices")
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DROP UserRollDices")
+            await db.commit()
         await ctx.send(f"**Successfully dropped the `UserRollDices` table, {member.mention}!**")
 
     @commands.command(hidden=True)
@@ -56,20 +54,18 @@ class UserRollDicesTable(commands.Cog):
         if not await self.check_table_user_roll_dices_exists():
             return await ctx.send(f"**Table `UserRollDices` doesn't exist yet, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DELETE FROM UserRollDices")
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DELETE FROM UserRollDices")
+            await db.commit()
         await ctx.send(f"**Successfully reset the `UserRollDices` table, {member.mention}!**")
 
 
     async def check_table_user_roll_dices_exists(self) -> bool:
         """ Checks whether the UserRollDices table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'UserRollDices'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("SHOW TABLE STATUS LIKE 'UserRollDices'")
+            exists = await mycursor.fetchone()
         if exists:
             return True
         else:
@@ -80,27 +76,22 @@ class UserRollDicesTable(commands.Cog):
         :param user_id: The ID of the user for whom to add it.
         :param dices: The initial amount of dices to insert. [Default = 1]"""
 
-        mycursor, db = await the_database()
-        await mycursor.execute("INSERT INTO UserRollDices (user_id, dices) VALUES (%s, %s)", (user_id, dices))
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("INSERT INTO UserRollDices (user_id, dices) VALUES (%s, %s)", (user_id, dices))
+            await db.commit()
 
     async def get_user_roll_dices(self, user_id: int) -> List[int]:
         """ Gets the UserRollDices info from a particular user.
         :param user_id: The ID of the user from whom to get the info. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SELECT * FROM UserRollDices WHERE user_id = %s", (user_id,))
-        user_roll_dices = await mycursor.fetchone()
-        await mycursor.close()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("SELECT * FROM UserRollDices WHERE user_id = %s", (user_id,))
+            user_roll_dices = await mycursor.fetchone()
         return user_roll_dices
 
     async def update_user_roll_dices(self, user_id: int, increment: int) -> None:
-        """ Updates a UserRollDices for a particular user.
+        """ Updates a UserRollDices for a particular user, creating it if it doesn't exist yet.
         :param user_id: The ID of the user to update.
         :param increment: The increment to apply to the dices counter. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("UPDATE UserRollDices SET dices = dices + %s WHERE user_id = %s", (increment, user_id))
-        await db.commit()
-        await mycursor.close()
\ No newline at end of file
+        await upsert_increments('UserRollDices', {'user_id': user_id}, increments={'dices': increment})
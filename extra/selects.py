@@ -1,9 +1,44 @@
 import discord
 from discord.ext import commands
-from typing import List, Union, Optional
+from typing import Dict, List, Tuple, Union, Optional
+
+from extra.game.item_catalog import RegisteredItemsCatalog
+
+class ShopPageCache:
+    """ Keeps the ready-made shop embed pages, per (category, exclusive, hidden),
+    for as long as the registered items catalog doesn't change. """
+
+    def __init__(self) -> None:
+        """ Class init method. """
+
+        self.version: Optional[int] = None
+        self._pages: Dict[Tuple[str, bool, bool], List[discord.Embed]] = {}
+
+    def get(self, version: int, key: Tuple[str, bool, bool]) -> Optional[List[discord.Embed]]:
+        """ Gets the pages for a shop view, if they were made for this catalog version.
+        :param version: The current version of the catalog.
+        :param key: The category, exclusive and hidden options of the view. """
+
+        if version != self.version:
+            self._pages.clear()
+            self.version = version
+
+        return self._pages.get(key)
+
+    def set(self, version: int, key: Tuple[str, bool, bool], embeds: List[discord.Embed]) -> None:
+        """ Keeps the pages for a shop view.
+        :param version: The version of the catalog the pages were made from.
+        :param key: The category, exclusive and hidden options of the view.
+        :param embeds: The pages. """
+
+        if version == self.version:
+            self._pages[key] = embeds
+
+
+shop_pages = ShopPageCache()
 
 class ChangeItemCategoryMenuSelect(discord.ui.Select):
-    def __init__(self, registered_items: List[List[Union[str, int]]]):
+    def __init__(self, catalog: RegisteredItemsCatalog):
         super().__init__(
             custom_id="item_category_menu_id", placeholder="Change the Item Category.", 
             min_values=1, max_values=1, 
@@ -12,7 +47,7 @@ class ChangeItemCategoryMenuSelect(discord.ui.Select):
                 discord.SelectOption(label="backgrounds", description="Shows the backgrounds items.", emoji="🎁"),
             ])
 
-        self.registered_items = registered_items
+        self.catalog = catalog
         self.item_category: str = 'All'
         self.crumbs_emoji: str = '<:crumbs:940086555224211486>'
         self.croutons_emoji: str = '<:croutons:945013460041891891>'
@@ -29,29 +64,36 @@ class ChangeItemCategoryMenuSelect(discord.ui.Select):
         await interaction.edit_original_message(view=self.view)
 
 
-    async def sort_registered_items(self, option = 'All', exclusive: Optional[bool] = False, hidden: Optional[bool] = False) -> List[str]:
+    async def sort_registered_items(self, option = 'All', exclusive: Optional[bool] = False, hidden: Optional[bool] = False) -> List[discord.Embed]:
         """ Sorts the registered items.
         :param exclusive: Whether to show exclusive items. [Optional][Default = False] 
         :param hidden: Whether to show hidden items. [Optional][Default = False] """
 
+        key = (option, bool(exclusive), bool(hidden))
+        version = self.catalog.version
+        if (embedded_items := shop_pages.get(version, key)) is None:
+            embedded_items = self.make_pages(*key)
+            shop_pages.set(version, key, embedded_items)
+
+        # The embeds are shared, only the list is given away
+        return list(embedded_items)
+
+    def make_pages(self, option: str, exclusive: bool, hidden: bool) -> List[discord.Embed]:
+        """ Makes the embed pages for the registered items.
+        :param option: The item category, or 'All'.
+        :param exclusive: Whether to show exclusive items.
+        :param hidden: Whether to show hidden items. """
+
         exclusive = 1 if exclusive else 0
 
-        # Filters items
-        filtered_items: List[List[Union[str, int]]] = []
-        if option != 'All':
-            filtered_items = [
-                regitem for regitem in self.registered_items 
-                if regitem[1] == option
-            ]
-        else:
-            filtered_items = self.registered_items
+        # Gets the items of the category, already ordered by price
+        filtered_items = self.catalog.get_ordered_by_price(None if option == 'All' else option)
 
         # Filter exclusive / not exclusive items
         if hidden:
-            filtered_items = list(filter(lambda item: item[7], filtered_items))
+            filtered_items = [item for item in filtered_items if item[7]]
         else:
-            filtered_items = list(filter(
-                lambda item: item[6] == exclusive and not item[7], filtered_items))
+            filtered_items = [item for item in filtered_items if item[6] == exclusive and not item[7]]
 
         emoji = self.crumbs_emoji if not exclusive else self.croutons_emoji
 
@@ -74,23 +116,9 @@ class ChangeItemCategoryMenuSelect(discord.ui.Select):
         )
 
         per_page: int = 10
-        counter: int = 0
-
-        for _ in range(len(formatted_items)):
-            indexed_items: List[str] = []
-
-            for ii in range(per_page):
-                if len(formatted_items) < counter + ii + 1:
-                    break
-                indexed_items.append(formatted_items[counter+ii])
-
-            if not indexed_items:
-                break
-
-            counter += per_page
+        for counter in range(0, len(formatted_items), per_page):
             index_embed = text_embed.copy()
-            index_embed.description = '\n'.join(indexed_items)
+            index_embed.description = '\n'.join(formatted_items[counter:counter + per_page])
             embedded_items.append(index_embed)
-            indexed_items.clear()
-        
-        return embedded_items
\ No newline at end of file
+
+        return embedded_items
@@ -186,15 +186,14 @@ class ScheduledEventsTable(commands.Cog):
         if await self.check_scheduled_events_exists():
             return await ctx.send(f"**Table `ScheduledEvents` already exists, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("""
-            CREATE TABLE ScheduledEvents (
-                event_label VARCHAR(100) NOT NULL,
-                event_ts BIGINT NOT NULL,
-                PRIMARY KEY (event_label)
-            )""")
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("""
+                CREATE TABLE ScheduledEvents (
+                    event_label VARCHAR(100) NOT NULL,
+                    event_ts BIGINT NOT NULL,
+                    PRIMARY KEY (event_label)
+                )""")
+            await db.commit()
 
         await ctx.send(f"**Table `ScheduledEvents` created, {member.mention}!**")
 
@@ -209,10 +208,9 @@ class ScheduledEventsTable(commands.Cog):
         if not await self.check_scheduled_events_exists():
             return await ctx.send(f"**Table `ScheduledEvents` doesn't exist, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DROP TABLE ScheduledEvents")
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DROP TABLE ScheduledEvents")
+            await db.commit()
 
         await ctx.send(f"**Table `ScheduledEvents` dropped, {member.mention}!**")
 
@@ -228,20 +226,18 @@ class ScheduledEventsTable(commands.Cog):
         if not await self.check_scheduled_events_exists():
             return await ctx.send(f"**Table `ScheduledEvents` doesn't exist yet, {member.mention}!**")
 
-        mycursor, db = await the_database()
-        await mycursor.execute("DELETE FROM ScheduledEvents")
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("DELETE FROM ScheduledEvents")
+            await db.commit()
 
         await ctx.send(f"**Table `ScheduledEvents` reset, {member.mention}!**")
 
     async def check_scheduled_events_exists(self) -> bool:
         """ Checks whether the ScheduledEvents table exists. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SHOW TABLE STATUS LIKE 'ScheduledEvents'")
-        exists = await mycursor.fetchone()
-        await mycursor.close()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("SHOW TABLE STATUS LIKE 'ScheduledEvents'")
+            exists = await mycursor.fetchone()
         if exists:
             return True
         else:
@@ -253,14 +249,13 @@ class ScheduledEventsTable(commands.Cog):
         :param event_label: The label of the event
         :param ad_time: Advertising time cooldown. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("""
-            SELECT * from ScheduledEvents
-            WHERE event_label = %s AND %s - event_ts >= %s
-        """, (event_label, current_ts, ad_time))
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("""
+                SELECT * from ScheduledEvents
+                WHERE event_label = %s AND %s - event_ts >= %s
+            """, (event_label, current_ts, ad_time))
 
-        due_event = await mycursor.fetchone()
-        await mycursor.close()
+            due_event = await mycursor.fetchone()
         if due_event:
             return True
         else:
@@ -270,10 +265,9 @@ class ScheduledEventsTable(commands.Cog):
         """ Gets an advertising event.
         :param event_label: The label of the advertising event. """
 
-        mycursor, _ = await the_database()
-        await mycursor.execute("SELECT * FROM ScheduledEvents WHERE event_label = %s", (event_label,))
-        event = await mycursor.fetchone()
-        await mycursor.close()
+        async with the_database() as (mycursor, _):
+            await mycursor.execute("SELECT * FROM ScheduledEvents WHERE event_label = %s", (event_label,))
+            event = await mycursor.fetchone()
         return event
 
     async def insert_advertising_event(self, event_label: str, current_ts: int) -> None:
@@ -281,17 +275,15 @@ class ScheduledEventsTable(commands.Cog):
         :param event_label: The label of the advertising event.
         :param current_ts: The timestamp in which it was inserted. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("INSERT INTO ScheduledEvents (event_label, event_ts) VALUES (%s, %s)", (event_label, current_ts))
-        await db.commit()
-        await mycursor.close()
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("INSERT INTO ScheduledEvents (event_label, event_ts) VALUES (%s, %s)", (event_label, current_ts))
+            await db.commit()
 
     async def update_advertising_time(self, event_label: str, current_ts: int) -> None:
         """ Updates the timestamp of the advertising event.
         :param event_label: The label of the advertising event.
         :param current_ts: The timestamp to update the event to. """
 
-        mycursor, db = await the_database()
-        await mycursor.execute("UPDATE ScheduledEvents SET event_ts = %s WHERE event_label = %s", (current_ts, event_label))
-        await db.commit()
-        await mycursor.close()
\ No newline at end of file
+        async with the_database() as (mycursor, db):
+            await mycursor.execute("UPDATE ScheduledEvents SET event_ts = %s WHERE event_label = %s", (current_ts, event_label))
+            await db.commit()
\ No newline at end of file
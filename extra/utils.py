@@ -10,6 +10,7 @@ from PIL import Image, ImageDraw
 from typing import List, Dict, Optional, Union
 
 from extra.customerrors import CommandNotReady
+from extra.file_manipulation.audio_manager import audio_cache
 from collections import OrderedDict
 import shlex
 
@@ -264,7 +265,7 @@ async def audio(client: commands.Bot, voice_channel: discord.VoiceChannel, membe
             pass
 
         if voice_client and not voice_client.is_playing():
-            audio_source = discord.FFmpegPCMAudio(audio_path)
+            audio_source = audio_cache.get_source(audio_path)
             voice_client.play(audio_source)
         else:
             print('couldnt play it!')
@@ -1,14 +1,15 @@
 import discord
 from discord.ext import commands
-from typing import List, Optional
+from typing import Any, List, Optional
 from extra import utils
 
 class ReplayAudioView(discord.ui.View):
     """ View for replaying an audio in the game. """
 
-    def __init__(self, client: commands.Bot, timeout: Optional[float] = 28):
+    def __init__(self, client: commands.Bot, session: Any, timeout: Optional[float] = 28):
         super().__init__(timeout=timeout)
         self.client = client
+        self.session = session
         self.cog = client.get_cog('Game')
 
     @discord.ui.button(label="Replay Audio", style=discord.ButtonStyle.success, custom_id="replay_audio_id")
@@ -17,7 +18,7 @@ class ReplayAudioView(discord.ui.View):
 
         await interaction.response.defer()
 
-        await self.cog.audio(self.cog.audio_path, self.cog.vc)
+        await self.cog.audio(self.session.audio_path, self.session.vc)
         await utils.disable_buttons(self)
         button.label = "Audio Replayed"
         button.style = discord.ButtonStyle.danger
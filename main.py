@@ -6,8 +6,26 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from extra.customerrors import CommandNotReady, NotInGameTextChannelError
+from external_cons import create_database_pool, close_database_pool
+from extra.game.game_stats import game_stats
+from extra.file_manipulation.character_renderer import character_renderer
 
-client = commands.Bot(command_prefix='m!', intents=discord.Intents.all(), help_command=None, case_insensitive=True)
+
+class MacaronBot(commands.Bot):
+    """ The bot's client. """
+
+    async def close(self) -> None:
+        """ Closes the client, stops the render workers, writes the buffered game stats and closes the database pool. """
+
+        await super().close()
+        character_renderer.shutdown()
+        try:
+            await game_stats.flush()
+        finally:
+            await close_database_pool()
+
+
+client = MacaronBot(command_prefix='m!', intents=discord.Intents.all(), help_command=None, case_insensitive=True)
 
 
 @client.event
@@ -201,4 +219,6 @@ for filename in os.listdir('./cogs'):
     if filename.endswith('.py'):
         client.load_extension(f"cogs.{filename[:-3]}")
 
+# Opens the shared database pool before any cog starts querying
+client.loop.run_until_complete(create_database_pool())
 client.run(os.getenv('TOKEN'))
\ No newline at end of file
@@ -0,0 +1,83 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image, ImageSequence
+
+from extra.file_manipulation import animation_encoder
+from extra.file_manipulation.animation_encoder import crop_changes, save_gif
+
+colors = [(255, 0, 0), (0, 0, 255), (0, 255, 0), (255, 255, 255)]
+
+
+def make_frames():
+    """ Makes opaque frames with a few colors, so they quantize without loss:
+    a moving square, then the same frame again, then a single changed pixel. """
+
+    frames = []
+    for x in (0, 2, 2):
+        frame = Image.new('RGB', (32, 32), colors[0])
+        frame.paste(colors[1], (x, 4, x + 8, 12))
+        frames.append(frame)
+
+    last = frames[-1].copy()
+    last.putpixel((30, 30), colors[2])
+    frames.append(last)
+    return frames
+
+
+@pytest.fixture(params=['numpy', 'pillow'])
+def diff_backend(request, monkeypatch):
+    """ Runs a test with both ways of diffing the frames. """
+
+    if request.param == 'pillow':
+        monkeypatch.setattr(animation_encoder, 'np', None)
+
+
+def quantize(frame: Image.Image) -> Image.Image:
+    """ Quantizes a frame with a palette of the test colors. """
+
+    palette = Image.new('P', (1, 1))
+    palette.putpalette([channel for color in colors for channel in color] + [0] * (256 - len(colors)) * 3)
+    return frame.quantize(palette=palette, dither=Image.NONE)
+
+
+def test_crop_changes(diff_backend):
+    frames = [quantize(frame) for frame in make_frames()]
+
+    assert crop_changes(frames[2], frames[1], 255) is None
+
+    cropped, position = crop_changes(frames[3], frames[2], 255)
+    assert position == (30, 30)
+    assert cropped.size == (1, 1)
+
+    # Most of the box around the moved square didn't change, so those pixels are transparent
+    cropped, position = crop_changes(frames[1], frames[0], 255)
+    assert position == (0, 4)
+    assert cropped.size == (10, 8)
+    assert cropped.getpixel((4, 0)) == 255
+    assert cropped.getpixel((0, 0)) != 255 and cropped.getpixel((9, 0)) != 255
+
+    # A box that changed everywhere is kept as it is
+    cropped, _ = crop_changes(quantize(Image.new('RGB', (4, 4), colors[1])), quantize(Image.new('RGB', (4, 4), colors[0])), 255)
+    assert 255 not in [index for _, index in cropped.getcolors()]
+
+
+def test_save_gif_round_trip(diff_backend):
+    frames = make_frames()
+    output = BytesIO()
+
+    save_gif(frames, [100, 100, 50, 100], output)
+
+    with Image.open(BytesIO(output.getvalue())) as gif:
+        assert gif.info['loop'] == 0
+        decoded, durations, boxes = [], [], []
+        for frame in ImageSequence.Iterator(gif):
+            decoded.append(frame.convert('RGB'))
+            durations.append(frame.info['duration'])
+            boxes.append(frame.dispose_extent)
+
+    # The repeated frame was merged into the one before it
+    assert durations == [100, 150, 100]
+    assert [image.tobytes() for image in decoded] == [frames[0].tobytes(), frames[1].tobytes(), frames[3].tobytes()]
+    # Each frame after the first only covers what changed
+    assert boxes == [(0, 0, 32, 32), (0, 4, 10, 12), (30, 30, 31, 31)]
@@ -0,0 +1,83 @@
+import os
+
+from fuzzywuzzy import fuzz
+
+from extra.game.answer_scoring import (
+    AnswerKey, AnswerKeyCache, get_similar_pairs, highlight_words, is_similar, normalize_answer, ratio
+)
+
+
+def test_ratio_matches_fuzz():
+    pairs = [
+        ('bonjour', 'bonjour'), ('bonjour', 'bonjoure'), ('chat', 'chien'),
+        ('je suis là', 'je suis la'), ('', 'mot'), ('a', ''),
+    ]
+    for s1, s2 in pairs:
+        assert ratio(s1, s2) == fuzz.ratio(s1, s2)
+
+
+def test_normalize_answer():
+    assert normalize_answer('Bonjour!') == 'bonjour'
+    assert normalize_answer('Ça va?') == 'ça va'
+    # Only one trailing punctuation mark is removed
+    assert normalize_answer('Quoi?!') == 'quoi?'
+
+
+def test_answer_key():
+    answer_key = AnswerKey('Je suis LÀ.')
+
+    assert answer_key.normalized == 'je suis là'
+    assert answer_key.words == ['Je', 'suis', 'LÀ.']
+    assert answer_key.lower_words == ['je', 'suis', 'là.']
+
+
+def test_answer_key_cache_reads_changed_files(tmp_path):
+    text_path = tmp_path / 'answer.txt'
+    text_path.write_text('Bonjour\n', encoding='utf-8')
+    cache = AnswerKeyCache()
+
+    answer_key = cache.get(str(text_path))
+    assert answer_key.text == 'Bonjour'
+    assert cache.get(str(text_path)) is answer_key
+
+    text_path.write_text('Bonsoir', encoding='utf-8')
+    mtime = os.path.getmtime(text_path) + 1
+    os.utime(text_path, (mtime, mtime))
+
+    assert cache.get(str(text_path)).text == 'Bonsoir'
+
+
+def test_answer_key_cache_missing_file(tmp_path):
+    assert AnswerKeyCache().get(str(tmp_path / 'missing.txt')).text == '?'
+
+
+def test_similar_pairs_match_ratio_threshold():
+    user_words = ['bonjour', 'bonjur', 'chat', 'maison', 'maisons', 'a']
+    correct_words = ['bonjour', 'chats', 'maison', 'le']
+
+    expected = {
+        (user_word, correct_word) for user_word in user_words for correct_word in correct_words
+        if user_word != correct_word and fuzz.ratio(user_word, correct_word) >= 89
+    }
+    assert get_similar_pairs(user_words, correct_words) == expected
+    assert is_similar('maisons', 'maison')
+    assert not is_similar('a', 'le')
+
+
+def test_highlight_exact_answer():
+    words = ['Je', 'suis', 'là']
+    assert highlight_words(words, words) == 'Je suis là'
+
+
+def test_highlight_similar_wrong_and_missing_words():
+    user_words = ['Je', 'suiss', 'ici']
+    correct_words = ['Je', 'suis', 'là', 'aussi']
+
+    assert highlight_words(user_words, correct_words) == 'Je **suiss** ~~`ici`~~ ~~`aussi`~~'
+
+
+def test_highlight_extra_word():
+    user_words = ['Je', 'suis', 'bien', 'là']
+    correct_words = ['Je', 'suis', 'là']
+
+    assert highlight_words(user_words, correct_words) == 'Je suis ~~`bien`~~ là'
@@ -0,0 +1,59 @@
+import os
+
+from extra.game.audio_catalog import AudioCatalog
+
+
+def make_audio_folders(root, language: str, difficulty: str, *folders: str) -> None:
+    """ Makes empty audio folders in a catalog's root folder. """
+
+    for folder in folders:
+        os.makedirs(root / language / difficulty / folder)
+
+
+def test_rebuild_indexes_folders(tmp_path):
+    make_audio_folders(tmp_path, 'French', 'A1', '1', '2')
+    make_audio_folders(tmp_path, 'Spanish', 'B2', '1')
+    (tmp_path / 'French' / 'A1' / 'notes.txt').write_text('not an audio folder')
+
+    catalog = AudioCatalog(str(tmp_path))
+
+    assert catalog.languages == ['French', 'Spanish']
+    assert catalog.count() == 3
+    assert sorted(catalog.get_folders('French', 'A1')) == ['1', '2']
+    assert catalog.get_folders('French', 'C2') == ()
+
+
+def test_draw_each_folder_once(tmp_path):
+    make_audio_folders(tmp_path, 'French', 'A1', '1', '2', '3')
+    catalog = AudioCatalog(str(tmp_path))
+    deck = catalog.new_deck('French', 'A1')
+
+    drawn = [catalog.draw(deck, set()) for _ in range(3)]
+
+    assert sorted(drawn) == ['1', '2', '3']
+    assert catalog.draw(deck, set()) is None
+
+
+def test_draw_skips_excluded(tmp_path):
+    make_audio_folders(tmp_path, 'French', 'A1', '1', '2', '3')
+    catalog = AudioCatalog(str(tmp_path))
+    deck = catalog.new_deck('French', 'A1')
+
+    assert catalog.draw(deck, {'1', '3'}) == '2'
+    assert catalog.draw(deck, {'1', '3'}) is None
+    assert deck.folders == []
+
+
+def test_draw_refills_after_rebuild(tmp_path):
+    make_audio_folders(tmp_path, 'French', 'A1', '1')
+    catalog = AudioCatalog(str(tmp_path))
+    deck = catalog.new_deck('French', 'A1')
+
+    assert catalog.draw(deck, set()) == '1'
+    assert catalog.draw(deck, set()) is None
+
+    make_audio_folders(tmp_path, 'French', 'A1', '2')
+    catalog.rebuild()
+
+    assert sorted(catalog.draw(deck, set()) for _ in range(2)) == ['1', '2']
+    assert deck.version == catalog.version
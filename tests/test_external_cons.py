@@ -0,0 +1,37 @@
+import re
+
+from external_cons import make_upsert_query
+
+
+def squash(query: str) -> str:
+    """ Collapses the whitespace of a query. """
+
+    return re.sub(r'\s+', ' ', query).strip()
+
+
+def test_upsert_increments_and_sets():
+    query = make_upsert_query('MacaronProfile', ('user_id',), ('money', 'games_played'), ('last_time_played',))
+
+    assert squash(query) == (
+        "INSERT INTO MacaronProfile (user_id, money, games_played, last_time_played) VALUES (%s, %s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE money = money + VALUES(money), games_played = games_played + VALUES(games_played), "
+        "last_time_played = COALESCE(VALUES(last_time_played), last_time_played)"
+    )
+
+
+def test_upsert_composite_key():
+    query = make_upsert_query('AudioFiles', ('user_id', 'file_name', 'difficulty'), set_columns=('audio_ts',))
+
+    assert squash(query) == (
+        "INSERT INTO AudioFiles (user_id, file_name, difficulty, audio_ts) VALUES (%s, %s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE audio_ts = COALESCE(VALUES(audio_ts), audio_ts)"
+    )
+
+
+def test_upsert_without_updates_only_inserts():
+    query = make_upsert_query('UserRollDices', ('user_id',))
+
+    assert squash(query) == (
+        "INSERT INTO UserRollDices (user_id) VALUES (%s) "
+        "ON DUPLICATE KEY UPDATE user_id = user_id"
+    )
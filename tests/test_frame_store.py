@@ -0,0 +1,95 @@
+import os
+
+from PIL import Image
+
+from extra.file_manipulation.asset_pipeline import extract_frames, trim_frames
+from extra.file_manipulation.frame_store import (
+    build_frame_store, build_stale_frame_stores, is_store_fresh, load_frame_store
+)
+from extra.file_manipulation.image_manager import ImageLayer, LayerCache
+
+
+def make_animation(path, n_frames: int = 3) -> str:
+    """ Writes an animated PNG of a square moving over a transparent canvas. """
+
+    frames = []
+    for i in range(n_frames):
+        frame = Image.new('RGBA', (16, 16), (0, 0, 0, 0))
+        frame.paste((255, 0, 0, 255), (i * 2, 3, i * 2 + 5, 9))
+        frames.append(frame)
+
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=[50, 80, 120][:n_frames], loop=0)
+    return str(path)
+
+
+def touch_later(path: str) -> None:
+    """ Moves the modification time of a file forward. """
+
+    mtime = os.path.getmtime(path) + 1
+    os.utime(path, (mtime, mtime))
+
+
+def test_static_images_have_no_store(tmp_path):
+    path = tmp_path / 'static.png'
+    Image.new('RGBA', (4, 4), (255, 0, 0, 255)).save(path)
+
+    assert not build_frame_store(str(path))
+    assert load_frame_store(str(path)) is None
+
+
+def test_store_round_trip(tmp_path):
+    path = make_animation(tmp_path / 'item.png')
+
+    assert build_frame_store(path)
+    assert is_store_fresh(path)
+
+    frames, durations, positions, size = load_frame_store(path)
+    expected_frames, expected_durations = extract_frames(path)
+    expected_frames, expected_positions = trim_frames(expected_frames)
+
+    assert size == (16, 16)
+    assert durations == tuple(expected_durations) == (50, 80, 120)
+    assert positions == tuple(expected_positions) == ((0, 3), (2, 3), (4, 3))
+    assert [frame.tobytes() for frame in frames] == [frame.tobytes() for frame in expected_frames]
+
+
+def test_changed_image_makes_the_store_stale(tmp_path):
+    os.makedirs(tmp_path / 'hats')
+    path = make_animation(tmp_path / 'hats' / 'item.png')
+    build_frame_store(path)
+
+    touch_later(path)
+
+    assert load_frame_store(path) is None
+    assert build_stale_frame_stores(str(tmp_path), ['hats', 'shirts']) == 1
+    assert build_stale_frame_stores(str(tmp_path), ['hats']) == 0
+    assert load_frame_store(path) is not None
+
+
+def test_layers_are_mapped_from_the_store(tmp_path):
+    path = make_animation(tmp_path / 'item.png')
+    build_frame_store(path)
+
+    layer = ImageLayer.from_file(path)
+
+    assert layer.nbytes == 0
+    assert layer.n_frames == 3 and layer.size == (16, 16)
+    # The frames keep their mapping when the store is rebuilt
+    touch_later(path)
+    build_frame_store(path)
+    assert layer.frames[2].getpixel((0, 0)) == (255, 0, 0, 255)
+
+
+def test_layer_cache_caps_mapped_layers(tmp_path):
+    paths = [make_animation(tmp_path / f'{name}.png') for name in 'abc']
+    for path in paths:
+        build_frame_store(path)
+    cache = LayerCache(max_bytes=10_000, max_layers=2)
+
+    for path in paths:
+        cache.get(path)
+
+    # Mapped layers take no decoded memory, only the amount of them bounds the cache
+    assert len(cache) == 2
+    assert cache.nbytes == 0
+    assert cache.evictions == 1
@@ -0,0 +1,109 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from extra.game import game_stats as game_stats_module
+from extra.game.game_stats import GameStatsBuffer
+
+
+class FakeCursor:
+    """ Records the queries run by a flush. """
+
+    def __init__(self) -> None:
+        self.queries = []
+
+    async def executemany(self, query, args) -> None:
+        self.queries.append((query, list(args)))
+
+
+class FakeConnection:
+
+    def __init__(self) -> None:
+        self.commits = 0
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+
+def test_add_mutations():
+    buffer = GameStatsBuffer()
+    buffer.add_profile(1, crumbs=5, games_played=1, last_time_played=100)
+    buffer.add_profile(1, crumbs=3, croutons=2)
+    buffer.add_round_status(1, wins=1)
+    buffer.add_round_status(1, losses=2)
+    buffer.add_audio_file(1, 7, 'A1', 100)
+    buffer.add_audio_file(1, 7, 'A1', 200)
+
+    assert buffer.profiles == {1: [8, 1, 100, 2]}
+    assert buffer.round_statuses == {1: [1, 2]}
+    assert buffer.audio_files == {(1, '7', 'A1'): 200}
+    assert len(buffer) == 3
+
+
+def test_pending_reads():
+    buffer = GameStatsBuffer()
+    assert not buffer.is_pending()
+
+    buffer.add_round_status(1, wins=1)
+    buffer.add_audio_file(2, 'audio', 'A1', 100)
+    buffer.add_audio_file(2, 'other', 'B2', 100)
+
+    assert buffer.is_pending()
+    assert buffer.is_pending(1)
+    # Audio timestamps are merged with the cooldown reads instead
+    assert not buffer.is_pending(2)
+    assert buffer.get_audio_files(2, 'A1') == [('audio', 100)]
+    assert buffer.get_audio_files(1, 'A1') == []
+
+
+def test_requeue_merges_with_newer_mutations():
+    buffer = GameStatsBuffer()
+    buffer.add_profile(1, crumbs=2, last_time_played=300)
+    buffer.add_audio_file(1, 'audio', 'A1', 300)
+
+    buffer.requeue({(1, 'audio', 'A1'): 100}, {1: [1, 0]}, {1: [5, 1, 100, 0]})
+
+    assert buffer.profiles == {1: [7, 1, 300, 0]}
+    assert buffer.round_statuses == {1: [1, 0]}
+    assert buffer.audio_files == {(1, 'audio', 'A1'): 300}
+
+
+def test_flush_writes_everything_at_once(monkeypatch):
+    cursor, connection = FakeCursor(), FakeConnection()
+
+    @asynccontextmanager
+    async def the_database():
+        yield cursor, connection
+
+    monkeypatch.setattr(game_stats_module, 'the_database', the_database)
+    buffer = GameStatsBuffer()
+    buffer.add_profile(1, crumbs=5, games_played=1, last_time_played=100)
+    buffer.add_round_status(1, wins=1)
+    buffer.add_audio_file(1, 'audio', 'A1', 100)
+
+    assert asyncio.run(buffer.flush()) == 3
+    assert connection.commits == 1
+    assert [args for _, args in cursor.queries] == [
+        [(1, 'audio', 'A1', 100)], [(1, 1, 0)], [(1, 5, 1, 0, 100)]
+    ]
+    assert not len(buffer)
+    assert buffer.get_stats() == {'pending': 0, 'flushes': 1, 'failed': 0}
+
+
+def test_failed_flush_keeps_mutations(monkeypatch):
+
+    @asynccontextmanager
+    async def the_database():
+        raise ConnectionError("database is down")
+        yield
+
+    monkeypatch.setattr(game_stats_module, 'the_database', the_database)
+    buffer = GameStatsBuffer()
+    buffer.add_profile(1, crumbs=5)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(buffer.flush())
+
+    assert buffer.profiles == {1: [5, 0, None, 0]}
+    assert buffer.get_stats() == {'pending': 1, 'flushes': 0, 'failed': 1}
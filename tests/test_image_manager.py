@@ -0,0 +1,107 @@
+import os
+
+from PIL import Image
+
+from extra.file_manipulation.image_manager import ImageLayer, LayerCache
+
+
+def make_image(path, size=(10, 10), box=None) -> str:
+    """ Writes an RGBA image, opaque everywhere or only inside a box. """
+
+    image = Image.new('RGBA', size, (0, 0, 0, 0) if box else (255, 0, 0, 255))
+    if box:
+        image.paste((255, 0, 0, 255), box)
+    image.save(path)
+    return str(path)
+
+
+def touch_later(path: str) -> None:
+    """ Moves the modification time of a file forward. """
+
+    mtime = os.path.getmtime(path) + 1
+    os.utime(path, (mtime, mtime))
+
+
+def test_hits_and_misses(tmp_path):
+    path = make_image(tmp_path / 'a.png')
+    cache = LayerCache(max_bytes=10_000, max_layers=10)
+
+    layer = cache.get(path)
+    assert cache.get(path) is layer
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.nbytes == layer.nbytes == 10 * 10 * 4
+
+
+def test_byte_budget_evicts_least_recently_used(tmp_path):
+    paths = [make_image(tmp_path / f'{name}.png') for name in 'abc']
+    cache = LayerCache(max_bytes=2 * 400, max_layers=10)
+
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])
+    cache.get(paths[2])
+
+    assert len(cache) == 2
+    assert cache.nbytes == 800
+    assert cache.evictions == 1
+    # b was the least recently used one
+    cache.get(paths[0])
+    assert cache.hits == 2
+
+
+def test_oversized_layer_is_not_cached(tmp_path):
+    path = make_image(tmp_path / 'big.png', size=(20, 20))
+    cache = LayerCache(max_bytes=400, max_layers=10)
+
+    assert cache.get(path).nbytes == 1600
+    assert len(cache) == 0 and cache.nbytes == 0
+
+
+def test_changed_file_replaces_its_layer(tmp_path):
+    path = make_image(tmp_path / 'a.png')
+    cache = LayerCache(max_bytes=10_000, max_layers=10)
+    old_layer = cache.get(path)
+
+    touch_later(path)
+
+    assert cache.get(path) is not old_layer
+    assert len(cache) == 1 and cache.nbytes == 400
+
+
+def test_invalidate_folder(tmp_path):
+    os.makedirs(tmp_path / 'hats')
+    os.makedirs(tmp_path / 'shirts')
+    hat = make_image(tmp_path / 'hats' / 'a.png')
+    shirt = make_image(tmp_path / 'shirts' / 'a.png')
+    cache = LayerCache(max_bytes=10_000, max_layers=10)
+    cache.get(hat)
+    cache.get(shirt)
+
+    cache.invalidate(str(tmp_path / 'hats'))
+
+    assert len(cache) == 1 and cache.nbytes == 400
+    cache.get(shirt)
+    assert cache.hits == 1
+
+
+def test_layers_are_trimmed_to_visible_pixels(tmp_path):
+    path = make_image(tmp_path / 'a.png', size=(10, 10), box=(2, 3, 6, 8))
+
+    layer = ImageLayer.from_file(path)
+
+    assert layer.image.size == (4, 5)
+    assert layer.offset == (2, 3)
+    assert layer.size == (10, 10)
+    with Image.open(path) as image:
+        assert layer.get_canvas().tobytes() == image.convert('RGBA').tobytes()
+
+
+def test_invisible_frames_are_trimmed_to_a_pixel(tmp_path):
+    path = tmp_path / 'empty.png'
+    Image.new('RGBA', (10, 10), (0, 0, 0, 0)).save(path)
+
+    layer = ImageLayer.from_file(str(path))
+
+    assert layer.image.size == (1, 1)
+    assert layer.size == (10, 10)
+    assert layer.get_canvas().getbbox() is None
@@ -0,0 +1,117 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+from extra.file_manipulation.character_renderer import RenderJob
+from extra.file_manipulation.render_cache import RenderCache, make_render_key
+
+
+def make_job(tmp_path, hidden=frozenset()) -> RenderJob:
+    """ Makes a render job out of empty image files. """
+
+    for name in ('background.png', 'hat.png', 'shirt.png'):
+        (tmp_path / name).write_bytes(b'')
+
+    layers = (('hats', str(tmp_path / 'hat.png')), ('shirts', str(tmp_path / 'shirt.png')))
+    return RenderJob(str(tmp_path / 'background.png'), layers, frozenset(hidden))
+
+
+def test_render_key_is_stable(tmp_path):
+    job = make_job(tmp_path, {'hats', 'shirts', 'pants'})
+
+    assert make_render_key(job) == make_render_key(job._replace(hidden=frozenset(['pants', 'shirts', 'hats'])))
+
+
+def test_render_key_is_stable_across_runs(tmp_path):
+    job = make_job(tmp_path, {'hats', 'shirts', 'pants', 'shoes'})
+    script = (
+        "import sys; from extra.file_manipulation.character_renderer import RenderJob; "
+        "from extra.file_manipulation.render_cache import make_render_key; "
+        f"print(make_render_key(RenderJob(*{tuple(job)!r})))"
+    )
+
+    # A frozenset's iteration order changes with the hash seed of each run
+    keys = {
+        subprocess.run(
+            [sys.executable, '-c', script], capture_output=True, text=True, check=True,
+            env={**os.environ, 'PYTHONHASHSEED': str(seed)}
+        ).stdout.strip()
+        for seed in range(4)
+    }
+    assert keys == {make_render_key(job)}
+
+
+def test_render_key_changes_with_the_loadout(tmp_path):
+    job = make_job(tmp_path)
+    key = make_render_key(job)
+
+    assert make_render_key(job._replace(hidden=frozenset({'hats'}))) != key
+    assert make_render_key(job._replace(layers=job.layers[:1])) != key
+    assert make_render_key(job._replace(output_format='webp')) != key
+
+    mtime = os.path.getmtime(job.layers[0][1]) + 1
+    os.utime(job.layers[0][1], (mtime, mtime))
+    assert make_render_key(job) != key
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    folder = tmp_path / 'renders'
+
+    async def run() -> None:
+        cache = RenderCache(str(folder), max_bytes=10)
+        await cache.put('a', b'1234', 'png')
+        await cache.put('b', b'1234', 'png')
+        assert await cache.get('a') == os.path.join(str(folder), 'a.png')
+
+        await cache.put('c', b'1234', 'gif')
+
+        assert await cache.get('b') is None
+        assert sorted(os.listdir(folder)) == ['a.png', 'c.gif']
+        assert cache.nbytes == 8
+        assert cache.get_stats()['evictions'] == 1
+
+    asyncio.run(run())
+
+
+def test_cache_indexes_files_of_previous_runs(tmp_path):
+    folder = tmp_path / 'renders'
+
+    async def run() -> None:
+        await RenderCache(str(folder), max_bytes=100).put('a', b'1234', 'png')
+
+        cache = RenderCache(str(folder), max_bytes=100)
+        assert await cache.get('a') == os.path.join(str(folder), 'a.png')
+        assert cache.nbytes == 4
+
+        await cache.invalidate()
+        assert os.listdir(folder) == []
+        assert await cache.get('a') is None
+
+    asyncio.run(run())
+
+
+def test_cache_forgets_files_removed_from_outside(tmp_path):
+    folder = tmp_path / 'renders'
+
+    async def run() -> None:
+        cache = RenderCache(str(folder), max_bytes=100)
+        await cache.put('a', b'1234', 'png')
+        os.remove(folder / 'a.png')
+
+        assert await cache.get('a') is None
+        assert len(cache) == 0 and cache.nbytes == 0
+
+    asyncio.run(run())
+
+
+def test_disabled_cache(tmp_path):
+    folder = tmp_path / 'renders'
+
+    async def run() -> None:
+        cache = RenderCache(str(folder), max_bytes=0)
+        await cache.put('a', b'1234', 'png')
+        assert await cache.get('a') is None
+
+    asyncio.run(run())
+    assert not folder.exists()